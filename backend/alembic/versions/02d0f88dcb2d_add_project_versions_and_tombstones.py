@@ -0,0 +1,49 @@
+"""add_project_versions_and_tombstones
+
+Revision ID: 02d0f88dcb2d
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '02d0f88dcb2d'
+down_revision: Union[str, None] = 'c7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows start at version 0: a client syncing since=0 gets them all
+    op.add_column('projects', sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('project_tasks', sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'))
+    op.add_column('project_notes', sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'))
+    op.create_index('idx_project_tasks_project_version', 'project_tasks', ['project_id', 'version'])
+    op.create_index('idx_project_notes_project_version', 'project_notes', ['project_id', 'version'])
+
+    op.create_table('project_tombstones',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_project_tombstones_project_version', 'project_tombstones', ['project_id', 'version'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_project_tombstones_project_version', table_name='project_tombstones')
+    op.drop_table('project_tombstones')
+    op.drop_index('idx_project_notes_project_version', table_name='project_notes')
+    op.drop_index('idx_project_tasks_project_version', table_name='project_tasks')
+    op.drop_column('project_notes', 'version')
+    op.drop_column('project_tasks', 'version')
+    op.drop_column('projects', 'version')
@@ -0,0 +1,26 @@
+"""add_workout_program_version
+
+Revision ID: 99565ebc9338
+Revises: c1f92c7e1b28
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '99565ebc9338'
+down_revision: Union[str, None] = 'c1f92c7e1b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('workout_programs', sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('workout_programs', 'version')
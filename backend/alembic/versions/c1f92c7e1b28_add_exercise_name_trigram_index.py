@@ -0,0 +1,33 @@
+"""add_exercise_name_trigram_index
+
+Revision ID: c1f92c7e1b28
+Revises: d9499a432bda
+Create Date: 2026-10-19 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1f92c7e1b28'
+down_revision: Union[str, None] = 'd9499a432bda'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm is a trusted extension (Postgres 13+): the database owner can create it
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'idx_exercises_name_trgm', 'exercises', ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    # The extension stays: other objects may use it
+    op.drop_index('idx_exercises_name_trgm', table_name='exercises')
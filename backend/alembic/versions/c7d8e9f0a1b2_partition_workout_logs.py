@@ -0,0 +1,121 @@
+"""partition_workout_logs
+
+Revision ID: c7d8e9f0a1b2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.partitions import (
+    add_months, month_start, months_between,
+    create_partition_sql, create_default_partition_sql,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d8e9f0a1b2'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    # Move the existing table aside; constraint and index names are reused
+    op.rename_table('workout_logs', 'workout_logs_legacy')
+    op.drop_index('idx_workout_logs_exercise', table_name='workout_logs_legacy')
+    op.drop_index('idx_workout_logs_session', table_name='workout_logs_legacy')
+    op.drop_constraint('uq_workout_log_set', 'workout_logs_legacy', type_='unique')
+    op.execute('ALTER TABLE workout_logs_legacy RENAME CONSTRAINT workout_logs_pkey TO workout_logs_legacy_pkey')
+
+    op.create_table('workout_logs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('session_started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('session_id', sa.UUID(), nullable=False),
+        sa.Column('exercise_id', sa.UUID(), nullable=False),
+        sa.Column('set_number', sa.SmallInteger(), nullable=False),
+        sa.Column('reps', sa.SmallInteger(), nullable=False),
+        sa.Column('weight_kg', sa.Numeric(precision=6, scale=2), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['workout_sessions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id', 'session_started_at'),
+        sa.UniqueConstraint(
+            'session_id', 'exercise_id', 'set_number', 'session_started_at',
+            name='uq_workout_log_set',
+        ),
+        sa.CheckConstraint('set_number BETWEEN 1 AND 20', name='ck_set_number'),
+        sa.CheckConstraint('reps BETWEEN 0 AND 200', name='ck_reps'),
+        postgresql_partition_by='RANGE (session_started_at)',
+    )
+    op.create_index('idx_workout_logs_session', 'workout_logs', ['session_id'])
+    op.create_index('idx_workout_logs_exercise', 'workout_logs', ['exercise_id', sa.text('created_at DESC')])
+
+    # One partition per month from the first session through a few months ahead
+    now = datetime.now(timezone.utc)
+    first = op.get_bind().execute(sa.text('SELECT min(started_at) FROM workout_sessions')).scalar()
+    for month in months_between(month_start(first or now), add_months(month_start(now), MONTHS_AHEAD)):
+        op.execute(create_partition_sql('workout_logs', month))
+    op.execute(create_default_partition_sql('workout_logs'))
+
+    op.execute(
+        """
+        INSERT INTO workout_logs (
+            id, session_started_at, session_id, exercise_id,
+            set_number, reps, weight_kg, notes, created_at
+        )
+        SELECT l.id, s.started_at, l.session_id, l.exercise_id,
+               l.set_number, l.reps, l.weight_kg, l.notes, l.created_at
+        FROM workout_logs_legacy l
+        JOIN workout_sessions s ON s.id = l.session_id
+        """
+    )
+    op.drop_table('workout_logs_legacy')
+
+
+def downgrade() -> None:
+    op.rename_table('workout_logs', 'workout_logs_partitioned')
+    op.drop_index('idx_workout_logs_exercise', table_name='workout_logs_partitioned')
+    op.drop_index('idx_workout_logs_session', table_name='workout_logs_partitioned')
+    op.drop_constraint('uq_workout_log_set', 'workout_logs_partitioned', type_='unique')
+    op.execute(
+        'ALTER TABLE workout_logs_partitioned '
+        'RENAME CONSTRAINT workout_logs_pkey TO workout_logs_partitioned_pkey'
+    )
+
+    op.create_table('workout_logs',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('session_id', sa.UUID(), nullable=False),
+        sa.Column('exercise_id', sa.UUID(), nullable=False),
+        sa.Column('set_number', sa.SmallInteger(), nullable=False),
+        sa.Column('reps', sa.SmallInteger(), nullable=False),
+        sa.Column('weight_kg', sa.Numeric(precision=6, scale=2), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['workout_sessions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id', 'exercise_id', 'set_number', name='uq_workout_log_set'),
+        sa.CheckConstraint('set_number BETWEEN 1 AND 20', name='ck_set_number'),
+        sa.CheckConstraint('reps BETWEEN 0 AND 200', name='ck_reps'),
+    )
+    op.create_index('idx_workout_logs_session', 'workout_logs', ['session_id'])
+    op.create_index('idx_workout_logs_exercise', 'workout_logs', ['exercise_id', sa.text('created_at DESC')])
+
+    op.execute(
+        """
+        INSERT INTO workout_logs (
+            id, session_id, exercise_id, set_number, reps, weight_kg, notes, created_at
+        )
+        SELECT id, session_id, exercise_id, set_number, reps, weight_kg, notes, created_at
+        FROM workout_logs_partitioned
+        """
+    )
+    op.drop_table('workout_logs_partitioned')
@@ -0,0 +1,61 @@
+"""add_personal_records
+
+Revision ID: d9499a432bda
+Revises: 02d0f88dcb2d
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9499a432bda'
+down_revision: Union[str, None] = '02d0f88dcb2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fill both from existing sets with scripts/backfill_personal_records.py
+    op.create_table('personal_records',
+        sa.Column('exercise_id', sa.UUID(), nullable=False),
+        sa.Column('weight_kg', sa.Numeric(precision=6, scale=2), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('session_id', sa.UUID(), nullable=True),
+        sa.Column('reps', sa.SmallInteger(), nullable=False),
+        sa.Column('e1rm_kg', sa.Numeric(precision=7, scale=2), nullable=False),
+        sa.Column('achieved_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['session_id'], ['workout_sessions.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('exercise_id', 'weight_kg'),
+    )
+
+    op.create_table('personal_record_history',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('exercise_id', sa.UUID(), nullable=False),
+        sa.Column('session_id', sa.UUID(), nullable=True),
+        sa.Column('record_type', sa.String(length=20), nullable=False),
+        sa.Column('weight_kg', sa.Numeric(precision=6, scale=2), nullable=False),
+        sa.Column('reps', sa.SmallInteger(), nullable=False),
+        sa.Column('e1rm_kg', sa.Numeric(precision=7, scale=2), nullable=False),
+        sa.Column('achieved_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['session_id'], ['workout_sessions.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'idx_personal_record_history_exercise', 'personal_record_history',
+        ['exercise_id', sa.text('achieved_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_personal_record_history_exercise', table_name='personal_record_history')
+    op.drop_table('personal_record_history')
+    op.drop_table('personal_records')
@@ -6,12 +6,14 @@ from datetime import date
 
 from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user
+from app.dependencies.conditional import ConditionalGet
 from app.models.user import User
 from app.schemas.calendar import (
     CalendarEventCreate, CalendarEventUpdate, CalendarEventResponse, CalendarEventListResponse
 )
 from app.repositories.calendar import CalendarRepository
 from app.services.calendar import CalendarService
+from app.responses import model_response
 
 router = APIRouter(prefix="/v1/calendar", tags=["Calendar"])
 
@@ -26,11 +28,16 @@ def get_calendar_service(db: AsyncSession = Depends(get_db)) -> CalendarService:
 async def list_events(
     start_date: date = Query(..., description="Start date (inclusive)"),
     end_date: date = Query(..., description="End date (inclusive)"),
+    conditional: ConditionalGet = Depends(),
     current_user: User = Depends(get_current_user),
     service: CalendarService = Depends(get_calendar_service)
 ):
     """List events in date range."""
-    return await service.list_events(current_user.id, start_date, end_date)
+    etag = await service.list_events_etag(current_user.id, start_date, end_date)
+    if conditional.is_fresh(etag):
+        return conditional.not_modified()
+    result = await service.list_events(current_user.id, start_date, end_date)
+    return model_response(CalendarEventListResponse, result, headers=conditional.headers)
 
 
 @router.post("/events", response_model=CalendarEventResponse, status_code=status.HTTP_201_CREATED)
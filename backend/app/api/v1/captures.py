@@ -5,12 +5,14 @@ from uuid import UUID
 
 from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user, require_api_key
+from app.dependencies.conditional import ConditionalGet
 from app.models.user import User
 from app.schemas.capture import (
     CaptureCreate, CaptureUpdate, CaptureResponse, CaptureListResponse
 )
 from app.repositories.capture import CaptureRepository
 from app.services.capture import CaptureService
+from app.responses import model_response
 
 router = APIRouter(prefix="/v1/captures", tags=["Captures"])
 
@@ -25,12 +27,16 @@ def get_capture_service(db: AsyncSession = Depends(get_db)) -> CaptureService:
 @router.get("", response_model=CaptureListResponse)
 async def list_captures(
     include_processed: bool = True,
+    conditional: ConditionalGet = Depends(),
     current_user: User = Depends(get_current_user),
     service: CaptureService = Depends(get_capture_service)
 ):
     """List all captures for the current user."""
+    etag = await service.list_captures_etag(current_user.id, include_processed)
+    if conditional.is_fresh(etag):
+        return conditional.not_modified()
     result = await service.list_captures(current_user.id, include_processed)
-    return result
+    return model_response(CaptureListResponse, result, headers=conditional.headers)
 
 
 @router.post("", response_model=CaptureResponse, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,28 @@
+"""Debug endpoints."""
+from fastapi import APIRouter, Depends
+
+from app.config import settings
+from app.database import slow_queries
+from app.dependencies.auth import get_current_user
+from app.exceptions import NotFoundError
+from app.models.user import User
+
+router = APIRouter(prefix="/v1/debug", tags=["Debug"])
+
+
+@router.get("/slow-queries")
+async def list_slow_queries(current_user: User = Depends(get_current_user)):
+    """
+    Slow statements recorded by this worker, newest first.
+
+    Empty unless SLOW_QUERY_MS is set. Each worker keeps its own buffer,
+    so repeated calls may show different entries. The buffer holds every
+    user's statements, ids included, so it is only served with DEBUG on.
+    """
+    if not settings.DEBUG:
+        raise NotFoundError()
+    return {
+        "enabled": settings.SLOW_QUERY_MS > 0,
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "queries": slow_queries.snapshot(),
+    }
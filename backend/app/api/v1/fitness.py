@@ -1,5 +1,5 @@
 """Fitness API endpoints."""
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Header, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Optional
@@ -7,19 +7,25 @@ from datetime import datetime
 
 from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user
+from app.dependencies.conditional import ConditionalGet
 from app.models.user import User
 from app.schemas.fitness import (
     ExerciseCreate, ExerciseUpdate, ExerciseResponse, ExerciseListResponse,
+    ExerciseAutocompleteResponse, ExerciseBulkDeleteRequest, ExerciseBulkDeleteResponse,
     ProgramCreate, ProgramUpdate, ProgramResponse, ProgramListResponse, ProgramDetailResponse,
     ProgramExerciseCreate, ProgramExerciseUpdate, ProgramExerciseResponse,
-    ExerciseReorderRequest,
+    ExerciseReorderRequest, ExerciseReorderResponse,
     SessionStartRequest, SessionStartResponse, SessionActiveResponse,
-    WorkoutLogCreate, WorkoutLogResponse,
+    WorkoutLogCreate, WorkoutLogResponse, WorkoutLogBatchCreate, WorkoutLogBatchResponse,
     SessionCompleteRequest, SessionCompleteResponse, SessionCancelResponse,
     HistoryResponse, FitnessSummary,
+    PersonalRecordsResponse, PersonalRecordHistoryResponse,
+    WeeklyAnalyticsResponse, WorkloadResponse, E1rmTrendResponse, ExerciseSeriesResponse,
 )
 from app.repositories.fitness import FitnessRepository
 from app.services.fitness import FitnessService
+from app.services.analytics import AnalyticsService
+from app.responses import model_response
 
 router = APIRouter(tags=["Fitness"])
 
@@ -29,16 +35,33 @@ def get_fitness_service(db: AsyncSession = Depends(get_db)) -> FitnessService:
     return FitnessService(repository)
 
 
+def get_analytics_service(db: AsyncSession = Depends(get_db)) -> AnalyticsService:
+    repository = FitnessRepository(db)
+    return AnalyticsService(repository)
+
+
 # ── Exercises ──
 
 @router.get("/v1/exercises", response_model=ExerciseListResponse)
 async def list_exercises(
     muscle_group: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    include_usage: bool = Query(False, description="Add usage_count: programs using each exercise"),
     current_user: User = Depends(get_current_user),
     service: FitnessService = Depends(get_fitness_service),
 ):
-    return await service.list_exercises(current_user.id, muscle_group, search)
+    result = await service.list_exercises(current_user.id, muscle_group, search, include_usage)
+    return model_response(ExerciseListResponse, result)
+
+
+@router.get("/v1/exercises/autocomplete", response_model=ExerciseAutocompleteResponse)
+async def autocomplete_exercises(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    service: FitnessService = Depends(get_fitness_service),
+):
+    return await service.autocomplete_exercises(current_user.id, q, limit)
 
 
 @router.post("/v1/exercises", response_model=ExerciseResponse, status_code=status.HTTP_201_CREATED)
@@ -50,6 +73,15 @@ async def create_exercise(
     return await service.create_exercise(current_user.id, data)
 
 
+@router.post("/v1/exercises/bulk-delete", response_model=ExerciseBulkDeleteResponse)
+async def delete_exercises(
+    data: ExerciseBulkDeleteRequest,
+    current_user: User = Depends(get_current_user),
+    service: FitnessService = Depends(get_fitness_service),
+):
+    return await service.delete_exercises(current_user.id, data.exercise_ids)
+
+
 @router.patch("/v1/exercises/{exercise_id}", response_model=ExerciseResponse)
 async def update_exercise(
     exercise_id: UUID,
@@ -69,23 +101,53 @@ async def delete_exercise(
     await service.delete_exercise(exercise_id, current_user.id)
 
 
+@router.get("/v1/exercises/{exercise_id}/records", response_model=PersonalRecordsResponse)
+async def get_personal_records(
+    exercise_id: UUID,
+    current_user: User = Depends(get_current_user),
+    service: FitnessService = Depends(get_fitness_service),
+):
+    return await service.get_personal_records(exercise_id, current_user.id)
+
+
+@router.get("/v1/exercises/{exercise_id}/records/history", response_model=PersonalRecordHistoryResponse)
+async def get_personal_record_history(
+    exercise_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    service: FitnessService = Depends(get_fitness_service),
+):
+    result = await service.get_personal_record_history(exercise_id, current_user.id, limit)
+    return model_response(PersonalRecordHistoryResponse, result)
+
+
 # ── Programs ──
 
 @router.get("/v1/programs", response_model=ProgramListResponse)
 async def list_programs(
+    conditional: ConditionalGet = Depends(),
     current_user: User = Depends(get_current_user),
     service: FitnessService = Depends(get_fitness_service),
 ):
-    return await service.list_programs(current_user.id)
+    etag = await service.list_programs_etag(current_user.id)
+    if conditional.is_fresh(etag):
+        return conditional.not_modified()
+    result = await service.list_programs(current_user.id)
+    return model_response(ProgramListResponse, result, headers=conditional.headers)
 
 
 @router.get("/v1/programs/{program_id}", response_model=ProgramDetailResponse)
 async def get_program(
     program_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     service: FitnessService = Depends(get_fitness_service),
 ):
-    return await service.get_program_detail(program_id, current_user.id)
+    etag, detail = await service.get_program_detail(program_id, current_user.id, if_none_match)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if detail is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return model_response(ProgramDetailResponse, detail, headers=headers)
 
 
 @router.post("/v1/programs", response_model=ProgramResponse, status_code=status.HTTP_201_CREATED)
@@ -159,15 +221,14 @@ async def delete_program_exercise(
     await service.delete_program_exercise(program_id, entry_id, current_user.id)
 
 
-@router.put("/v1/programs/{program_id}/exercises/reorder")
+@router.put("/v1/programs/{program_id}/exercises/reorder", response_model=ExerciseReorderResponse)
 async def reorder_exercises(
     program_id: UUID,
     data: ExerciseReorderRequest,
     current_user: User = Depends(get_current_user),
     service: FitnessService = Depends(get_fitness_service),
 ):
-    await service.reorder_exercises(program_id, current_user.id, data.day_label, data.exercise_order)
-    return {"message": "Exercises reordered"}
+    return await service.reorder_exercises(program_id, current_user.id, data.day_label, data.exercise_order)
 
 
 # ── Workout Sessions ──
@@ -186,7 +247,7 @@ async def get_active_session(
     current_user: User = Depends(get_current_user),
     service: FitnessService = Depends(get_fitness_service),
 ):
-    return await service.get_active_session(current_user.id)
+    return model_response(SessionActiveResponse, await service.get_active_session(current_user.id))
 
 
 @router.post("/v1/workouts/sessions/{session_id}/logs", response_model=WorkoutLogResponse, status_code=status.HTTP_201_CREATED)
@@ -199,6 +260,16 @@ async def log_set(
     return await service.log_set(session_id, current_user.id, data)
 
 
+@router.post("/v1/workouts/sessions/{session_id}/logs/batch", response_model=WorkoutLogBatchResponse)
+async def log_sets_batch(
+    session_id: UUID,
+    data: WorkoutLogBatchCreate,
+    current_user: User = Depends(get_current_user),
+    service: FitnessService = Depends(get_fitness_service),
+):
+    return await service.log_sets_batch(session_id, current_user.id, data)
+
+
 @router.patch("/v1/workouts/sessions/{session_id}/complete", response_model=SessionCompleteResponse)
 async def complete_session(
     session_id: UUID,
@@ -226,10 +297,56 @@ async def get_history(
     per_page: int = Query(20, ge=1, le=100),
     date_from: Optional[datetime] = Query(None),
     date_to: Optional[datetime] = Query(None),
+    before: Optional[datetime] = Query(None, description="Cursor: next_cursor from the previous page"),
+    before_id: Optional[UUID] = Query(None, description="Cursor: next_cursor_id from the previous page"),
     current_user: User = Depends(get_current_user),
     service: FitnessService = Depends(get_fitness_service),
 ):
-    return await service.get_history(current_user.id, page, per_page, date_from, date_to)
+    result = await service.get_history(current_user.id, page, per_page, date_from, date_to, before, before_id)
+    return model_response(HistoryResponse, result)
+
+
+# ── Analytics ──
+
+@router.get("/v1/workouts/analytics/weekly", response_model=WeeklyAnalyticsResponse)
+async def get_weekly_analytics(
+    weeks: Optional[int] = Query(None, ge=1, description="Only return the most recent weeks"),
+    current_user: User = Depends(get_current_user),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_weekly(current_user.id, weeks)
+
+
+@router.get("/v1/workouts/analytics/workload", response_model=WorkloadResponse)
+async def get_workload_analytics(
+    days: int = Query(90, ge=1, le=3650),
+    acute_days: int = Query(7, ge=1, le=28),
+    chronic_days: int = Query(28, ge=7, le=90),
+    current_user: User = Depends(get_current_user),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_workload(current_user.id, days, acute_days, chronic_days)
+
+
+@router.get("/v1/workouts/analytics/e1rm", response_model=E1rmTrendResponse)
+async def get_e1rm_analytics(
+    exercise_id: Optional[UUID] = Query(None),
+    current_user: User = Depends(get_current_user),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_e1rm_trends(current_user.id, exercise_id)
+
+
+@router.get("/v1/exercises/{exercise_id}/series", response_model=ExerciseSeriesResponse)
+async def get_exercise_series(
+    exercise_id: UUID,
+    points: int = Query(200, ge=3, le=1000, description="Maximum number of points returned"),
+    method: str = Query("lttb", regex="^(lttb|weekly_max)$"),
+    metric: str = Query("e1rm", regex="^(top_weight|volume|e1rm)$", description="Series LTTB preserves the shape of"),
+    current_user: User = Depends(get_current_user),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_exercise_series(current_user.id, exercise_id, points, method, metric)
 
 
 # ── Dashboard Summary ──
@@ -3,7 +3,9 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
+from app.database import engine, replicas
 from app.dependencies.database import get_db
+from app.pooling import pool_status
 
 
 router = APIRouter(tags=["health"])
@@ -28,3 +30,22 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "database": database_status,
         "service": "Life OS API"
     }
+
+
+@router.get("/health/pool", status_code=status.HTTP_200_OK)
+async def pool_health():
+    """
+    Connection pool metrics for this worker.
+
+    Occupancy right now plus checkout wait, overflow and timeout counters
+    since the worker started, for the primary and each replica. Each
+    worker has its own pools; /api/metrics exports the same numbers summed
+    across workers. Blocked at nginx, as it names the replicas.
+    """
+    return {
+        "primary": pool_status(engine),
+        "replicas": {
+            replica.name: {**pool_status(replica.engine), "healthy": replica.healthy}
+            for replica in replicas.replicas
+        },
+    }
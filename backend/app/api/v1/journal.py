@@ -7,6 +7,7 @@ from typing import Optional
 
 from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user
+from app.dependencies.conditional import ConditionalGet
 from app.models.user import User
 from app.schemas.journal import (
     EntryType,
@@ -18,6 +19,7 @@ from app.schemas.journal import (
 )
 from app.repositories.journal import JournalRepository
 from app.services.journal import JournalService
+from app.responses import model_response
 
 router = APIRouter(prefix="/v1/journal", tags=["Journal"])
 
@@ -34,13 +36,20 @@ async def list_entries(
     end_date: Optional[date] = None,
     entry_type: Optional[EntryType] = None,
     limit: int = Query(50, le=200),
+    conditional: ConditionalGet = Depends(),
     current_user: User = Depends(get_current_user),
     service: JournalService = Depends(get_journal_service)
 ):
     """List journal entries with optional filtering."""
-    return await service.list_entries(
+    etag = await service.list_entries_etag(
         current_user.id, start_date, end_date, entry_type, limit
     )
+    if conditional.is_fresh(etag):
+        return conditional.not_modified()
+    result = await service.list_entries(
+        current_user.id, start_date, end_date, entry_type, limit
+    )
+    return model_response(JournalEntryListResponse, result, headers=conditional.headers)
 
 
 @router.post("/entries", response_model=JournalEntryResponse, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,19 @@
+"""Prometheus metrics endpoint."""
+from fastapi import APIRouter, Response
+
+from app.metrics import render_metrics
+
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Metrics in the Prometheus text exposition format.
+
+    Summed across workers when PROMETHEUS_MULTIPROC_DIR is set. Not
+    served through nginx; scrape the backend directly.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
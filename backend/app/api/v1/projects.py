@@ -6,6 +6,7 @@ from typing import List
 
 from app.dependencies.database import get_db
 from app.dependencies.auth import get_current_user
+from app.dependencies.conditional import ConditionalGet
 from app.models.user import User
 from app.schemas.project import (
     ProjectCreate,
@@ -13,6 +14,7 @@ from app.schemas.project import (
     ProjectResponse,
     ProjectDetailResponse,
     ProjectSummaryResponse,
+    ProjectChangesResponse,
     TaskCreate,
     TaskUpdate,
     TaskResponse,
@@ -22,11 +24,11 @@ from app.schemas.project import (
     NoteCreate,
     NoteUpdate,
     NoteResponse,
-    ClearCompletedResponse,
-    TasksByStatus
+    ClearCompletedResponse
 )
 from app.repositories.project import ProjectRepository
 from app.services.project import ProjectService
+from app.responses import model_response
 
 router = APIRouter(prefix="/v1/projects", tags=["Projects"])
 
@@ -40,28 +42,16 @@ def get_project_service(db: AsyncSession = Depends(get_db)) -> ProjectService:
 # Projects
 @router.get("", response_model=List[ProjectDetailResponse])
 async def list_projects(
+    conditional: ConditionalGet = Depends(),
     current_user: User = Depends(get_current_user),
     service: ProjectService = Depends(get_project_service)
 ):
     """List all projects with tasks and notes."""
-    projects = await service.list_projects(current_user.id, load_relations=True)
-
-    # Convert to detailed responses with grouped tasks
-    result = []
-    for project in projects:
-        grouped_tasks = service.group_tasks_by_status(project.tasks)
-        result.append(ProjectDetailResponse(
-            id=project.id,
-            name=project.name,
-            slug=project.slug,
-            objective=project.objective,
-            created_at=project.created_at,
-            updated_at=project.updated_at,
-            tasks=grouped_tasks,
-            notes=project.notes
-        ))
-
-    return result
+    etag = await service.list_projects_etag(current_user.id)
+    if conditional.is_fresh(etag):
+        return conditional.not_modified()
+    projects = await service.list_project_details(current_user.id, etag)
+    return model_response(List[ProjectDetailResponse], projects, headers=conditional.headers)
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -82,18 +72,19 @@ async def get_project(
 ):
     """Get project by ID with tasks and notes."""
     project = await service.get_project(project_id, current_user.id, load_relations=True)
+    return model_response(ProjectDetailResponse, service.project_detail(project))
 
-    grouped_tasks = service.group_tasks_by_status(project.tasks)
-    return ProjectDetailResponse(
-        id=project.id,
-        name=project.name,
-        slug=project.slug,
-        objective=project.objective,
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-        tasks=grouped_tasks,
-        notes=project.notes
-    )
+
+@router.get("/{project_id}/changes", response_model=ProjectChangesResponse)
+async def get_project_changes(
+    project_id: UUID,
+    since: int = Query(..., ge=0, description="Project version the client already has"),
+    current_user: User = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service)
+):
+    """Get tasks and notes changed or deleted since a project version."""
+    changes = await service.get_project_changes(project_id, current_user.id, since)
+    return model_response(ProjectChangesResponse, changes)
 
 
 @router.get("/slug/{slug}", response_model=ProjectDetailResponse)
@@ -104,18 +95,17 @@ async def get_project_by_slug(
 ):
     """Get project by slug with tasks and notes."""
     project = await service.get_project_by_slug(slug, current_user.id, load_relations=True)
+    return model_response(ProjectDetailResponse, service.project_detail(project))
 
-    grouped_tasks = service.group_tasks_by_status(project.tasks)
-    return ProjectDetailResponse(
-        id=project.id,
-        name=project.name,
-        slug=project.slug,
-        objective=project.objective,
-        created_at=project.created_at,
-        updated_at=project.updated_at,
-        tasks=grouped_tasks,
-        notes=project.notes
-    )
+
+@router.get("/slug/{slug}/header", response_model=ProjectResponse)
+async def get_project_header_by_slug(
+    slug: str,
+    current_user: User = Depends(get_current_user),
+    service: ProjectService = Depends(get_project_service)
+):
+    """Get project header by slug, without tasks and notes."""
+    return await service.get_project_header_by_slug(slug, current_user.id)
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
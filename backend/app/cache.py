@@ -0,0 +1,374 @@
+"""Response cache for expensive reads, with tag-based invalidation.
+
+Service methods decorated with @cached(model, tables=...) store their
+result, serialized as model, under a key made of:
+
+- the method and its arguments, which include user_id
+- the current version of every tag the result depends on: for each table
+  in tables, the user's tag ("projects:<user_id>") and the table's own
+  ("projects"), bumped by writes made for no known user (scripts)
+
+Writes never delete entries; they bump the versions of their tags, so old
+keys are never read again and age out (TTL, LRU). Writes are seen at the
+session: ORM flushes and INSERT/UPDATE/DELETE statements run through it
+note the tables they touch, if any @cached method depends on them. The
+noted tags are bumped in one round trip just before the commit and again
+just after it (a reader in between may have cached pre-commit rows under
+the new version); nothing is sent to the backend while the transaction is
+open. The user is the one the request authenticated as: the auth
+dependencies set session.info["user_id"].
+
+Backends (CACHE_BACKEND):
+
+- none (the default): every call goes to the method
+- redis: entries and versions shared by all workers in any server that
+  speaks RESP (Redis, Valkey, KeyDB), through a minimal client on asyncio
+  streams. Entries are written with a TTL and versions without, so run it
+  with maxmemory-policy volatile-lru to never evict a version
+- memory: a per-worker LRU of CACHE_MAX_ENTRIES entries with a TTL of
+  CACHE_TTL_SECONDS. Versions are per worker too, so a write on another
+  worker is only seen once the entry expires: use it with a single worker
+  only. Results that must never be served stale take their version or
+  ETag as an argument instead
+
+Backend errors are logged and the call falls through to the method.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.exc import MissingGreenlet
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from app.config import settings
+from app.metrics import CACHE_ENTRIES, CACHE_EVICTIONS, CACHE_REQUESTS
+from app.responses import type_adapter
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "lifeos"
+
+
+class MemoryBackend:
+    """Per-worker LRU with a TTL per entry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            CACHE_EVICTIONS.labels("expired").inc()
+            CACHE_ENTRIES.set(len(self._entries))
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_EVICTIONS.labels("capacity").inc()
+        CACHE_ENTRIES.set(len(self._entries))
+
+    async def versions(self, tags: list[str]) -> list[int]:
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    async def close(self) -> None:
+        self._entries.clear()
+        CACHE_ENTRIES.set(0)
+
+
+class ReplyError(Exception):
+    """An error reply (-ERR ...) from the server."""
+
+
+class RedisBackend:
+    """Entries and versions in a RESP server, over one pipelined connection."""
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        [value] = await self.execute(("GET", key))
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.execute(("SET", key, value, "PX", max(1, int(ttl * 1000))))
+
+    async def versions(self, tags: list[str]) -> list[int]:
+        [values] = await self.execute(("MGET", *tags))
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def bump(self, tags: Iterable[str]) -> None:
+        await self.execute(*(("INCR", tag) for tag in tags))
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._disconnect()
+
+    async def execute(self, *commands: tuple) -> list:
+        """Send commands in one write and read their replies in order."""
+        if not commands:
+            return []
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._exchange(commands), self.timeout)
+            except ReplyError:
+                raise
+            except BaseException:
+                # A timeout or a dropped connection leaves replies unread
+                self._disconnect()
+                raise
+
+    async def _exchange(self, commands) -> list:
+        setup = []
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            if self.password:
+                setup.append(("AUTH", self.password))
+            if self.db:
+                setup.append(("SELECT", self.db))
+        commands = (*setup, *commands)
+
+        self._writer.write(b"".join(_encode(command) for command in commands))
+        await self._writer.drain()
+        replies = [await self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, ReplyError):
+                raise reply
+        return replies[len(setup):]
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Cache server closed the connection")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return ReplyError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            return None if length < 0 else (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [await self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line[:50]!r}")
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def _encode(command: tuple) -> bytes:
+    """A command as a RESP array of bulk strings."""
+    out = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+
+class Cache:
+    """Cached method results on a backend, with versioned tags."""
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get_or_load(
+        self,
+        name: str,
+        arguments: dict,
+        tags: list[str],
+        adapter: TypeAdapter,
+        load: Callable[[], Awaitable[Any]],
+        store: bool = True,
+    ) -> Any:
+        """The cached result of name(**arguments), or load()'s, stored for next time.
+
+        With store False a miss is loaded but not stored.
+        """
+        if self.backend is None:
+            return adapter.validate_python(await load(), from_attributes=True)
+
+        key = None
+        try:
+            versions = await self.backend.versions([f"{PREFIX}:tag:{tag}" for tag in tags]) if tags else []
+            digest = hashlib.blake2b(repr((sorted(arguments.items()), versions)).encode(), digest_size=16)
+            key = f"{PREFIX}:cache:{name}:{digest.hexdigest()}"
+            body = await self.backend.get(key)
+        except Exception as e:
+            logger.warning("Cache lookup for %s failed: %r", name, e)
+            CACHE_REQUESTS.labels(name, "error").inc()
+            body = None
+        else:
+            CACHE_REQUESTS.labels(name, "hit" if body is not None else "miss").inc()
+        if body is not None:
+            return adapter.validate_json(body)
+
+        value = adapter.validate_python(await load(), from_attributes=True)
+        if key is not None and store:
+            try:
+                await self.backend.set(key, adapter.dump_json(value), self.ttl)
+            except Exception as e:
+                logger.warning("Cache store for %s failed: %r", name, e)
+        return value
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Bump tags, so entries stored under their current versions are never read."""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.bump([f"{PREFIX}:tag:{tag}" for tag in sorted(tags)])
+        except Exception as e:
+            logger.warning("Cache invalidation of %s failed: %r", sorted(tags), e)
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def create_backend():
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND == "none":
+        return None
+    raise ValueError(f"Unknown CACHE_BACKEND {settings.CACHE_BACKEND!r}")
+
+
+cache = Cache(create_backend(), settings.CACHE_TTL_SECONDS)
+
+# Tables some @cached method depends on; writes to others bump nothing
+_tables: set[str] = set()
+
+
+def cached(model: Any, tables: Iterable[str] = ()) -> Callable:
+    """Cache an async service method's result as model, keyed by its arguments.
+
+    The method takes user_id; its entries are invalidated by writes to
+    tables for that user. Results loaded on a replica are served but not
+    stored: the tags are already bumped on the primary while the replica
+    may still return pre-write rows, and the writer's next read (on the
+    primary, see app.replicas) would find them under the new versions.
+    """
+    tables = tuple(tables)
+    _tables.update(tables)
+
+    def decorator(method):
+        name = method.__qualname__
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = {key: value for key, value in bound.arguments.items() if key != "self"}
+            user_id = arguments["user_id"]
+            tags = [tag for table in tables for tag in (table, f"{table}:{user_id}")]
+            return await cache.get_or_load(
+                name, arguments, tags, type_adapter(model), lambda: method(self, *args, **kwargs),
+                store=not _reads_replica(self),
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def _reads_replica(service) -> bool:
+    """True if the service's session is bound to a read replica."""
+    repository = getattr(service, "repository", None) or getattr(service, "repo", None)
+    session = getattr(repository, "db", None)
+    return session is not None and "replica" in session.info
+
+
+def _bump(tags: set[str]) -> None:
+    # Session events are synchronous; under the async engine they run in
+    # its greenlet, which can wait on the backend
+    try:
+        await_only(cache.invalidate(tags))
+    except MissingGreenlet:
+        pass  # A plain sync Session (scripts): nothing cached in this process
+
+
+def _wrote(session: Session, tables: set[str]) -> None:
+    tables &= _tables
+    if not tables:
+        return
+    user_id = session.info.get("user_id")
+    tags = {f"{table}:{user_id}" if user_id else table for table in tables}
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+
+def _pending_tables(session: Session) -> set[str]:
+    return {
+        instance.__table__.name
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    _wrote(session, _pending_tables(session))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _wrote(orm_execute_state.session, {orm_execute_state.statement.table.name})
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    # Runs ahead of the commit's own flush, so count what it will write
+    _wrote(session, _pending_tables(session))
+    tags = session.info.get("cache_tags")
+    if tags:
+        _bump(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        _bump(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("cache_tags", None)
@@ -1,17 +1,35 @@
-"""Database configuration and session management."""
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+"""Database configuration and session management.
+
+Repositories only flush; the request-scoped session from get_db owns the
+single commit, so each request is one unit of work. Side effects that must
+only happen once that commit succeeds (dropping per-worker caches) are
+registered with after_commit.
+
+Safe-method requests (GET/HEAD/OPTIONS) get a read session instead. It
+runs in autocommit mode, so there is no BEGIN/COMMIT round trip and no
+transaction to hold open, and its Session class refuses to flush. The
+trade-off is that each statement sees its own snapshot. With
+DATABASE_REPLICA_URLS set, read sessions are routed to replicas (see
+app.replicas); replica connections default to read-only transactions at
+the server.
+
+Pool sizing, PgBouncer mode and liveness probing are shared by all
+engines; see app.pooling. So is the opt-in slow-query log
+(app.slow_queries).
+"""
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Session
 from app.config import settings
+from app.pooling import engine_options
+from app.replicas import ReplicaPool
+from app.slow_queries import SlowQueryLog
 
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=5,  # Single user, small pool is fine
-    max_overflow=2,
-    pool_pre_ping=True,  # Verify connections before using
-)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -22,6 +40,73 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+class ReadOnlySession(Session):
+    """Session for read requests; flushing pending changes is an error."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _refuse_flush(session, flush_context, instances) -> None:
+    raise InvalidRequestError("Read-only session cannot write; use a POST/PUT/PATCH/DELETE endpoint")
+
+
+def make_read_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Session factory for autocommit, flush-refusing reads on bind."""
+    return async_sessionmaker(
+        bind.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+AsyncReadSessionLocal = make_read_sessionmaker(engine)
+
+replicas = ReplicaPool(
+    [
+        create_async_engine(url, **engine_options(read_only=True))
+        for url in settings.replica_urls
+    ],
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+)
+for _replica in replicas.replicas:
+    _replica.engine.pool.stats.name = _replica.name
+
+
+slow_queries = SlowQueryLog(
+    settings.SLOW_QUERY_MS,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    size=settings.SLOW_QUERY_BUFFER_SIZE,
+)
+if settings.SLOW_QUERY_MS > 0:
+    for _engine in [engine, *(replica.engine for replica in replicas.replicas)]:
+        slow_queries.install(_engine)
+
+
+def open_read_session(prefer_primary: bool = False) -> AsyncSession:
+    """A read session on a healthy replica, else (or if prefer_primary) the primary."""
+    return replicas.read_session(AsyncReadSessionLocal, prefer_primary)
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run callback after the session's current transaction commits.
+
+    Callbacks are discarded if the transaction rolls back instead.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    session.info.pop("after_commit", None)
@@ -41,6 +41,8 @@ async def get_current_user(
             detail="User not found"
         )
 
+    # Writes in this session are made for this user (app.cache tags)
+    db.info["user_id"] = user.id
     return user
 
 
@@ -81,4 +83,5 @@ async def require_api_key(
             detail="User not found"
         )
 
+    db.info["user_id"] = user.id
     return user
@@ -0,0 +1,35 @@
+"""Conditional GET dependency: If-None-Match in, ETag out."""
+from typing import Optional
+
+from fastapi import Header, Response, status
+
+from app.etag import etag_matches
+
+# Clients may keep the body but must revalidate before using it
+CACHE_CONTROL = "private, no-cache"
+
+
+class ConditionalGet:
+    """
+    Per-request conditional GET state.
+
+    Endpoints compute their ETag before loading anything and return
+    not_modified() when is_fresh(etag); otherwise they build the body and
+    send headers (the ETag) with it.
+    """
+
+    def __init__(self, if_none_match: Optional[str] = Header(None)):
+        self.if_none_match = if_none_match
+        self.etag: Optional[str] = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": CACHE_CONTROL} if self.etag else {}
+
+    def is_fresh(self, etag: str) -> bool:
+        """Record the response's ETag; True if the client's copy has it."""
+        self.etag = etag
+        return etag_matches(self.if_none_match, etag)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
@@ -1,15 +1,42 @@
 """Database dependency for FastAPI."""
 from typing import AsyncGenerator
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import AsyncSessionLocal
+from app.config import settings
+from app.database import AsyncSessionLocal, open_read_session, replicas
+from app.replicas import mark_write, wrote_recently
 
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides a read-only database session.
+
+    Autocommit, so no transaction is opened and nothing is committed.
+    Served by a replica when one is healthy, unless this client wrote
+    within READ_YOUR_WRITES_SECONDS.
+    """
+    async with open_read_session(wrote_recently(request, settings.READ_YOUR_WRITES_SECONDS)) as session:
+        yield session
+
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency that provides a database session.
 
-    Automatically commits on success and rolls back on error.
+    GET/HEAD/OPTIONS requests get the read-only session from get_read_db,
+    so routers and auth dependencies share one session either way.
+    Otherwise the session is the request's unit of work: repositories only
+    flush, and this is the single commit on success (rollback on error).
     """
+    if request.method in READ_METHODS:
+        async with open_read_session(wrote_recently(request, settings.READ_YOUR_WRITES_SECONDS)) as session:
+            yield session
+        return
+
+    if replicas:
+        mark_write(response, settings.READ_YOUR_WRITES_SECONDS)
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -0,0 +1,60 @@
+"""ETag helpers for conditional GETs.
+
+Single resources with a version column use it directly (make_etag).
+Collections use a fingerprint: count(*) and max(updated_at) of every table
+the response is built from, read by one aggregate statement
+(fingerprint_query) before anything is loaded. Any insert or update moves
+a max(updated_at), and any delete lowers a count, so the fingerprint
+changes whenever the response would.
+"""
+import hashlib
+from typing import Optional
+
+from sqlalchemy import Select, func, select, true
+
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """Build a quoted entity tag from version-identifying parts."""
+    tag = '"' + "-".join(str(part) for part in parts) + '"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header covers etag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    W/"x" and "x" match each other; "*" matches any current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted
+        for candidate in if_none_match.split(",")
+    )
+
+
+def fingerprint_query(*sources: Select) -> Select:
+    """One statement reading count(*) and max(updated_at) of each source.
+
+    Each source selects the updated_at column of the rows a response is
+    built from, e.g. select(Capture.updated_at).where(Capture.user_id == ...).
+    """
+    aggregates = []
+    for source in sources:
+        rows = source.subquery()
+        aggregates.append(
+            select(func.count(), func.max(rows.c[0])).select_from(rows).subquery()
+        )
+    joined = aggregates[0]
+    for aggregate in aggregates[1:]:
+        joined = joined.join(aggregate, true())  # Each is a single row
+    return select(*(column for aggregate in aggregates for column in aggregate.c)).select_from(joined)
+
+
+def fingerprint_etag(name: str, *parts) -> str:
+    """Weak ETag for a collection from its fingerprint row and request parameters."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return make_etag(name, digest, weak=True)
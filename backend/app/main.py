@@ -1,17 +1,58 @@
 """FastAPI application factory."""
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
+from app.cache import cache
+from app.database import engine, replicas, slow_queries
 from app.exceptions import AppError
+from app.metrics import MetricsMiddleware, mark_worker_dead
+from app.query_recorder import QueryBudgetMiddleware
+from app.pooling import run_liveness_probes
+from app.partitions import run_partition_maintenance
 from app.api.v1.auth import router as auth_router
 from app.api.v1.healthcheck import router as health_router
+from app.api.v1.metrics import router as metrics_router
 from app.api.v1.captures import router as captures_router
 from app.api.v1.calendar import router as calendar_router
 from app.api.v1.journal import router as journal_router
 from app.api.v1.projects import router as projects_router
 from app.api.v1.fitness import router as fitness_router
+from app.api.v1.debug import router as debug_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background tasks: replica health, idle connection liveness, partition upkeep."""
+    background = []
+    if replicas:
+        await replicas.check()
+        background.append(asyncio.create_task(
+            replicas.run_health_checks(settings.REPLICA_HEALTH_INTERVAL_SECONDS)
+        ))
+    if settings.DB_LIVENESS_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(run_liveness_probes(
+            [engine, *(replica.engine for replica in replicas.replicas)],
+            settings.DB_LIVENESS_INTERVAL_SECONDS,
+        )))
+    if settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(run_partition_maintenance(
+            engine, settings.PARTITION_MONTHS_AHEAD, settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+        )))
+    yield
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await slow_queries.wait_for_explains()
+    await cache.close()
+    await replicas.dispose()
+    await engine.dispose()
+    mark_worker_dead()
 
 
 def create_app() -> FastAPI:
@@ -22,6 +63,9 @@ def create_app() -> FastAPI:
         description="Personal productivity system API",
         docs_url="/api/docs" if settings.DEBUG else None,
         redoc_url="/api/redoc" if settings.DEBUG else None,
+        lifespan=lifespan,
+        # orjson for everything not already serialized by app.responses
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware - allow frontend origin
@@ -33,22 +77,30 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Statement budgets/N+1 warnings, inside the metrics so both share one recorder
+    app.add_middleware(QueryBudgetMiddleware)
+
+    # Request metrics; added last so it wraps everything, CORS included
+    app.add_middleware(MetricsMiddleware)
+
     # Global exception handler for AppError
     @app.exception_handler(AppError)
     async def app_error_handler(request: Request, exc: AppError):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail, "code": exc.code},
         )
 
     # Include routers
     app.include_router(health_router, prefix="/api")
+    app.include_router(metrics_router, prefix="/api")
     app.include_router(auth_router, prefix="/api")
     app.include_router(captures_router, prefix="/api")
     app.include_router(calendar_router, prefix="/api")
     app.include_router(journal_router, prefix="/api")
     app.include_router(projects_router, prefix="/api")
     app.include_router(fitness_router, prefix="/api")
+    app.include_router(debug_router, prefix="/api")
 
     return app
 
@@ -0,0 +1,168 @@
+"""Prometheus metrics: per-route request latency and database work.
+
+MetricsMiddleware records, per method and route template (e.g.
+/api/v1/captures/{capture_id}, so ids don't explode the label set):
+
+- lifeos_http_requests_total: requests by status code
+- lifeos_http_request_duration_seconds: latency histogram; p50/p95/p99
+  come from histogram_quantile() over its buckets
+- lifeos_http_requests_in_flight: requests being served right now
+- lifeos_db_statements_per_request / lifeos_db_time_per_request_seconds:
+  statements executed while serving the request and their total time
+
+and, for the response cache (app.cache), per cached method:
+
+- lifeos_cache_requests_total: lookups by result (hit, miss, error); the
+  hit rate is hit / (hit + miss)
+- lifeos_cache_evictions_total / lifeos_cache_entries: entries the memory
+  backend dropped (capacity, expired) and holds; Redis reports its own as
+  evicted_keys and expired_keys in INFO stats
+
+and, for the connection pools (app.pooling), per pool ("primary" or the
+replica's host:port/database):
+
+- lifeos_db_pool_checkout_wait_seconds: time to get a connection
+- lifeos_db_pool_overflow_events_total / lifeos_db_pool_timeouts_total /
+  lifeos_db_pool_liveness_failures_total: see app.pooling
+- lifeos_db_pool_connections: connections in use and idle, summed over
+  the live workers
+
+Statements are counted by the request's QueryRecorder (app.query_recorder).
+
+Workers: each uvicorn worker is its own process with its own counters. When
+PROMETHEUS_MULTIPROC_DIR is set (it must be, before the workers start, and
+emptied on each deploy), prometheus_client keeps the values in files there
+and /api/metrics sums them across workers, whichever worker serves the
+scrape. Without it, /api/metrics reports the serving worker only.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess,
+)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.query_recorder import record_queries
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Label for requests that match no route, so scanners can't add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "lifeos_http_requests_total", "HTTP requests served.", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "lifeos_http_request_duration_seconds", "HTTP request latency.",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "lifeos_http_requests_in_flight", "HTTP requests being served.",
+    ["method", "route"], multiprocess_mode="livesum",
+)
+DB_STATEMENTS = Histogram(
+    "lifeos_db_statements_per_request", "Database statements executed per HTTP request.",
+    ["method", "route"], buckets=STATEMENT_BUCKETS,
+)
+DB_TIME = Histogram(
+    "lifeos_db_time_per_request_seconds", "Time spent executing database statements per HTTP request.",
+    ["method", "route"], buckets=DB_TIME_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "lifeos_cache_requests_total", "Response cache lookups.", ["cache", "result"]
+)
+CACHE_EVICTIONS = Counter(
+    "lifeos_cache_evictions_total", "Entries dropped by the in-memory response cache.", ["reason"]
+)
+CACHE_ENTRIES = Gauge(
+    "lifeos_cache_entries", "Entries held by the in-memory response cache.",
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "lifeos_db_pool_checkout_wait_seconds", "Time to check a connection out of the pool.",
+    ["pool"], buckets=POOL_WAIT_BUCKETS,
+)
+POOL_OVERFLOW_EVENTS = Counter(
+    "lifeos_db_pool_overflow_events_total", "Checkouts that opened a connection beyond the pool size.", ["pool"]
+)
+POOL_TIMEOUTS = Counter(
+    "lifeos_db_pool_timeouts_total", "Checkouts that gave up waiting for a connection.", ["pool"]
+)
+POOL_LIVENESS_FAILURES = Counter(
+    "lifeos_db_pool_liveness_failures_total", "Liveness probes that found a dead idle connection.", ["pool"]
+)
+POOL_CONNECTIONS = Gauge(
+    "lifeos_db_pool_connections", "Pooled connections by state.",
+    ["pool", "state"], multiprocess_mode="livesum",
+)
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route scope will be dispatched to."""
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # Path matches, method doesn't (405)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request and database metrics per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, route = scope["method"], route_template(scope)
+        status = 500  # Unless the app gets as far as sending a response
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        with record_queries() as recorder:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                in_flight.dec()
+                REQUESTS.labels(method, route, str(status)).inc()
+                LATENCY.labels(method, route).observe(elapsed)
+                DB_STATEMENTS.labels(method, route).observe(recorder.statements)
+                DB_TIME.labels(method, route).observe(recorder.seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """The exposition-format body and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the shared files on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
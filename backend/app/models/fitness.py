@@ -1,13 +1,14 @@
 """Fitness models for workout tracking."""
 from datetime import datetime, timezone
 from decimal import Decimal
-from sqlalchemy import String, Integer, SmallInteger, DateTime, ForeignKey, Text, Boolean, Numeric, UniqueConstraint, CheckConstraint, Index
+from sqlalchemy import String, Integer, SmallInteger, DateTime, ForeignKey, Text, Boolean, Numeric, UniqueConstraint, CheckConstraint, Index, DDL, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 import enum
 
 from app.database import Base
+from app.partitions import create_default_partition_sql
 
 
 class SessionStatus(str, enum.Enum):
@@ -64,6 +65,12 @@ class Exercise(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="uq_exercises_user_name"),
+        # Serves ILIKE '%...%' and similarity search on names (needs pg_trgm)
+        Index(
+            "idx_exercises_name_trgm", "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
     def __repr__(self) -> str:
@@ -88,6 +95,9 @@ class WorkoutProgram(Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Bumped on any change to the program, its entries or their exercises;
+    # keys the program detail cache and ETag
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -107,11 +117,14 @@ class WorkoutProgram(Base):
         "ProgramExercise",
         back_populates="program",
         cascade="all, delete-orphan",
-        order_by="ProgramExercise.sort_order"
+        order_by="ProgramExercise.sort_order",
+        passive_deletes=True,
     )
+    # ON DELETE SET NULL does the unlinking; no need to load sessions first
     workout_sessions: Mapped[list["WorkoutSession"]] = relationship(
         "WorkoutSession",
-        back_populates="program"
+        back_populates="program",
+        passive_deletes=True,
     )
 
     __table_args__ = (
@@ -236,7 +249,8 @@ class WorkoutSession(Base):
         "WorkoutLog",
         back_populates="session",
         cascade="all, delete-orphan",
-        order_by="WorkoutLog.created_at"
+        order_by="WorkoutLog.created_at",
+        passive_deletes=True,
     )
 
     __table_args__ = (
@@ -257,6 +271,12 @@ class WorkoutLog(Base):
         primary_key=True,
         default=uuid.uuid4
     )
+    # Partition key: copied from the session so all of a session's sets land
+    # in one monthly partition and time-bounded history queries can prune.
+    session_started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True
+    )
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("workout_sessions.id", ondelete="CASCADE"),
@@ -284,12 +304,107 @@ class WorkoutLog(Base):
     exercise: Mapped["Exercise"] = relationship("Exercise", back_populates="workout_logs")
 
     __table_args__ = (
-        UniqueConstraint("session_id", "exercise_id", "set_number", name="uq_workout_log_set"),
+        # Unique and primary keys on a partitioned table must include the
+        # partition key; session_started_at is fixed per session, so this
+        # still means one row per (session, exercise, set).
+        UniqueConstraint(
+            "session_id", "exercise_id", "set_number", "session_started_at",
+            name="uq_workout_log_set",
+        ),
         CheckConstraint("set_number BETWEEN 1 AND 20", name="ck_set_number"),
         CheckConstraint("reps BETWEEN 0 AND 200", name="ck_reps"),
         Index("idx_workout_logs_session", "session_id"),
         Index("idx_workout_logs_exercise", "exercise_id", created_at.desc()),
+        {"postgresql_partition_by": "RANGE (session_started_at)"},
     )
 
     def __repr__(self) -> str:
         return f"<WorkoutLog(id={self.id}, set={self.set_number}, reps={self.reps})>"
+
+
+class PersonalRecord(Base):
+    """Best reps achieved at each weight for an exercise.
+
+    Read model maintained by FitnessService.log_set. Best weight and best
+    estimated 1RM are both derivable from these rows, so an exercise's PRs
+    are a primary-key range scan rather than an aggregate over workout_logs.
+    Bodyweight sets are stored at weight_kg = 0.
+    """
+    __tablename__ = "personal_records"
+
+    exercise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    weight_kg: Mapped[Decimal] = mapped_column(Numeric(6, 2), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    session_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("workout_sessions.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    reps: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    e1rm_kg: Mapped[Decimal] = mapped_column(Numeric(7, 2), nullable=False)
+    achieved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<PersonalRecord(exercise={self.exercise_id}, weight={self.weight_kg}, reps={self.reps})>"
+
+
+class PersonalRecordEvent(Base):
+    """A set that beat a previous personal record."""
+    __tablename__ = "personal_record_history"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    exercise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    session_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("workout_sessions.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    record_type: Mapped[str] = mapped_column(String(20), nullable=False)  # weight, reps, e1rm
+    weight_kg: Mapped[Decimal] = mapped_column(Numeric(6, 2), nullable=False)
+    reps: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    e1rm_kg: Mapped[Decimal] = mapped_column(Numeric(7, 2), nullable=False)
+    achieved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("idx_personal_record_history_exercise", "exercise_id", achieved_at.desc()),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PersonalRecordEvent(type={self.record_type}, weight={self.weight_kg}, reps={self.reps})>"
+
+
+event.listen(
+    Exercise.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+
+# create_all only creates the partitioned parent; give it somewhere to put rows
+event.listen(
+    WorkoutLog.__table__,
+    "after_create",
+    DDL(create_default_partition_sql("workout_logs")),
+)
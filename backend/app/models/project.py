@@ -1,6 +1,6 @@
 """Project models for task management."""
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -34,6 +34,8 @@ class Project(Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     slug: Mapped[str] = mapped_column(String(50), nullable=False, unique=True, index=True)
     objective: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Bumped on every task/note mutation; clients sync deltas against it
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -53,13 +55,15 @@ class Project(Base):
         "ProjectTask",
         back_populates="project",
         cascade="all, delete-orphan",
-        order_by="ProjectTask.sort_order"
+        order_by="ProjectTask.sort_order",
+        passive_deletes=True,
     )
     notes: Mapped[list["ProjectNote"]] = relationship(
         "ProjectNote",
         back_populates="project",
         cascade="all, delete-orphan",
-        order_by="ProjectNote.updated_at.desc()"
+        order_by="ProjectNote.updated_at.desc()",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -90,6 +94,7 @@ class ProjectTask(Base):
         index=True
     )
     sort_order: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -110,6 +115,10 @@ class ProjectTask(Base):
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="tasks")
 
+    __table_args__ = (
+        Index("idx_project_tasks_project_version", "project_id", "version"),
+    )
+
     def __repr__(self) -> str:
         return f"<ProjectTask(id={self.id}, title={self.title[:30]}, status={self.status})>"
 
@@ -130,6 +139,7 @@ class ProjectNote(Base):
     )
 
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -146,5 +156,42 @@ class ProjectNote(Base):
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="notes")
 
+    __table_args__ = (
+        Index("idx_project_notes_project_version", "project_id", "version"),
+    )
+
     def __repr__(self) -> str:
         return f"<ProjectNote(id={self.id}, content={self.content[:30]})>"
+
+
+class ProjectTombstone(Base):
+    """Record of a deleted task or note, kept so delta sync can report deletes."""
+    __tablename__ = "project_tombstones"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False)  # task, note
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index("idx_project_tombstones_project_version", "project_id", "version"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProjectTombstone(entity={self.entity_type}:{self.entity_id}, version={self.version})>"
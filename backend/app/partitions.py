@@ -0,0 +1,164 @@
+"""Monthly range partitioning helpers.
+
+workout_logs is declared PARTITION BY RANGE (session_started_at) in the
+model. Each calendar month (UTC) gets its own partition named
+``<table>_yYYYYmMM``. A DEFAULT partition catches rows outside every
+month that has been created. That partition should stay empty: Postgres
+refuses to create a month whose rows already sit in the default partition.
+
+Every worker therefore runs ensure_partitions at startup and every
+PARTITION_MAINTENANCE_INTERVAL_SECONDS (run_partition_maintenance), which
+creates months PARTITION_MONTHS_AHEAD ahead of time. Rows that reached the
+default partition anyway (maintenance off, or an out-of-range start time)
+are moved into their month's partition when it is created, so the table
+never needs manual repair. An advisory lock serializes runs across workers
+and scripts/create_partitions.py.
+
+The SQL builders are plain strings so the same DDL serves the Alembic
+migration, the maintenance job and the test fixtures.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Table -> partition key column
+MONTHLY_PARTITIONED = {
+    "workout_logs": "session_started_at",
+}
+
+# pg_advisory_xact_lock key held while partitions are created
+MAINTENANCE_LOCK_KEY = 0x706172746E  # "partn"
+
+
+def month_start(value: date | datetime) -> date:
+    """First day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> list[date]:
+    """Month starts from first's month through last's month, inclusive."""
+    months = []
+    month = month_start(first)
+    while month <= month_start(last):
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} FOR VALUES "
+        f"FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def month_range_sql(key: str, month: date) -> str:
+    """WHERE condition selecting month's rows, matching create_partition_sql's bounds."""
+    return (
+        f"{key} >= '{month.isoformat()} 00:00:00+00' "
+        f"AND {key} < '{add_months(month, 1).isoformat()} 00:00:00+00'"
+    )
+
+
+def detach_partition_sql(table: str, month: date) -> str:
+    return f"ALTER TABLE {table} DETACH PARTITION {partition_name(table, month)}"
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    months_ahead: int = 3,
+    start: date | None = None,
+) -> list[str]:
+    """Create monthly partitions from start (default: this month) through months_ahead.
+
+    Also creates the month of any row found in the default partition,
+    moving those rows into it. Idempotent; returns the names of the
+    partitions that now exist for the range and for those months.
+    """
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+    first = month_start(start or datetime.now(timezone.utc))
+    last = add_months(month_start(datetime.now(timezone.utc)), months_ahead)
+    names = []
+    for table, key in MONTHLY_PARTITIONED.items():
+        existing = set(await list_partitions(conn, table))
+        stray = await default_partition_months(conn, table, key)
+        for month in sorted({*months_between(first, last), *stray}):
+            name = partition_name(table, month)
+            if name not in existing:
+                moved = await create_partition(conn, table, key, month)
+                if moved:
+                    logger.warning("Moved %d rows from %s_default into %s", moved, table, name)
+            names.append(name)
+    return names
+
+
+async def default_partition_months(conn: AsyncConnection, table: str, key: str) -> list[date]:
+    """Months (UTC) of the rows sitting in table's default partition."""
+    result = await conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', {key} AT TIME ZONE 'UTC')::date FROM {table}_default"
+    ))
+    return list(result.scalars().all())
+
+
+async def create_partition(conn: AsyncConnection, table: str, key: str, month: date) -> int:
+    """Create month's partition, moving its rows out of the default partition first.
+
+    Returns how many rows were moved. Inserts into table wait until the
+    transaction commits, so none can reach the default partition meanwhile.
+    """
+    staging = f"{partition_name(table, month)}_staging"
+    await conn.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+    await conn.execute(text(f"CREATE TEMPORARY TABLE {staging} (LIKE {table}) ON COMMIT DROP"))
+    moved = await conn.execute(text(
+        f"WITH moved AS (DELETE FROM {table}_default WHERE {month_range_sql(key, month)} RETURNING *) "
+        f"INSERT INTO {staging} SELECT * FROM moved"
+    ))
+    await conn.execute(text(create_partition_sql(table, month)))
+    if moved.rowcount:
+        await conn.execute(text(f"INSERT INTO {table} SELECT * FROM {staging}"))
+    await conn.execute(text(f"DROP TABLE {staging}"))
+    return moved.rowcount
+
+
+async def run_partition_maintenance(engine: AsyncEngine, months_ahead: int, interval: float) -> None:
+    """ensure_partitions now and every interval seconds, on its own transaction."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                await ensure_partitions(conn, months_ahead=months_ahead)
+        except Exception as e:
+            logger.warning("Partition maintenance failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table ORDER BY c.relname"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
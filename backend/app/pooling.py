@@ -0,0 +1,198 @@
+"""Connection pool configuration, instrumentation and liveness probing.
+
+Each worker process has its own pools (one for the primary, one per
+replica), sized by DB_POOL_SIZE + DB_MAX_OVERFLOW. With several workers the
+server-side connection count is workers x pools x (size + overflow), so
+tune from the numbers InstrumentedPool records rather than by guessing:
+
+- checkout wait: time from asking the pool for a connection to getting
+  one, including opening a new connection when the pool has room to grow
+- in use: connections currently checked out
+- overflow events: checkouts that had to open a connection beyond
+  DB_POOL_SIZE; frequent ones mean the pool is too small for the load
+- timeouts: checkouts that gave up after DB_POOL_TIMEOUT
+
+They are exported to Prometheus (lifeos_db_pool_*, see app.metrics), which
+sums them across workers. /api/health/pool shows the serving worker's own
+pools as JSON; it names the replicas, so it is not exposed publicly.
+
+Liveness: instead of pre-ping (a round trip on every checkout), a
+background task checks out each idle connection on an interval and runs
+SELECT 1. A dead connection raises a disconnect error, which makes
+SQLAlchemy invalidate the whole pool so every stale connection is replaced
+on its next checkout. Requests can still hit a connection that died since
+the last probe; DB_POOL_RECYCLE bounds connection age as a second guard.
+
+PgBouncer mode (DB_PGBOUNCER): in transaction pooling, consecutive
+statements may run on different server connections, so asyncpg's named
+prepared statements cannot be reused. Both statement caches are disabled
+and every prepared statement gets a unique name.
+"""
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from uuid import uuid4
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.metrics import (
+    POOL_CHECKOUT_WAIT, POOL_CONNECTIONS, POOL_LIVENESS_FAILURES, POOL_OVERFLOW_EVENTS,
+    POOL_TIMEOUTS, POOL_WAIT_BUCKETS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Checkout counters for one pool, since the worker started.
+
+    name labels the pool's Prometheus series.
+    """
+    name: str = "primary"
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    overflow_events: int = 0
+    timeouts: int = 0
+    liveness_failures: int = 0
+    # Non-cumulative counts per POOL_WAIT_BUCKETS bound, plus one for the rest
+    wait_counts: list[int] = field(default_factory=lambda: [0] * (len(POOL_WAIT_BUCKETS) + 1))
+
+    def observe_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        self.wait_counts[bisect.bisect_left(POOL_WAIT_BUCKETS, seconds)] += 1
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout waits, overflow and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        overflow_before = self._overflow
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            POOL_TIMEOUTS.labels(self.stats.name).inc()
+            raise
+        waited = time.perf_counter() - started
+        self.stats.observe_wait(waited)
+        POOL_CHECKOUT_WAIT.labels(self.stats.name).observe(waited)
+        if self._overflow > max(overflow_before, 0):
+            self.stats.overflow_events += 1
+            POOL_OVERFLOW_EVENTS.labels(self.stats.name).inc()
+        self._export_connections()
+        return record
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._export_connections()
+
+    def _export_connections(self) -> None:
+        POOL_CONNECTIONS.labels(self.stats.name, "in_use").set(self.checkedout())
+        POOL_CONNECTIONS.labels(self.stats.name, "idle").set(self.checkedin())
+
+    def recreate(self) -> "InstrumentedPool":
+        # engine.dispose() swaps in a fresh pool; the counters carry over
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def engine_options(read_only: bool = False) -> dict[str, Any]:
+    """Keyword arguments for create_async_engine from the DB_* settings.
+
+    read_only makes the server default every transaction to read-only, for
+    replica connections.
+    """
+    connect_args: dict[str, Any] = {}
+    if read_only:
+        connect_args["server_settings"] = {"default_transaction_read_only": "on"}
+    if settings.DB_PGBOUNCER:
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    return {
+        "echo": settings.DEBUG,
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "connect_args": connect_args,
+    }
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Current occupancy and cumulative checkout stats of engine's pool."""
+    pool = engine.pool
+    status: dict[str, Any] = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is None:
+        return status
+
+    cumulative, buckets = 0, {}
+    for bound, count in zip([*map(str, POOL_WAIT_BUCKETS), "+Inf"], stats.wait_counts):
+        cumulative += count
+        buckets[bound] = cumulative
+    status.update(
+        checkouts=stats.checkouts,
+        checkout_wait_seconds={
+            "total": round(stats.wait_seconds_total, 6),
+            "max": round(stats.wait_seconds_max, 6),
+            "buckets": buckets,
+        },
+        overflow_events=stats.overflow_events,
+        timeouts=stats.timeouts,
+        liveness_failures=stats.liveness_failures,
+    )
+    return status
+
+
+async def probe_idle_connections(engine: AsyncEngine) -> bool:
+    """Run SELECT 1 on each idle connection of engine's pool.
+
+    The queue is FIFO, so checking out and returning one connection at a
+    time visits every idle connection once; connections in use are left
+    alone. Stops at the first failure. Returns False if any connection was
+    dead.
+    """
+    for _ in range(engine.pool.checkedin()):
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            stats = getattr(engine.pool, "stats", None)
+            if stats is not None:
+                stats.liveness_failures += 1
+                POOL_LIVENESS_FAILURES.labels(stats.name).inc()
+            logger.warning("Liveness probe on %s failed: %s", engine.url.host, e)
+            return False
+    return True
+
+
+async def run_liveness_probes(engines: list[AsyncEngine], interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.gather(*(probe_idle_connections(engine) for engine in engines))
@@ -0,0 +1,169 @@
+"""Per-request SQL statement recording and N+1 detection.
+
+Cursor events on every engine add each statement to the QueryRecorder of
+the request in progress (a contextvar, so concurrent requests on one
+worker don't mix). Statements are grouped by their normalized text:
+placeholders, casts and the length of IN lists and VALUES rows removed,
+so a query issued in a loop counts as one statement repeated.
+
+QueryBudgetMiddleware then, per request:
+
+- in DEBUG, adds X-DB-Queries (statement count) and X-DB-Time
+  (milliseconds spent executing them) response headers
+- logs a warning when the request ran more than DB_QUERY_BUDGET
+  statements, or one statement more than DB_QUERY_REPEAT_LIMIT times,
+  the usual sign of a query in a loop
+- logs every request's report at DEBUG, with the report attached to the
+  record as `queries` (the test suite's budget fixture reads these)
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(
+    r"(?:\$\d+|%\(\w+\)s|\?)(?:::(?:TIMESTAMP WITH(?:OUT)? TIME ZONE|DOUBLE PRECISION|\w+)(?:\[\])?)?"
+)
+_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """statement with parameters and list lengths removed, e.g. IN (?)."""
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _LIST.sub("?", statement)
+    statement = _ROWS.sub("(?)", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class QueryRecorder:
+    """Statements executed on behalf of one request."""
+    statements: int = 0
+    seconds: float = 0.0
+    counts: Counter = field(default_factory=Counter)
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.counts[normalize_statement(statement)] += 1
+
+    def repeated(self, limit: int) -> dict[str, int]:
+        """Normalized statements executed more than limit times."""
+        return {statement: count for statement, count in self.counts.items() if count > limit}
+
+
+_current: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+
+def current_recorder() -> Optional[QueryRecorder]:
+    """The recorder of the request being served, or None outside a request."""
+    return _current.get()
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Record statements run inside the block.
+
+    Nested blocks share the outer recorder, so middlewares that each want
+    the request's statements see the same counts.
+    """
+    recorder = _current.get()
+    if recorder is not None:
+        yield recorder
+        return
+    recorder = QueryRecorder()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    # On the statement's context, not the connection: after_cursor_execute
+    # never fires for a statement that raises, and a failed one must not
+    # leave anything behind on the pooled connection
+    if context is not None:
+        context._query_recorder_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    recorder = _current.get()
+    if recorder is None:
+        return
+    started = getattr(context, "_query_recorder_started", None)
+    recorder.add(statement, time.perf_counter() - started if started is not None else 0.0)
+
+
+@dataclass
+class QueryReport:
+    """What one request did to the database, for logging."""
+    method: str
+    route: str
+    statements: int
+    seconds: float
+    repeated: dict[str, int]
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware reporting each request's statements (see module docstring)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as recorder:
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(recorder.statements)
+                    headers["X-DB-Time"] = f"{recorder.seconds * 1000:.1f}"
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        report = QueryReport(
+            method=scope["method"],
+            # Set by the router once the request is dispatched
+            route=getattr(scope.get("route"), "path", scope["path"]),
+            statements=recorder.statements,
+            seconds=recorder.seconds,
+            repeated=recorder.repeated(settings.DB_QUERY_REPEAT_LIMIT),
+        )
+        if report.statements > settings.DB_QUERY_BUDGET:
+            logger.warning(
+                "%s %s ran %d statements (budget %d) in %.1f ms",
+                report.method, report.route, report.statements,
+                settings.DB_QUERY_BUDGET, report.seconds * 1000,
+            )
+        for statement, count in report.repeated.items():
+            logger.warning(
+                "%s %s ran the same statement %d times, likely a query in a loop: %.200s",
+                report.method, report.route, count, statement,
+            )
+        logger.debug(
+            "%s %s ran %d statements in %.1f ms",
+            report.method, report.route, report.statements, report.seconds * 1000,
+            extra={"queries": report},
+        )
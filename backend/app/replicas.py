@@ -0,0 +1,152 @@
+"""Read-replica routing for read sessions.
+
+Read sessions (see app.database) are bound when they are created: to a
+healthy replica when one is configured and the client has not written
+recently, otherwise to the primary. Write sessions always use the primary.
+
+Health: a background task (started from the app lifespan) probes every
+replica on an interval. A replica is used only after a probe has shown it
+reachable, streaming from the primary and no further behind than
+REPLICA_MAX_LAG_SECONDS.
+
+Read-your-writes: every write request sets a short-lived cookie holding the
+write time. While it is younger than READ_YOUR_WRITES_SECONDS, that
+client's reads go to the primary, so a save followed by a reload never
+shows the pre-save state from a lagging replica. A cookie rather than
+worker memory, because the follow-up read may land on another worker.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_COOKIE = "last_write"
+
+# Seconds of replay lag; 0 when caught up with everything received (an idle
+# primary otherwise looks like growing lag) or when not a standby at all.
+# NULL when the standby is not streaming: a disconnected one has replayed
+# all it received too, yet falls further behind by the second. Reading
+# pg_stat_wal_receiver.status needs pg_read_all_stats (or pg_monitor).
+_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+@dataclass
+class Replica:
+    """One replica engine and what the last probe found."""
+    engine: AsyncEngine
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    read_bind: AsyncEngine = field(init=False)
+
+    def __post_init__(self):
+        self.read_bind = self.engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    @property
+    def name(self) -> str:
+        url = self.engine.url
+        return f"{url.host}:{url.port}/{url.database}"
+
+
+class ReplicaPool:
+    """Health-checked replicas, handed out round-robin."""
+
+    def __init__(self, engines: list[AsyncEngine], max_lag_seconds: float, probe_timeout: float = 2.0):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.probe_timeout = probe_timeout
+        self._turn = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """A healthy replica, or None when there is none to use."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def read_session(self, factory: async_sessionmaker, prefer_primary: bool = False) -> AsyncSession:
+        """A session from factory, rebound to a healthy replica unless prefer_primary.
+
+        A replica session has the replica's name in session.info["replica"].
+        """
+        replica = None if prefer_primary else self.pick()
+        if replica is None:
+            return factory()
+        session = factory(bind=replica.read_bind)
+        session.info["replica"] = replica.name
+        return session
+
+    async def _probe(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await asyncio.wait_for(
+                    conn.scalar(_LAG_SQL), timeout=self.probe_timeout
+                )
+            replica.lag_seconds = None if lag is None else float(lag)
+            healthy = lag is not None and replica.lag_seconds <= self.max_lag_seconds
+        except Exception as exc:
+            replica.lag_seconds = None
+            healthy = False
+            logger.debug("Replica %s probe failed: %s", replica.name, exc)
+
+        if healthy != replica.healthy:
+            logger.warning(
+                "Replica %s is now %s (lag %s s)",
+                replica.name, "healthy" if healthy else "unhealthy", replica.lag_seconds,
+            )
+        replica.healthy = healthy
+
+    async def check(self) -> None:
+        """Probe every replica once, concurrently."""
+        await asyncio.gather(*(self._probe(replica) for replica in self.replicas))
+
+    async def run_health_checks(self, interval: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+def wrote_recently(request: Request, window: float) -> bool:
+    """True if the client's last write is younger than window seconds."""
+    try:
+        written_at = float(request.cookies.get(LAST_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - written_at < window
+
+
+def mark_write(response: Response, window: float) -> None:
+    """Pin the client's reads to the primary for the next window seconds."""
+    response.set_cookie(
+        key=LAST_WRITE_COOKIE,
+        value=f"{time.time():.3f}",
+        httponly=True,
+        secure=settings.COOKIE_SECURE,
+        samesite="lax",
+        max_age=max(math.ceil(window), 1),
+        domain=settings.COOKIE_DOMAIN,
+    )
@@ -1,7 +1,8 @@
 """Calendar repository for database operations."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_
 from app.models.calendar import CalendarEvent
+from app.etag import fingerprint_query
 from uuid import UUID
 from datetime import date, time
 from typing import Optional
@@ -42,10 +43,16 @@ class CalendarRepository:
             series_id=series_id
         )
         self.db.add(event)
-        await self.db.commit()
-        await self.db.refresh(event)
+        await self.db.flush()
         return event
 
+    async def create_many(self, events: list[dict]) -> list[CalendarEvent]:
+        """Create several calendar events in one flush."""
+        created = [CalendarEvent(**fields) for fields in events]
+        self.db.add_all(created)
+        await self.db.flush()
+        return created
+
     async def get_by_id(self, event_id: UUID, user_id: UUID) -> Optional[CalendarEvent]:
         """Get a calendar event by ID for a specific user."""
         result = await self.db.execute(
@@ -76,6 +83,24 @@ class CalendarRepository:
         )
         return list(result.scalars().all())
 
+    async def get_date_range_fingerprint(
+        self,
+        user_id: UUID,
+        start_date: date,
+        end_date: date
+    ) -> tuple:
+        """Count and max(updated_at) of the events get_by_date_range returns."""
+        result = await self.db.execute(fingerprint_query(
+            select(CalendarEvent.updated_at).where(
+                and_(
+                    CalendarEvent.user_id == user_id,
+                    CalendarEvent.event_date >= start_date,
+                    CalendarEvent.event_date <= end_date
+                )
+            )
+        ))
+        return tuple(result.one())
+
     async def get_by_series_id(self, series_id: UUID, user_id: UUID) -> list[CalendarEvent]:
         """Get all events in a recurring series."""
         result = await self.db.execute(
@@ -90,17 +115,26 @@ class CalendarRepository:
 
     async def update(self, event: CalendarEvent) -> CalendarEvent:
         """Update a calendar event."""
-        await self.db.commit()
-        await self.db.refresh(event)
+        await self.db.flush()
         return event
 
+    async def update_many(self, events: list[CalendarEvent], values: dict) -> None:
+        """Set the same column values on several calendar events in one UPDATE."""
+        if not events or not values:
+            return
+        await self.db.execute(
+            update(CalendarEvent)
+            .where(CalendarEvent.id.in_([event.id for event in events]))
+            .values(**values)
+        )
+
     async def delete(self, event: CalendarEvent) -> None:
         """Delete a calendar event."""
         await self.db.delete(event)
-        await self.db.commit()
+        await self.db.flush()
 
     async def delete_many(self, events: list[CalendarEvent]) -> None:
         """Delete multiple calendar events."""
         for event in events:
             await self.db.delete(event)
-        await self.db.commit()
+        await self.db.flush()
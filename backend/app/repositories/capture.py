@@ -2,6 +2,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from app.models.capture import Capture
+from app.etag import fingerprint_query
 from uuid import UUID
 from typing import Optional
 
@@ -16,8 +17,7 @@ class CaptureRepository:
         """Create a new capture."""
         capture = Capture(user_id=user_id, text=text, source=source)
         self.db.add(capture)
-        await self.db.commit()
-        await self.db.refresh(capture)
+        await self.db.flush()
         return capture
 
     async def get_by_id(self, capture_id: UUID, user_id: UUID) -> Optional[Capture]:
@@ -50,16 +50,30 @@ class CaptureRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_list_fingerprint(self, user_id: UUID, include_processed: bool = True) -> tuple:
+        """Count and max(updated_at) of the captures list_all returns."""
+        query = select(Capture.updated_at).where(
+            and_(
+                Capture.user_id == user_id,
+                Capture.deleted == False
+            )
+        )
+
+        if not include_processed:
+            query = query.where(Capture.processed == False)
+
+        result = await self.db.execute(fingerprint_query(query))
+        return tuple(result.one())
+
     async def update(self, capture: Capture) -> Capture:
         """Update a capture."""
-        await self.db.commit()
-        await self.db.refresh(capture)
+        await self.db.flush()
         return capture
 
     async def delete(self, capture: Capture) -> None:
         """Soft delete a capture by setting deleted flag."""
         capture.deleted = True
-        await self.db.commit()
+        await self.db.flush()
 
     async def count_unprocessed(self, user_id: UUID) -> int:
         """Count unprocessed captures for a user."""
@@ -1,14 +1,29 @@
 """Fitness repository for database operations."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, distinct, delete
+from sqlalchemy import (
+    select, insert, update, values, column, literal, true, and_, or_, func, distinct, delete, tuple_,
+    SmallInteger, Integer, Float, Numeric, DateTime,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert, aggregate_order_by
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.fitness import (
     Exercise, WorkoutProgram, ProgramExercise,
-    WorkoutSession, WorkoutLog, SessionStatus
+    WorkoutSession, WorkoutLog, SessionStatus,
+    PersonalRecord, PersonalRecordEvent,
 )
-from uuid import UUID
+from app.etag import fingerprint_query
+from uuid import UUID, uuid4
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+# asyncpg caps a statement at 32767 bind parameters
+_BULK_CHUNK = 1000
+
+_LOG_INSERT_COLUMNS = [
+    "id", "session_id", "session_started_at", "exercise_id",
+    "set_number", "reps", "weight_kg", "created_at",
+]
 
 
 class FitnessRepository:
@@ -24,15 +39,41 @@ class FitnessRepository:
         user_id: UUID,
         muscle_group: Optional[str] = None,
         search: Optional[str] = None,
-    ) -> list[Exercise]:
+        include_usage: bool = False,
+    ) -> list:
+        """Rows of (Exercise,) or, with include_usage, (Exercise, usage_count).
+
+        usage_count is the number of programs using the exercise, from one
+        LEFT JOIN ... GROUP BY rather than a count per exercise.
+        """
         query = select(Exercise).where(Exercise.user_id == user_id)
+        if include_usage:
+            query = (
+                query.add_columns(
+                    func.count(distinct(ProgramExercise.program_id)).label("usage_count")
+                )
+                .outerjoin(ProgramExercise, ProgramExercise.exercise_id == Exercise.id)
+                .group_by(Exercise.id)
+            )
         if muscle_group:
             query = query.where(Exercise.muscle_group == muscle_group)
         if search:
-            query = query.where(Exercise.name.ilike(f"%{search}%"))
+            # Substring matches plus trigram-similar names (typos), best first;
+            # both predicates are served by idx_exercises_name_trgm
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            query = query.where(
+                or_(Exercise.name.ilike(pattern, escape="\\"), Exercise.name.op("%")(search))
+            ).order_by(func.similarity(Exercise.name, search).desc())
         query = query.order_by(Exercise.name)
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
+
+    async def list_exercise_names(self, user_id: UUID) -> list:
+        result = await self.db.execute(
+            select(Exercise.id, Exercise.name, Exercise.muscle_group)
+            .where(Exercise.user_id == user_id)
+        )
+        return list(result.all())
 
     async def get_exercise(self, exercise_id: UUID, user_id: UUID) -> Optional[Exercise]:
         result = await self.db.execute(
@@ -53,18 +94,16 @@ class FitnessRepository:
     async def create_exercise(self, user_id: UUID, **kwargs) -> Exercise:
         exercise = Exercise(user_id=user_id, **kwargs)
         self.db.add(exercise)
-        await self.db.commit()
-        await self.db.refresh(exercise)
+        await self.db.flush()
         return exercise
 
     async def update_exercise(self, exercise: Exercise) -> Exercise:
-        await self.db.commit()
-        await self.db.refresh(exercise)
+        await self.db.flush()
         return exercise
 
     async def delete_exercise(self, exercise: Exercise) -> None:
         await self.db.delete(exercise)
-        await self.db.commit()
+        await self.db.flush()
 
     async def count_exercise_program_usage(self, exercise_id: UUID) -> int:
         result = await self.db.execute(
@@ -74,6 +113,36 @@ class FitnessRepository:
         )
         return result.scalar() or 0
 
+    async def get_exercise_ids(self, exercise_ids: list[UUID], user_id: UUID) -> set[UUID]:
+        result = await self.db.execute(
+            select(Exercise.id).where(Exercise.id.in_(exercise_ids), Exercise.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
+    async def get_exercises_in_programs(self, exercise_ids: list[UUID]) -> list:
+        """(exercise_id, name, program_count) for each of exercise_ids used in a program."""
+        result = await self.db.execute(
+            select(
+                Exercise.id,
+                Exercise.name,
+                func.count(distinct(ProgramExercise.program_id)).label("program_count"),
+            )
+            .join(ProgramExercise, ProgramExercise.exercise_id == Exercise.id)
+            .where(Exercise.id.in_(exercise_ids))
+            .group_by(Exercise.id)
+            .order_by(Exercise.name)
+        )
+        return list(result.all())
+
+    async def delete_exercises(self, exercise_ids: list[UUID], user_id: UUID) -> int:
+        # Same effect as delete_exercise's ORM cascade, as two set-wise
+        # statements instead of loading every log
+        await self.db.execute(delete(WorkoutLog).where(WorkoutLog.exercise_id.in_(exercise_ids)))
+        result = await self.db.execute(
+            delete(Exercise).where(Exercise.id.in_(exercise_ids), Exercise.user_id == user_id)
+        )
+        return result.rowcount
+
     # ── Programs ──
 
     async def list_programs(self, user_id: UUID) -> list[WorkoutProgram]:
@@ -85,6 +154,16 @@ class FitnessRepository:
         )
         return list(result.scalars().all())
 
+    async def get_programs_fingerprint(self, user_id: UUID) -> tuple:
+        """Count and max(updated_at) of a user's programs and their exercises."""
+        result = await self.db.execute(fingerprint_query(
+            select(WorkoutProgram.updated_at).where(WorkoutProgram.user_id == user_id),
+            select(ProgramExercise.updated_at)
+            .join(WorkoutProgram, WorkoutProgram.id == ProgramExercise.program_id)
+            .where(WorkoutProgram.user_id == user_id),
+        ))
+        return tuple(result.one())
+
     async def get_program(
         self,
         program_id: UUID,
@@ -105,49 +184,72 @@ class FitnessRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_active_program(self, user_id: UUID) -> Optional[WorkoutProgram]:
-        result = await self.db.execute(
-            select(WorkoutProgram)
-            .where(
-                and_(
-                    WorkoutProgram.user_id == user_id,
-                    WorkoutProgram.is_active == True,
-                )
-            )
-            .options(
-                selectinload(WorkoutProgram.program_exercises)
-                .selectinload(ProgramExercise.exercise)
-            )
-        )
-        return result.scalar_one_or_none()
-
     async def create_program(self, user_id: UUID, **kwargs) -> WorkoutProgram:
         program = WorkoutProgram(user_id=user_id, **kwargs)
         self.db.add(program)
-        await self.db.commit()
-        await self.db.refresh(program)
+        await self.db.flush()
         return program
 
     async def update_program(self, program: WorkoutProgram) -> WorkoutProgram:
-        await self.db.commit()
-        await self.db.refresh(program)
+        await self.db.flush()
         return program
 
     async def deactivate_all_programs(self, user_id: UUID) -> None:
-        result = await self.db.execute(
-            select(WorkoutProgram).where(
+        await self.db.execute(
+            update(WorkoutProgram)
+            .where(
                 and_(
                     WorkoutProgram.user_id == user_id,
                     WorkoutProgram.is_active == True,
                 )
             )
+            .values(is_active=False, version=WorkoutProgram.version + 1)
+            .execution_options(synchronize_session="fetch")
+        )
+
+    async def bump_program_version(self, program: WorkoutProgram) -> int:
+        """
+        Advance the program's version in SQL and return the new value.
+
+        Incrementing the loaded value instead would let two concurrent edits
+        both write the same version, leaving one of them behind a matching
+        ETag. The UPDATE row-locks the program until commit.
+        """
+        result = await self.db.execute(
+            update(WorkoutProgram)
+            .where(WorkoutProgram.id == program.id)
+            .values(version=WorkoutProgram.version + 1)
+            .returning(WorkoutProgram.version)
+            .execution_options(synchronize_session=False)
+        )
+        version = result.scalar_one()
+        set_committed_value(program, "version", version)
+        return version
+
+    async def get_program_version(self, program_id: UUID, user_id: UUID) -> Optional[int]:
+        result = await self.db.execute(
+            select(WorkoutProgram.version).where(
+                WorkoutProgram.id == program_id,
+                WorkoutProgram.user_id == user_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def bump_programs_using_exercise(self, exercise_id: UUID) -> None:
+        await self.db.execute(
+            update(WorkoutProgram)
+            .where(
+                WorkoutProgram.id.in_(
+                    select(ProgramExercise.program_id).where(ProgramExercise.exercise_id == exercise_id)
+                )
+            )
+            .values(version=WorkoutProgram.version + 1)
+            .execution_options(synchronize_session=False)
         )
-        for program in result.scalars().all():
-            program.is_active = False
 
     async def delete_program(self, program: WorkoutProgram) -> None:
         await self.db.delete(program)
-        await self.db.commit()
+        await self.db.flush()
 
     # ── Program Exercises ──
 
@@ -171,39 +273,47 @@ class FitnessRepository:
     async def create_program_exercise(self, **kwargs) -> ProgramExercise:
         pe = ProgramExercise(**kwargs)
         self.db.add(pe)
-        await self.db.commit()
-        await self.db.refresh(pe, ["exercise"])
+        await self.db.flush()
+        # The service has just loaded the exercise, so this is an identity-map hit
+        set_committed_value(pe, "exercise", await self.db.get(Exercise, pe.exercise_id))
         return pe
 
     async def update_program_exercise(self, pe: ProgramExercise) -> ProgramExercise:
-        await self.db.commit()
-        await self.db.refresh(pe, ["exercise"])
+        await self.db.flush()
         return pe
 
     async def delete_program_exercise(self, pe: ProgramExercise) -> None:
         await self.db.delete(pe)
-        await self.db.commit()
+        await self.db.flush()
 
     async def reorder_program_exercises(
         self,
         program_id: UUID,
         day_label: str,
         ordered_ids: list[UUID],
-    ) -> None:
-        for idx, pe_id in enumerate(ordered_ids):
-            result = await self.db.execute(
-                select(ProgramExercise).where(
-                    and_(
-                        ProgramExercise.id == pe_id,
-                        ProgramExercise.program_id == program_id,
-                        ProgramExercise.day_label == day_label,
-                    )
+    ) -> list[UUID]:
+        # One UPDATE ... FROM (VALUES ...) for the whole day; returns the IDs
+        # that matched the program/day so callers can report the rest.
+        new_order = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("sort_order", SmallInteger),
+            name="new_order",
+        ).data([(pe_id, idx) for idx, pe_id in enumerate(ordered_ids)])
+
+        result = await self.db.execute(
+            update(ProgramExercise)
+            .where(
+                and_(
+                    ProgramExercise.id == new_order.c.id,
+                    ProgramExercise.program_id == program_id,
+                    ProgramExercise.day_label == day_label,
                 )
             )
-            pe = result.scalar_one_or_none()
-            if pe:
-                pe.sort_order = idx
-        await self.db.commit()
+            .values(sort_order=new_order.c.sort_order)
+            .returning(ProgramExercise.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
 
     # ── Workout Sessions ──
 
@@ -248,83 +358,490 @@ class FitnessRepository:
     async def create_session(self, user_id: UUID, **kwargs) -> WorkoutSession:
         session = WorkoutSession(user_id=user_id, **kwargs)
         self.db.add(session)
-        await self.db.commit()
-        await self.db.refresh(session)
+        await self.db.flush()
         return session
 
     async def update_session(self, session: WorkoutSession) -> WorkoutSession:
-        await self.db.commit()
-        await self.db.refresh(session)
+        await self.db.flush()
         return session
 
     # ── Workout Logs ──
 
-    async def create_log(self, **kwargs) -> WorkoutLog:
-        log = WorkoutLog(**kwargs)
-        self.db.add(log)
-        await self.db.commit()
-        await self.db.refresh(log)
-        return log
+    async def get_session_state(self, session_id: UUID):
+        """Fetch just the owner and status of a session, without relations."""
+        result = await self.db.execute(
+            select(WorkoutSession.user_id, WorkoutSession.status)
+            .where(WorkoutSession.id == session_id)
+        )
+        return result.one_or_none()
+
+    async def insert_log(
+        self,
+        session_id: UUID,
+        exercise_id: UUID,
+        set_number: int,
+        reps: int,
+        weight_kg=None,
+    ):
+        """Insert a set only while its session is still in progress.
+
+        Runs as one INSERT ... SELECT FROM workout_sessions ... RETURNING, so
+        a session completed or cancelled by another worker inserts nothing
+        and None is returned. The session row also supplies the partition
+        key. Nothing is committed; get_db commits the request.
+        """
+        source = select(
+            literal(uuid4(), PGUUID(as_uuid=True)),
+            WorkoutSession.id,
+            WorkoutSession.started_at,
+            literal(exercise_id, PGUUID(as_uuid=True)),
+            literal(set_number, SmallInteger),
+            literal(reps, SmallInteger),
+            literal(weight_kg, Numeric(6, 2)),
+            literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+        ).where(
+            WorkoutSession.id == session_id,
+            WorkoutSession.status == SessionStatus.IN_PROGRESS.value,
+        )
+        table = WorkoutLog.__table__
+        result = await self.db.execute(
+            insert(table)
+            .from_select(_LOG_INSERT_COLUMNS, source)
+            .returning(*table.c)
+        )
+        return result.one_or_none()
+
+    async def upsert_logs(self, session_id: UUID, items: list[dict]) -> tuple[list, set[UUID]]:
+        """Insert or correct many sets of an in-progress session in one statement.
+
+        Rows conflicting on uq_workout_log_set take the new reps and weight;
+        rows that already match are left alone and not returned, so replaying
+        a batch writes nothing. Items must be unique per (exercise_id,
+        set_number). Returns the written rows and the exercises with a
+        corrected (updated rather than inserted) set.
+        """
+        now = datetime.now(timezone.utc)
+        new_ids = [uuid4() for _ in items]
+        batch = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("exercise_id", PGUUID(as_uuid=True)),
+            column("set_number", SmallInteger),
+            column("reps", SmallInteger),
+            column("weight_kg", Numeric(6, 2)),
+            name="batch",
+        ).data([
+            (new_id, item["exercise_id"], item["set_number"], item["reps"], item["weight_kg"])
+            for new_id, item in zip(new_ids, items)
+        ])
+        source = (
+            select(
+                batch.c.id,
+                WorkoutSession.id,
+                WorkoutSession.started_at,
+                batch.c.exercise_id,
+                batch.c.set_number,
+                batch.c.reps,
+                batch.c.weight_kg,
+                literal(now, DateTime(timezone=True)),
+            )
+            .select_from(batch)
+            .join(WorkoutSession, true())
+            .where(
+                WorkoutSession.id == session_id,
+                WorkoutSession.status == SessionStatus.IN_PROGRESS.value,
+            )
+        )
 
-    async def get_session_logs(self, session_id: UUID) -> list[WorkoutLog]:
+        table = WorkoutLog.__table__
+        stmt = pg_insert(table).from_select(_LOG_INSERT_COLUMNS, source)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_workout_log_set",
+            set_={"reps": stmt.excluded.reps, "weight_kg": stmt.excluded.weight_kg},
+            where=(
+                table.c.reps.is_distinct_from(stmt.excluded.reps)
+                | table.c.weight_kg.is_distinct_from(stmt.excluded.weight_kg)
+            ),
+        ).returning(*table.c)
+        rows = list((await self.db.execute(stmt)).all())
+        # An updated row keeps its original id
+        inserted = set(new_ids)
+        return rows, {row.exercise_id for row in rows if row.id not in inserted}
+
+    async def get_last_performances(self, user_id: UUID, exercise_ids: list[UUID]) -> list:
+        """Sets from the most recent completed session for each exercise.
+
+        One statement: a LATERAL subquery per exercise walks
+        idx_workout_logs_exercise newest first and stops at the first log
+        from a completed session; that session's sets are then joined back.
+        """
+        if not exercise_ids:
+            return []
+
+        wanted = values(
+            column("exercise_id", PGUUID(as_uuid=True)), name="wanted"
+        ).data([(exercise_id,) for exercise_id in exercise_ids])
+        latest = (
+            select(
+                WorkoutLog.session_id,
+                WorkoutSession.completed_at.label("performed_at"),
+            )
+            .join(WorkoutSession, WorkoutSession.id == WorkoutLog.session_id)
+            .where(
+                WorkoutLog.exercise_id == wanted.c.exercise_id,
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == SessionStatus.COMPLETED.value,
+            )
+            .order_by(WorkoutLog.created_at.desc())
+            .limit(1)
+            .lateral("latest")
+        )
         result = await self.db.execute(
-            select(WorkoutLog)
-            .where(WorkoutLog.session_id == session_id)
-            .options(selectinload(WorkoutLog.exercise))
-            .order_by(WorkoutLog.exercise_id, WorkoutLog.set_number)
+            select(
+                wanted.c.exercise_id,
+                latest.c.session_id,
+                latest.c.performed_at,
+                WorkoutLog.set_number,
+                WorkoutLog.reps,
+                WorkoutLog.weight_kg,
+            )
+            .select_from(wanted)
+            .join(latest, true())
+            .join(
+                WorkoutLog,
+                and_(
+                    WorkoutLog.session_id == latest.c.session_id,
+                    WorkoutLog.exercise_id == wanted.c.exercise_id,
+                ),
+            )
+            .order_by(wanted.c.exercise_id, WorkoutLog.set_number)
         )
-        return list(result.scalars().all())
+        return list(result.all())
 
     # ── History ──
 
     async def list_sessions(
         self,
         user_id: UUID,
-        page: int = 1,
         per_page: int = 20,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
-    ) -> tuple[list[WorkoutSession], int]:
-        base = select(WorkoutSession).where(
-            and_(
-                WorkoutSession.user_id == user_id,
-                WorkoutSession.status == SessionStatus.COMPLETED.value,
-            )
-        )
+        before: Optional[datetime] = None,
+        page: int = 1,
+        before_id: Optional[UUID] = None,
+    ) -> tuple[list, int]:
+        filters = [
+            WorkoutSession.user_id == user_id,
+            WorkoutSession.status == SessionStatus.COMPLETED.value,
+        ]
         if date_from:
-            base = base.where(WorkoutSession.started_at >= date_from)
+            filters.append(WorkoutSession.started_at >= date_from)
         if date_to:
-            base = base.where(WorkoutSession.started_at <= date_to)
+            filters.append(WorkoutSession.started_at <= date_to)
 
         # Count
-        count_q = select(func.count()).select_from(base.subquery())
+        count_q = select(func.count(WorkoutSession.id)).where(and_(*filters))
         total = (await self.db.execute(count_q)).scalar() or 0
 
-        # Items
-        query = (
-            base
-            .options(selectinload(WorkoutSession.logs), selectinload(WorkoutSession.program))
-            .order_by(WorkoutSession.started_at.desc())
-            .offset((page - 1) * per_page)
+        # Page of sessions: keyset on (started_at, id) when a cursor is given,
+        # so sessions sharing a start time are neither skipped nor repeated;
+        # offset only for the legacy numbered pager
+        page_q = (
+            select(
+                WorkoutSession.id,
+                WorkoutSession.program_id,
+                WorkoutSession.day_label,
+                WorkoutSession.status,
+                WorkoutSession.started_at,
+                WorkoutSession.completed_at,
+                WorkoutSession.duration_seconds,
+            )
+            .where(and_(*filters))
+            .order_by(WorkoutSession.started_at.desc(), WorkoutSession.id.desc())
             .limit(per_page)
         )
+        if before and before_id:
+            page_q = page_q.where(tuple_(WorkoutSession.started_at, WorkoutSession.id) < tuple_(before, before_id))
+        elif before:
+            page_q = page_q.where(WorkoutSession.started_at < before)
+        elif page > 1:
+            page_q = page_q.offset((page - 1) * per_page)
+        page_cte = page_q.cte("history_page")
+
+        # Per-session log aggregates, restricted to the page
+        stats = (
+            select(
+                WorkoutLog.session_id,
+                func.count(distinct(WorkoutLog.exercise_id)).label("exercise_count"),
+                func.count(WorkoutLog.id).label("set_count"),
+                func.sum(WorkoutLog.reps).label("total_reps"),
+                func.sum(WorkoutLog.reps * WorkoutLog.weight_kg).label("tonnage_kg"),
+            )
+            .where(
+                WorkoutLog.session_id.in_(select(page_cte.c.id)),
+                # Bound the partition key to the page so only its months are scanned
+                WorkoutLog.session_started_at >= select(func.min(page_cte.c.started_at)).scalar_subquery(),
+                WorkoutLog.session_started_at <= select(func.max(page_cte.c.started_at)).scalar_subquery(),
+            )
+            .group_by(WorkoutLog.session_id)
+            .subquery("history_stats")
+        )
+
+        query = (
+            select(
+                page_cte,
+                WorkoutProgram.name.label("program_name"),
+                func.coalesce(stats.c.exercise_count, 0).label("exercise_count"),
+                func.coalesce(stats.c.set_count, 0).label("set_count"),
+                func.coalesce(stats.c.total_reps, 0).label("total_reps"),
+                func.coalesce(stats.c.tonnage_kg, 0).label("tonnage_kg"),
+            )
+            .select_from(page_cte)
+            .outerjoin(stats, stats.c.session_id == page_cte.c.id)
+            .outerjoin(WorkoutProgram, WorkoutProgram.id == page_cte.c.program_id)
+            .order_by(page_cte.c.started_at.desc(), page_cte.c.id.desc())
+        )
         result = await self.db.execute(query)
-        return list(result.scalars().all()), total
+        return list(result.all()), total
 
-    async def get_week_sessions(
-        self,
-        user_id: UUID,
-        week_start: datetime,
-        week_end: datetime,
-    ) -> list[WorkoutSession]:
+    async def get_summary(self, user_id: UUID, week_start: datetime, week_end: datetime):
+        """Dashboard summary as one row of projections.
+
+        Active program id/name, its day labels in program order, whether a
+        session is in progress, and this week's completed session start
+        times with their day labels. No ORM entities are loaded.
+        """
+        active = (
+            select(WorkoutProgram.id, WorkoutProgram.name)
+            .where(
+                WorkoutProgram.user_id == user_id,
+                WorkoutProgram.is_active == True,
+            )
+            .limit(1)
+            .cte("active_program")
+        )
+        labels = (
+            select(
+                ProgramExercise.day_label,
+                func.min(ProgramExercise.sort_order).label("first_sort"),
+            )
+            .where(ProgramExercise.program_id.in_(select(active.c.id)))
+            .group_by(ProgramExercise.day_label)
+            .subquery("day_labels")
+        )
+        week = (
+            select(WorkoutSession.started_at, WorkoutSession.day_label)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == SessionStatus.COMPLETED.value,
+                WorkoutSession.started_at >= week_start,
+                WorkoutSession.started_at <= week_end,
+            )
+            .subquery("week_sessions")
+        )
+        in_progress = (
+            select(WorkoutSession.id)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == SessionStatus.IN_PROGRESS.value,
+            )
+            .exists()
+        )
         result = await self.db.execute(
-            select(WorkoutSession).where(
-                and_(
-                    WorkoutSession.user_id == user_id,
-                    WorkoutSession.status == SessionStatus.COMPLETED.value,
-                    WorkoutSession.started_at >= week_start,
-                    WorkoutSession.started_at <= week_end,
-                )
-            ).order_by(WorkoutSession.started_at)
+            select(
+                select(active.c.id).scalar_subquery().label("program_id"),
+                select(active.c.name).scalar_subquery().label("program_name"),
+                select(
+                    func.array_agg(
+                        aggregate_order_by(labels.c.day_label, labels.c.first_sort, labels.c.day_label)
+                    )
+                ).scalar_subquery().label("day_labels"),
+                in_progress.label("has_active_session"),
+                select(
+                    func.array_agg(aggregate_order_by(week.c.started_at, week.c.started_at))
+                ).scalar_subquery().label("week_started_at"),
+                select(
+                    func.array_agg(aggregate_order_by(week.c.day_label, week.c.started_at))
+                ).scalar_subquery().label("week_day_labels"),
+            )
+        )
+        return result.one()
+
+    # ── Analytics ──
+
+    async def get_log_columns(self, user_id: UUID):
+        """Fetch every non-cancelled logged set as parallel arrays in one row.
+
+        Exercises are dense-ranked so the arrays carry small integer codes;
+        the exercise_* arrays map a code back to its exercise.
+        """
+        logs = (
+            select(
+                WorkoutLog.id,
+                func.floor(
+                    func.extract("epoch", WorkoutSession.started_at) / 86400
+                ).cast(Integer).label("day"),
+                (func.dense_rank().over(order_by=WorkoutLog.exercise_id) - 1).label("code"),
+                WorkoutLog.exercise_id,
+                WorkoutLog.reps,
+                func.coalesce(WorkoutLog.weight_kg, 0).cast(Float).label("weight"),
+            )
+            .join(WorkoutSession, WorkoutSession.id == WorkoutLog.session_id)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status != SessionStatus.CANCELLED.value,
+            )
+            .cte("analytics_logs")
+        )
+        sets = (
+            select(
+                func.array_agg(aggregate_order_by(logs.c.day, logs.c.id)).label("day"),
+                func.array_agg(aggregate_order_by(logs.c.code, logs.c.id)).label("exercise"),
+                func.array_agg(aggregate_order_by(logs.c.reps, logs.c.id)).label("reps"),
+                func.array_agg(aggregate_order_by(logs.c.weight, logs.c.id)).label("weight"),
+            )
+            .subquery("analytics_sets")
+        )
+        codes = select(logs.c.code, logs.c.exercise_id).distinct().subquery("analytics_codes")
+        catalog = (
+            select(
+                func.array_agg(aggregate_order_by(Exercise.id, codes.c.code)).label("exercise_ids"),
+                func.array_agg(aggregate_order_by(Exercise.name, codes.c.code)).label("exercise_names"),
+                func.array_agg(
+                    aggregate_order_by(Exercise.muscle_group, codes.c.code)
+                ).label("muscle_groups"),
+            )
+            .select_from(codes)
+            .join(Exercise, Exercise.id == codes.c.exercise_id)
+            .subquery("analytics_catalog")
+        )
+        result = await self.db.execute(select(sets, catalog))
+        return result.one()
+
+    async def get_exercise_log_columns(self, exercise_id: UUID, user_id: UUID):
+        """Fetch one exercise's non-cancelled sets as parallel arrays in one row.
+
+        Filtering on exercise_id first lets each partition's
+        idx_workout_logs_exercise drive the scan. Sets are ordered by
+        session start so every session is one contiguous run.
+        """
+        order = (WorkoutSession.started_at, WorkoutLog.session_id, WorkoutLog.id)
+        started = func.extract("epoch", WorkoutSession.started_at).cast(Float)
+        result = await self.db.execute(
+            select(
+                func.array_agg(aggregate_order_by(WorkoutLog.session_id, *order)).label("session"),
+                func.array_agg(aggregate_order_by(started, *order)).label("started"),
+                func.array_agg(aggregate_order_by(WorkoutLog.reps, *order)).label("reps"),
+                func.array_agg(
+                    aggregate_order_by(func.coalesce(WorkoutLog.weight_kg, 0).cast(Float), *order)
+                ).label("weight"),
+            )
+            .select_from(WorkoutLog)
+            .join(WorkoutSession, WorkoutSession.id == WorkoutLog.session_id)
+            .where(
+                WorkoutLog.exercise_id == exercise_id,
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status != SessionStatus.CANCELLED.value,
+            )
+        )
+        return result.one()
+
+    # ── Personal Records ──
+
+    async def get_personal_records(self, exercise_id: UUID, user_id: UUID) -> list[PersonalRecord]:
+        result = await self.db.execute(
+            select(PersonalRecord)
+            .where(
+                PersonalRecord.exercise_id == exercise_id,
+                PersonalRecord.user_id == user_id,
+            )
+            .order_by(PersonalRecord.weight_kg)
+        )
+        return list(result.scalars().all())
+
+    async def get_personal_records_for(
+        self, exercise_ids: list[UUID], user_id: UUID
+    ) -> list[PersonalRecord]:
+        result = await self.db.execute(
+            select(PersonalRecord).where(
+                PersonalRecord.exercise_id.in_(exercise_ids),
+                PersonalRecord.user_id == user_id,
+            )
         )
         return list(result.scalars().all())
+
+    async def get_personal_record_history(
+        self, exercise_id: UUID, user_id: UUID, limit: int = 50
+    ) -> list[PersonalRecordEvent]:
+        result = await self.db.execute(
+            select(PersonalRecordEvent)
+            .where(
+                PersonalRecordEvent.exercise_id == exercise_id,
+                PersonalRecordEvent.user_id == user_id,
+            )
+            .order_by(PersonalRecordEvent.achieved_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def upsert_personal_records(self, rows: list[dict]) -> None:
+        # The WHERE keeps the better row if a concurrent request got there first
+        for start in range(0, len(rows), _BULK_CHUNK):
+            stmt = pg_insert(PersonalRecord).values(rows[start:start + _BULK_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PersonalRecord.exercise_id, PersonalRecord.weight_kg],
+                set_={
+                    "reps": stmt.excluded.reps,
+                    "e1rm_kg": stmt.excluded.e1rm_kg,
+                    "session_id": stmt.excluded.session_id,
+                    "achieved_at": stmt.excluded.achieved_at,
+                },
+                where=PersonalRecord.reps < stmt.excluded.reps,
+            )
+            await self.db.execute(stmt)
+
+    async def add_personal_record_events(self, events: list[dict]) -> None:
+        for start in range(0, len(events), _BULK_CHUNK):
+            await self.db.execute(
+                pg_insert(PersonalRecordEvent).values(events[start:start + _BULK_CHUNK])
+            )
+
+    async def clear_personal_records(
+        self, user_id: UUID, exercise_ids: Optional[list[UUID]] = None
+    ) -> None:
+        """Delete a user's records and record history, for all or some exercises."""
+        events = delete(PersonalRecordEvent).where(PersonalRecordEvent.user_id == user_id)
+        records = delete(PersonalRecord).where(PersonalRecord.user_id == user_id)
+        if exercise_ids is not None:
+            events = events.where(PersonalRecordEvent.exercise_id.in_(exercise_ids))
+            records = records.where(PersonalRecord.exercise_id.in_(exercise_ids))
+        await self.db.execute(events)
+        await self.db.execute(records)
+
+    async def iter_user_logs(
+        self, user_id: UUID, exercise_ids: Optional[list[UUID]] = None
+    ) -> AsyncIterator:
+        """Stream a user's logged sets oldest first, for record rebuilds.
+
+        Sets of cancelled sessions are skipped, as in analytics.
+        """
+        query = (
+            select(
+                WorkoutLog.session_id,
+                WorkoutLog.exercise_id,
+                WorkoutLog.reps,
+                WorkoutLog.weight_kg,
+                WorkoutLog.created_at,
+            )
+            .join(WorkoutSession, WorkoutSession.id == WorkoutLog.session_id)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status != SessionStatus.CANCELLED.value,
+            )
+            .order_by(WorkoutLog.created_at, WorkoutLog.set_number)
+            .execution_options(yield_per=_BULK_CHUNK)
+        )
+        if exercise_ids is not None:
+            query = query.where(WorkoutLog.exercise_id.in_(exercise_ids))
+        result = await self.db.stream(query)
+        async for row in result:
+            yield row
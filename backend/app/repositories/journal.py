@@ -1,8 +1,9 @@
 """Journal repository for database operations."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func
+from sqlalchemy import Integer, select, and_, desc, func, distinct
 from app.models.journal import JournalEntry
 from app.schemas.journal import EntryType
+from app.etag import fingerprint_query
 from uuid import UUID
 from datetime import date, timedelta
 from typing import Optional
@@ -29,8 +30,7 @@ class JournalRepository:
             content=content
         )
         self.db.add(entry)
-        await self.db.commit()
-        await self.db.refresh(entry)
+        await self.db.flush()
         return entry
 
     async def get_by_id(self, entry_id: UUID, user_id: UUID) -> Optional[JournalEntry]:
@@ -101,16 +101,37 @@ class JournalRepository:
         )
         return list(result.scalars().all())
 
+    async def get_fingerprint(
+        self,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        entry_type: Optional[str] = None
+    ) -> tuple:
+        """Count and max(updated_at) of the entries in a date range, or of all of them."""
+        query = select(JournalEntry.updated_at).where(JournalEntry.user_id == user_id)
+        if start_date and end_date:
+            query = query.where(
+                and_(
+                    JournalEntry.entry_date >= start_date,
+                    JournalEntry.entry_date <= end_date
+                )
+            )
+            if entry_type:
+                query = query.where(JournalEntry.entry_type == entry_type)
+
+        result = await self.db.execute(fingerprint_query(query))
+        return tuple(result.one())
+
     async def update(self, entry: JournalEntry) -> JournalEntry:
         """Update a journal entry."""
-        await self.db.commit()
-        await self.db.refresh(entry)
+        await self.db.flush()
         return entry
 
     async def delete(self, entry: JournalEntry) -> None:
         """Delete a journal entry."""
         await self.db.delete(entry)
-        await self.db.commit()
+        await self.db.flush()
 
     async def calculate_streak(
         self,
@@ -119,19 +140,30 @@ class JournalRepository:
     ) -> int:
         """Calculate consecutive days with entries of this type."""
         today = date.today()
-        streak = 0
-        current_date = today
-
-        # Check backwards from today
-        while True:
-            entry = await self.get_by_type_and_date(user_id, entry_type, current_date)
-            if entry:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-
-        return streak
+
+        # Walking back from today, entry_date + dense rank stays at today + 1
+        # exactly as long as the days are consecutive; the first gap drops
+        # it below for good, so counting the days with that value counts the
+        # streak. Dense rank and distinct dates, as a day may hold several
+        # entries of a type.
+        island = (
+            JournalEntry.entry_date
+            + func.dense_rank().over(order_by=JournalEntry.entry_date.desc()).cast(Integer)
+        ).label("island")
+        ranked = select(JournalEntry.entry_date, island).where(
+            and_(
+                JournalEntry.user_id == user_id,
+                JournalEntry.entry_type == entry_type,
+                JournalEntry.entry_date <= today
+            )
+        ).subquery()
+
+        result = await self.db.execute(
+            select(func.count(distinct(ranked.c.entry_date))).where(
+                ranked.c.island == today + timedelta(days=1)
+            )
+        )
+        return result.scalar_one()
 
     async def count_entries_in_range(
         self,
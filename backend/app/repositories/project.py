@@ -1,8 +1,10 @@
 """Project repository for database operations."""
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, or_
-from sqlalchemy.orm import selectinload
-from app.models.project import Project, ProjectTask, ProjectNote, TaskStatus
+from sqlalchemy import Integer, column, select, update, values, and_, func, or_
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import selectinload, load_only
+from app.models.project import Project, ProjectTask, ProjectNote, ProjectTombstone, TaskStatus
+from app.etag import fingerprint_query
 from uuid import UUID
 from datetime import datetime, timezone
 from typing import Optional
@@ -30,8 +32,7 @@ class ProjectRepository:
             objective=objective
         )
         self.db.add(project)
-        await self.db.commit()
-        await self.db.refresh(project)
+        await self.db.flush()
         return project
 
     async def get_project_by_id(
@@ -80,6 +81,44 @@ class ProjectRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_project_id_by_slug(self, slug: str, user_id: UUID) -> Optional[UUID]:
+        """Resolve a slug to a project ID without loading the project."""
+        result = await self.db.execute(
+            select(Project.id).where(
+                and_(
+                    Project.slug == slug,
+                    Project.user_id == user_id
+                )
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_project_header(
+        self,
+        project_id: UUID,
+        user_id: UUID
+    ) -> Optional[Project]:
+        """Get only the project's header columns, without tasks or notes."""
+        result = await self.db.execute(
+            select(Project)
+            .where(
+                and_(
+                    Project.id == project_id,
+                    Project.user_id == user_id
+                )
+            )
+            .options(load_only(
+                Project.id,
+                Project.name,
+                Project.slug,
+                Project.objective,
+                Project.version,
+                Project.created_at,
+                Project.updated_at
+            ))
+        )
+        return result.scalar_one_or_none()
+
     async def list_projects(
         self,
         user_id: UUID,
@@ -99,16 +138,100 @@ class ProjectRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_projects_fingerprint(self, user_id: UUID) -> tuple:
+        """Count and max(updated_at) of a user's projects, their tasks and notes."""
+        owned = Project.user_id == user_id
+        result = await self.db.execute(fingerprint_query(
+            select(Project.updated_at).where(owned),
+            select(ProjectTask.updated_at).join(Project, Project.id == ProjectTask.project_id).where(owned),
+            select(ProjectNote.updated_at).join(Project, Project.id == ProjectNote.project_id).where(owned),
+        ))
+        return tuple(result.one())
+
     async def update_project(self, project: Project) -> Project:
         """Update a project."""
-        await self.db.commit()
-        await self.db.refresh(project)
+        await self.db.flush()
         return project
 
     async def delete_project(self, project: Project) -> None:
         """Delete a project."""
         await self.db.delete(project)
-        await self.db.commit()
+        await self.db.flush()
+
+    async def bump_version(self, project_id: UUID) -> int:
+        """
+        Advance the project's change version and return the new value.
+
+        The UPDATE row-locks the project until commit, so concurrent board
+        mutations are serialized and versions are handed out in commit order.
+        Pending edits to the caller's task or note are held back so they go
+        out in the same UPDATE as the version stamp.
+        """
+        with self.db.no_autoflush:
+            result = await self.db.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(version=Project.version + 1)
+                .returning(Project.version)
+            )
+        return result.scalar_one()
+
+    def _add_tombstone(
+        self,
+        project_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+        version: int
+    ) -> None:
+        """Record a deleted task or note for delta sync."""
+        self.db.add(ProjectTombstone(
+            project_id=project_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            version=version
+        ))
+
+    async def get_changes_since(
+        self,
+        project_id: UUID,
+        since: int
+    ) -> tuple[list[ProjectTask], list[ProjectNote], list[ProjectTombstone]]:
+        """Get tasks, notes and tombstones changed after the given version."""
+        tasks = await self.db.execute(
+            select(ProjectTask)
+            .where(
+                and_(
+                    ProjectTask.project_id == project_id,
+                    ProjectTask.version > since
+                )
+            )
+            .order_by(ProjectTask.version)
+        )
+        notes = await self.db.execute(
+            select(ProjectNote)
+            .where(
+                and_(
+                    ProjectNote.project_id == project_id,
+                    ProjectNote.version > since
+                )
+            )
+            .order_by(ProjectNote.version)
+        )
+        tombstones = await self.db.execute(
+            select(ProjectTombstone)
+            .where(
+                and_(
+                    ProjectTombstone.project_id == project_id,
+                    ProjectTombstone.version > since
+                )
+            )
+            .order_by(ProjectTombstone.version)
+        )
+        return (
+            list(tasks.scalars().all()),
+            list(notes.scalars().all()),
+            list(tombstones.scalars().all())
+        )
 
     # Tasks
     async def create_task(
@@ -135,11 +258,11 @@ class ProjectRepository:
             title=title,
             description=description,
             status=status,
-            sort_order=max_order + 1
+            sort_order=max_order + 1,
+            version=await self.bump_version(project_id)
         )
         self.db.add(task)
-        await self.db.commit()
-        await self.db.refresh(task)
+        await self.db.flush()
         return task
 
     async def get_task(self, task_id: UUID, user_id: UUID) -> Optional[ProjectTask]:
@@ -164,14 +287,16 @@ class ProjectRepository:
         elif task.status != TaskStatus.COMPLETED and task.completed_at:
             task.completed_at = None
 
-        await self.db.commit()
-        await self.db.refresh(task)
+        task.version = await self.bump_version(task.project_id)
+        await self.db.flush()
         return task
 
     async def delete_task(self, task: ProjectTask) -> None:
         """Delete a task."""
+        version = await self.bump_version(task.project_id)
+        self._add_tombstone(task.project_id, "task", task.id, version)
         await self.db.delete(task)
-        await self.db.commit()
+        await self.db.flush()
 
     async def reorder_tasks(
         self,
@@ -179,21 +304,29 @@ class ProjectRepository:
         task_updates: list[tuple[UUID, int]]
     ) -> None:
         """Update sort_order for multiple tasks."""
-        for task_id, new_order in task_updates:
-            await self.db.execute(
-                select(ProjectTask)
-                .where(ProjectTask.id == task_id)
-                .with_for_update()
-            )
-
-            result = await self.db.execute(
-                select(ProjectTask).where(ProjectTask.id == task_id)
+        version = await self.bump_version(project_id)
+        if not task_updates:
+            return
+
+        # One UPDATE ... FROM (VALUES ...) for all tasks; IDs from other
+        # projects simply don't match.
+        new_order = values(
+            column("id", PGUUID(as_uuid=True)),
+            column("sort_order", Integer),
+            name="new_order",
+        ).data(task_updates)
+
+        await self.db.execute(
+            update(ProjectTask)
+            .where(
+                and_(
+                    ProjectTask.id == new_order.c.id,
+                    ProjectTask.project_id == project_id,
+                )
             )
-            task = result.scalar_one_or_none()
-            if task:
-                task.sort_order = new_order
-
-        await self.db.commit()
+            .values(sort_order=new_order.c.sort_order, version=version)
+            .execution_options(synchronize_session=False)
+        )
 
     async def delete_completed_tasks(self, project_id: UUID) -> int:
         """Delete all completed tasks for a project."""
@@ -207,10 +340,13 @@ class ProjectRepository:
         )
         tasks = list(result.scalars().all())
 
-        for task in tasks:
-            await self.db.delete(task)
+        if tasks:
+            version = await self.bump_version(project_id)
+            for task in tasks:
+                self._add_tombstone(project_id, "task", task.id, version)
+                await self.db.delete(task)
 
-        await self.db.commit()
+        await self.db.flush()
         return len(tasks)
 
     async def get_task_counts_by_project(
@@ -243,11 +379,11 @@ class ProjectRepository:
         """Create a new note."""
         note = ProjectNote(
             project_id=project_id,
-            content=content
+            content=content,
+            version=await self.bump_version(project_id)
         )
         self.db.add(note)
-        await self.db.commit()
-        await self.db.refresh(note)
+        await self.db.flush()
         return note
 
     async def get_note(self, note_id: UUID, user_id: UUID) -> Optional[ProjectNote]:
@@ -266,11 +402,13 @@ class ProjectRepository:
 
     async def update_note(self, note: ProjectNote) -> ProjectNote:
         """Update a note."""
-        await self.db.commit()
-        await self.db.refresh(note)
+        note.version = await self.bump_version(note.project_id)
+        await self.db.flush()
         return note
 
     async def delete_note(self, note: ProjectNote) -> None:
         """Delete a note."""
+        version = await self.bump_version(note.project_id)
+        self._add_tombstone(note.project_id, "note", note.id, version)
         await self.db.delete(note)
-        await self.db.commit()
+        await self.db.flush()
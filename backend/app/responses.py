@@ -0,0 +1,46 @@
+"""Fast JSON responses.
+
+For an endpoint with a response_model, FastAPI turns whatever it returns
+into plain data, validates that against the model field by field, dumps it
+to a dict and only then encodes the dict with the response class. For a
+list of a few hundred ORM rows that is most of the request's CPU time.
+
+model_response() does it in two calls instead: one TypeAdapter validation
+of the whole payload straight from the ORM objects (from_attributes, so no
+intermediate models are built one by one) and one dump_json in pydantic's
+Rust core, whose bytes go out as they are. Endpoints keep response_model
+for the OpenAPI schema; a returned Response skips FastAPI's own pass.
+
+Everything else goes through ORJSONResponse, the app's default response
+class, which encodes with orjson instead of the stdlib json module.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, TypeVar
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """The (cached) TypeAdapter for tp; building one compiles a validator."""
+    return TypeAdapter(tp)
+
+
+def validate_many(model: type[T], objects: Iterable[Any]) -> list[T]:
+    """objects (ORM rows, dicts) validated as list[model] in one call."""
+    return type_adapter(list[model]).validate_python(list(objects), from_attributes=True)
+
+
+def model_response(
+    tp: Any,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """A JSON response with content validated as tp and dumped in one pass."""
+    adapter = type_adapter(tp)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
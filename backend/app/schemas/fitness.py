@@ -1,6 +1,6 @@
 """Fitness schemas for request/response validation."""
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 from typing import Optional
 from decimal import Decimal
@@ -33,11 +33,33 @@ class ExerciseResponse(BaseModel):
         from_attributes = True
 
 
+class ExerciseListItem(ExerciseResponse):
+    usage_count: Optional[int] = None
+
+
 class ExerciseListResponse(BaseModel):
-    items: list[ExerciseResponse]
+    items: list[ExerciseListItem]
     total: int
 
 
+class ExerciseBulkDeleteRequest(BaseModel):
+    exercise_ids: list[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class ExerciseBulkDeleteResponse(BaseModel):
+    deleted_count: int
+
+
+class ExerciseSuggestion(BaseModel):
+    id: UUID
+    name: str
+    muscle_group: Optional[str] = None
+
+
+class ExerciseAutocompleteResponse(BaseModel):
+    items: list[ExerciseSuggestion]
+
+
 # Program schemas
 class ProgramCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
@@ -122,12 +144,30 @@ class ExerciseReorderRequest(BaseModel):
     exercise_order: list[UUID] = Field(..., min_length=1)
 
 
+class ExerciseReorderResponse(BaseModel):
+    message: str
+    updated_count: int
+    mismatched_ids: list[UUID]
+
+
 # Workout Session schemas
 class SessionStartRequest(BaseModel):
     program_id: Optional[UUID] = None
     day_label: Optional[str] = None
 
 
+class LastPerformanceSet(BaseModel):
+    set_number: int
+    reps: int
+    weight_kg: Optional[Decimal] = None
+
+
+class LastPerformance(BaseModel):
+    session_id: UUID
+    performed_at: Optional[datetime] = None
+    sets: list[LastPerformanceSet]
+
+
 class SessionExerciseInfo(BaseModel):
     exercise_id: UUID
     exercise_name: str
@@ -135,6 +175,7 @@ class SessionExerciseInfo(BaseModel):
     target_reps_min: int
     target_reps_max: int
     rest_seconds: int
+    last_performance: Optional[LastPerformance] = None
 
 
 class SessionStartResponse(BaseModel):
@@ -177,6 +218,15 @@ class WorkoutLogResponse(BaseModel):
         from_attributes = True
 
 
+class WorkoutLogBatchCreate(BaseModel):
+    logs: list[WorkoutLogCreate] = Field(..., min_length=1, max_length=200)
+
+
+class WorkoutLogBatchResponse(BaseModel):
+    written: list[WorkoutLogResponse]
+    unchanged_count: int
+
+
 class SessionCompleteRequest(BaseModel):
     notes: Optional[str] = None
 
@@ -215,6 +265,9 @@ class HistoryItem(BaseModel):
     completed_at: Optional[datetime] = None
     duration_seconds: Optional[int] = None
     exercise_count: int
+    set_count: int
+    total_reps: int
+    tonnage_kg: Decimal
 
 
 class HistoryResponse(BaseModel):
@@ -222,6 +275,104 @@ class HistoryResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    # Pass both back as before/before_id for the next page
+    next_cursor: Optional[datetime] = None
+    next_cursor_id: Optional[UUID] = None
+
+
+# Personal record schemas
+class PersonalRecordEntry(BaseModel):
+    weight_kg: Decimal
+    reps: int
+    e1rm_kg: Decimal
+    session_id: Optional[UUID] = None
+    achieved_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PersonalRecordsResponse(BaseModel):
+    exercise_id: UUID
+    best_weight: Optional[PersonalRecordEntry] = None
+    best_e1rm: Optional[PersonalRecordEntry] = None
+    reps_at_weight: list[PersonalRecordEntry]
+
+
+class PersonalRecordEventResponse(PersonalRecordEntry):
+    id: UUID
+    record_type: str
+
+
+class PersonalRecordHistoryResponse(BaseModel):
+    exercise_id: UUID
+    items: list[PersonalRecordEventResponse]
+
+
+# Analytics schemas
+class MuscleGroupLoad(BaseModel):
+    muscle_group: Optional[str] = None
+    sets: int
+    reps: int
+    tonnage_kg: float
+
+
+class WeeklyLoad(BaseModel):
+    week_start: date
+    sets: int
+    reps: int
+    tonnage_kg: float
+    muscle_groups: list[MuscleGroupLoad]
+
+
+class WeeklyAnalyticsResponse(BaseModel):
+    weeks: list[WeeklyLoad]
+
+
+class WorkloadPoint(BaseModel):
+    date: date
+    acute_load: float
+    chronic_load: float
+    ratio: Optional[float] = None
+
+
+class WorkloadResponse(BaseModel):
+    acute_days: int
+    chronic_days: int
+    current_ratio: Optional[float] = None
+    points: list[WorkloadPoint]
+
+
+class E1rmPoint(BaseModel):
+    date: date
+    e1rm_kg: float
+    best_e1rm_kg: float
+
+
+class ExerciseE1rmTrend(BaseModel):
+    exercise_id: UUID
+    exercise_name: str
+    points: list[E1rmPoint]
+
+
+class E1rmTrendResponse(BaseModel):
+    exercises: list[ExerciseE1rmTrend]
+
+
+class ExerciseSeriesPoint(BaseModel):
+    date: date
+    top_weight_kg: Optional[float] = None
+    volume_kg: float
+    e1rm_kg: Optional[float] = None
+
+
+class ExerciseSeriesResponse(BaseModel):
+    exercise_id: UUID
+    exercise_name: str
+    method: str
+    metric: Optional[str] = None
+    total_sessions: int
+    points: list[ExerciseSeriesPoint]
 
 
 # Dashboard summary
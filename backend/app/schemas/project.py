@@ -125,10 +125,31 @@ class TasksByStatus(BaseModel):
 
 class ProjectDetailResponse(ProjectResponse):
     """Detailed project response with tasks and notes."""
+    version: int
     tasks: TasksByStatus
     notes: list[NoteResponse]
 
 
+class TombstoneResponse(BaseModel):
+    """A task or note deleted since the requested version."""
+    entity_type: str
+    entity_id: UUID
+    version: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectChangesResponse(BaseModel):
+    """Tasks and notes changed or deleted since a given project version."""
+    project_id: UUID
+    since: int
+    version: int
+    tasks: list[TaskResponse] = []
+    notes: list[NoteResponse] = []
+    deleted: list[TombstoneResponse] = []
+
+
 class ProjectListResponse(BaseModel):
     """Schema for list of projects."""
     projects: list[ProjectDetailResponse]
@@ -0,0 +1,356 @@
+"""Training-load analytics over workout logs.
+
+Logged sets are fetched once as parallel arrays (see
+FitnessRepository.get_log_columns) and every rollup below is a NumPy pass
+over those arrays: bincount for grouped sums and a sort plus offset
+accumulate for grouped running maxima. Nothing here loops over sets in Python.
+
+Per-exercise chart series are downsampled server-side to a requested point
+count, so their payload size does not grow with history length.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+
+from app.exceptions import NotFoundError
+from app.repositories.fitness import FitnessRepository
+from app.schemas.fitness import (
+    MuscleGroupLoad, WeeklyLoad, WeeklyAnalyticsResponse,
+    WorkloadPoint, WorkloadResponse,
+    E1rmPoint, ExerciseE1rmTrend, E1rmTrendResponse,
+    ExerciseSeriesPoint, ExerciseSeriesResponse,
+)
+
+_EPOCH = date(1970, 1, 1)
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+_WEEK_SHIFT = 3
+
+SERIES_METRICS = ("top_weight", "volume", "e1rm")
+
+
+@dataclass
+class LogColumns:
+    """Logged sets as parallel arrays, one element per set."""
+    day: np.ndarray          # int64, days since the Unix epoch (session start)
+    exercise: np.ndarray     # int64, index into exercise_ids
+    reps: np.ndarray         # int64
+    weight: np.ndarray       # float64, kg (bodyweight sets are 0)
+    exercise_ids: list[UUID]
+    exercise_names: list[str]
+    muscle_groups: list[Optional[str]]
+
+    @classmethod
+    def from_row(cls, row) -> "LogColumns":
+        return cls(
+            day=np.asarray(row.day or [], dtype=np.int64),
+            exercise=np.asarray(row.exercise or [], dtype=np.int64),
+            reps=np.asarray(row.reps or [], dtype=np.int64),
+            weight=np.asarray(row.weight or [], dtype=np.float64),
+            exercise_ids=list(row.exercise_ids or []),
+            exercise_names=list(row.exercise_names or []),
+            muscle_groups=list(row.muscle_groups or []),
+        )
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+
+def _to_date(day: int) -> date:
+    return _EPOCH + timedelta(days=int(day))
+
+
+def estimate_1rm(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    """Vectorized Epley estimate; singles are their own 1RM, 0 reps is 0."""
+    e1rm = weight * (1 + reps / 30)
+    e1rm = np.where(reps == 1, weight, e1rm)
+    return np.where((reps > 0) & (weight > 0), e1rm, 0.0)
+
+
+def weekly_load(cols: LogColumns) -> dict:
+    """Sets, reps and tonnage per Monday-based week, in total and per muscle group."""
+    if not len(cols):
+        return {"week_start": [], "groups": [], "sets": np.zeros((0, 0)),
+                "reps": np.zeros((0, 0)), "tonnage": np.zeros((0, 0))}
+
+    week = (cols.day + _WEEK_SHIFT) // 7
+    first_week = week.min()
+    n_weeks = int(week.max() - first_week + 1)
+
+    groups, group_of_exercise = np.unique(
+        np.array([g or "" for g in cols.muscle_groups], dtype=object), return_inverse=True
+    )
+    group = group_of_exercise[cols.exercise]
+    n_groups = len(groups)
+
+    key = (week - first_week) * n_groups + group
+    size = n_weeks * n_groups
+    shape = (n_weeks, n_groups)
+    return {
+        "week_start": [_to_date((first_week + i) * 7 - _WEEK_SHIFT) for i in range(n_weeks)],
+        "groups": [g or None for g in groups],
+        "sets": np.bincount(key, minlength=size).reshape(shape),
+        "reps": np.bincount(key, weights=cols.reps, minlength=size).reshape(shape),
+        "tonnage": np.bincount(key, weights=cols.reps * cols.weight, minlength=size).reshape(shape),
+    }
+
+
+def workload_ratio(cols: LogColumns, today: date, acute_days: int = 7, chronic_days: int = 28) -> dict:
+    """Rolling acute and chronic daily tonnage and their ratio (ACWR).
+
+    Each day's load is its total tonnage; rolling means come from one cumsum
+    over a dense day axis from the first logged day through today, so days
+    off since the last session count as zero load. The ratio is NaN until
+    there is any chronic load.
+    """
+    if not len(cols):
+        empty = np.zeros(0)
+        return {"first_day": 0, "acute": empty, "chronic": empty, "ratio": empty}
+
+    first_day = int(cols.day.min())
+    last_day = max((today - _EPOCH).days, int(cols.day.max()))
+    daily = np.bincount(
+        cols.day - first_day, weights=cols.reps * cols.weight, minlength=last_day - first_day + 1
+    )
+
+    cumulative = np.concatenate(([0.0], np.cumsum(daily)))
+    idx = np.arange(1, len(cumulative))
+    acute = (cumulative[idx] - cumulative[np.maximum(idx - acute_days, 0)]) / acute_days
+    chronic = (cumulative[idx] - cumulative[np.maximum(idx - chronic_days, 0)]) / chronic_days
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(chronic > 0, acute / chronic, np.nan)
+    return {"first_day": first_day, "acute": acute, "chronic": chronic, "ratio": ratio}
+
+
+def e1rm_trend(cols: LogColumns) -> dict:
+    """Best e1RM per exercise per day and its running all-time best.
+
+    Days are reduced with maximum.reduceat over (exercise, day) runs; the
+    running best is one maximum.accumulate over the whole array, with each
+    exercise lifted by its own offset so earlier exercises never leak into
+    later ones.
+    """
+    e1rm = estimate_1rm(cols.weight, cols.reps)
+    mask = e1rm > 0
+    exercise, day, e1rm = cols.exercise[mask], cols.day[mask], e1rm[mask]
+    if not len(e1rm):
+        empty = np.zeros(0, dtype=np.int64)
+        return {"exercise": empty, "day": empty, "best": np.zeros(0), "running": np.zeros(0)}
+
+    order = np.lexsort((day, exercise))
+    exercise, day, e1rm = exercise[order], day[order], e1rm[order]
+
+    starts = np.flatnonzero(
+        np.concatenate(([True], (exercise[1:] != exercise[:-1]) | (day[1:] != day[:-1])))
+    )
+    exercise, day = exercise[starts], day[starts]
+    best = np.maximum.reduceat(e1rm, starts)
+
+    offset = exercise * (best.max() + 1)
+    running = np.maximum.accumulate(best + offset) - offset
+    return {"exercise": exercise, "day": day, "best": best, "running": running}
+
+
+def session_series(session: np.ndarray, started: np.ndarray, reps: np.ndarray, weight: np.ndarray) -> dict:
+    """Top-set weight, volume and best e1RM per session.
+
+    Expects sets ordered so each session is one contiguous run (see
+    FitnessRepository.get_exercise_log_columns); runs reduce with reduceat.
+    """
+    if not len(session):
+        empty = np.zeros(0)
+        return {"started": empty, **{metric: empty for metric in SERIES_METRICS}}
+
+    starts = np.flatnonzero(np.concatenate(([True], session[1:] != session[:-1])))
+    return {
+        "started": started[starts],
+        "top_weight": np.maximum.reduceat(weight, starts),
+        "volume": np.add.reduceat(reps * weight, starts),
+        "e1rm": np.maximum.reduceat(estimate_1rm(weight, reps), starts),
+    }
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps.
+
+    The first and last points always survive. The interior is split into
+    n_out - 2 buckets and each bucket keeps the point forming the largest
+    triangle with the previously kept point and the next bucket's mean.
+    Each pick depends on the previous one, so this loops over buckets (at
+    most n_out), never over points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Mean of each bucket, with the last point standing in for the bucket after the last
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / np.diff(edges), x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / np.diff(edges), y[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs(
+            (x[a] - mean_x[b + 1]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (mean_y[b + 1] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        kept[b + 1] = a
+    return kept
+
+
+def bucket_max(day: np.ndarray, series: dict[str, np.ndarray], n_out: int) -> tuple[np.ndarray, dict]:
+    """Per-bucket maxima over Monday-based weeks, widened to fit n_out buckets.
+
+    One bucket per week when the history spans at most n_out weeks;
+    otherwise each bucket covers ceil(weeks / n_out) consecutive weeks.
+    Returns each non-empty bucket's first day and every series' maxima.
+    """
+    if not len(day):
+        return np.zeros(0, dtype=np.int64), {name: np.zeros(0) for name in series}
+
+    week = (day + _WEEK_SHIFT) // 7
+    first_week = int(week.min())
+    width = -(-int(week.max() - first_week + 1) // n_out)
+    bucket = (week - first_week) // width
+
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    bucket_day = (first_week + bucket[starts] * width) * 7 - _WEEK_SHIFT
+    return bucket_day, {name: np.maximum.reduceat(values, starts) for name, values in series.items()}
+
+
+class AnalyticsService:
+    """Service for training-load analytics."""
+
+    def __init__(self, repository: FitnessRepository):
+        self.repo = repository
+
+    async def _load(self, user_id: UUID) -> LogColumns:
+        return LogColumns.from_row(await self.repo.get_log_columns(user_id))
+
+    async def get_weekly(self, user_id: UUID, weeks: Optional[int] = None):
+        cols = await self._load(user_id)
+        rollup = weekly_load(cols)
+
+        items = []
+        for i, week_start in enumerate(rollup["week_start"]):
+            items.append(WeeklyLoad(
+                week_start=week_start,
+                sets=int(rollup["sets"][i].sum()),
+                reps=int(rollup["reps"][i].sum()),
+                tonnage_kg=round(float(rollup["tonnage"][i].sum()), 2),
+                muscle_groups=[
+                    MuscleGroupLoad(
+                        muscle_group=group,
+                        sets=int(rollup["sets"][i, g]),
+                        reps=int(rollup["reps"][i, g]),
+                        tonnage_kg=round(float(rollup["tonnage"][i, g]), 2),
+                    )
+                    for g, group in enumerate(rollup["groups"])
+                    if rollup["sets"][i, g]
+                ],
+            ))
+        if weeks:
+            items = items[-weeks:]
+        return WeeklyAnalyticsResponse(weeks=items)
+
+    async def get_workload(self, user_id: UUID, days: int = 90, acute_days: int = 7, chronic_days: int = 28):
+        cols = await self._load(user_id)
+        # Log days are UTC session start dates
+        today = datetime.now(timezone.utc).date()
+        load = workload_ratio(cols, today, acute_days, chronic_days)
+
+        start = max(len(load["ratio"]) - days, 0)
+        points = [
+            WorkloadPoint(
+                date=_to_date(load["first_day"] + i),
+                acute_load=round(float(load["acute"][i]), 2),
+                chronic_load=round(float(load["chronic"][i]), 2),
+                ratio=None if np.isnan(load["ratio"][i]) else round(float(load["ratio"][i]), 3),
+            )
+            for i in range(start, len(load["ratio"]))
+        ]
+        return WorkloadResponse(
+            acute_days=acute_days,
+            chronic_days=chronic_days,
+            current_ratio=points[-1].ratio if points else None,
+            points=points,
+        )
+
+    async def get_e1rm_trends(self, user_id: UUID, exercise_id: Optional[UUID] = None):
+        cols = await self._load(user_id)
+        trend = e1rm_trend(cols)
+
+        # Runs are contiguous per exercise after the sort in e1rm_trend
+        codes, starts = np.unique(trend["exercise"], return_index=True)
+        ends = np.append(starts[1:], len(trend["exercise"]))
+
+        exercises = []
+        for code, start, end in zip(codes, starts, ends):
+            if exercise_id and cols.exercise_ids[code] != exercise_id:
+                continue
+            exercises.append(ExerciseE1rmTrend(
+                exercise_id=cols.exercise_ids[code],
+                exercise_name=cols.exercise_names[code],
+                points=[
+                    E1rmPoint(
+                        date=_to_date(trend["day"][i]),
+                        e1rm_kg=round(float(trend["best"][i]), 2),
+                        best_e1rm_kg=round(float(trend["running"][i]), 2),
+                    )
+                    for i in range(start, end)
+                ],
+            ))
+        return E1rmTrendResponse(exercises=exercises)
+
+    async def get_exercise_series(
+        self,
+        user_id: UUID,
+        exercise_id: UUID,
+        points: int = 200,
+        method: str = "lttb",
+        metric: str = "e1rm",
+    ):
+        exercise = await self.repo.get_exercise(exercise_id, user_id)
+        if not exercise:
+            raise NotFoundError("Exercise not found")
+
+        row = await self.repo.get_exercise_log_columns(exercise_id, user_id)
+        series = session_series(
+            np.asarray(row.session or [], dtype=object),
+            np.asarray(row.started or [], dtype=np.float64),
+            np.asarray(row.reps or [], dtype=np.int64),
+            np.asarray(row.weight or [], dtype=np.float64),
+        )
+        started = series.pop("started")
+
+        if method == "weekly_max":
+            days, values = bucket_max((started // 86400).astype(np.int64), series, points)
+            dates = [_to_date(day) for day in days]
+        else:
+            kept = lttb(started, series[metric], points)
+            values = {name: column[kept] for name, column in series.items()}
+            dates = [datetime.fromtimestamp(ts, timezone.utc).date() for ts in started[kept]]
+
+        return ExerciseSeriesResponse(
+            exercise_id=exercise.id,
+            exercise_name=exercise.name,
+            method=method,
+            metric=metric if method == "lttb" else None,
+            total_sessions=len(started),
+            points=[
+                ExerciseSeriesPoint(
+                    date=dates[i],
+                    top_weight_kg=round(float(values["top_weight"][i]), 2) or None,
+                    volume_kg=round(float(values["volume"][i]), 2),
+                    e1rm_kg=round(float(values["e1rm"][i]), 2) or None,
+                )
+                for i in range(len(dates))
+            ],
+        )
@@ -4,6 +4,7 @@ from app.schemas.calendar import CalendarEventCreate, CalendarEventUpdate
 from uuid import UUID, uuid4
 from datetime import date, timedelta
 from app.exceptions import NotFoundError
+from app.etag import fingerprint_etag
 
 
 class CalendarService:
@@ -28,7 +29,7 @@ class CalendarService:
 
         # Recurring event - create all instances
         series_id = uuid4()
-        events = []
+        instances = []
 
         # Convert recurrence_days list to comma-separated string
         recurrence_days_str = ",".join(map(str, data.recurrence_days)) if data.recurrence_days else None
@@ -40,7 +41,7 @@ class CalendarService:
             weekday = current_date.isoweekday()  # 1=Monday, 7=Sunday
 
             if data.recurrence_days and weekday in data.recurrence_days:
-                event = await self.repository.create(
+                instances.append(dict(
                     user_id=user_id,
                     title=data.title,
                     description=data.description,
@@ -52,11 +53,12 @@ class CalendarService:
                     recurrence_end_date=data.recurrence_end_date,
                     recurrence_days=recurrence_days_str,
                     series_id=series_id
-                )
-                events.append(event)
+                ))
 
             current_date += timedelta(days=1)
 
+        # One flush, so the instances go out as a batched INSERT
+        events = await self.repository.create_many(instances)
         return events[0] if events else None
 
     async def get_event(self, event_id: UUID, user_id: UUID):
@@ -74,6 +76,11 @@ class CalendarService:
             "total": len(events)
         }
 
+    async def list_events_etag(self, user_id: UUID, start_date: date, end_date: date) -> str:
+        """ETag of list_events, from one aggregate query."""
+        fingerprint = await self.repository.get_date_range_fingerprint(user_id, start_date, end_date)
+        return fingerprint_etag("events", user_id, start_date, end_date, *fingerprint)
+
     async def update_event(
         self,
         event_id: UUID,
@@ -104,30 +111,23 @@ class CalendarService:
 
         if update_scope == "all":
             # Update all events in series
-            for e in series_events:
-                if data.title is not None:
-                    e.title = data.title
-                if data.description is not None:
-                    e.description = data.description
-                if data.start_time is not None:
-                    e.start_time = data.start_time
-                if data.end_time is not None:
-                    e.end_time = data.end_time
-                await self.repository.update(e)
-
+            targets = series_events
         elif update_scope == "future":
             # Update this and all future events
-            for e in series_events:
-                if e.event_date >= event.event_date:
-                    if data.title is not None:
-                        e.title = data.title
-                    if data.description is not None:
-                        e.description = data.description
-                    if data.start_time is not None:
-                        e.start_time = data.start_time
-                    if data.end_time is not None:
-                        e.end_time = data.end_time
-                    await self.repository.update(e)
+            targets = [e for e in series_events if e.event_date >= event.event_date]
+        else:
+            targets = []
+
+        changes = {}
+        if data.title is not None:
+            changes["title"] = data.title
+        if data.description is not None:
+            changes["description"] = data.description
+        if data.start_time is not None:
+            changes["start_time"] = data.start_time
+        if data.end_time is not None:
+            changes["end_time"] = data.end_time
+        await self.repository.update_many(targets, changes)
 
         return event
 
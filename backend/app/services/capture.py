@@ -4,6 +4,7 @@ from app.schemas.capture import CaptureCreate, CaptureUpdate
 from app.models.capture import Capture
 from uuid import UUID
 from app.exceptions import NotFoundError
+from app.etag import fingerprint_etag
 
 
 class CaptureService:
@@ -39,6 +40,11 @@ class CaptureService:
             "unprocessed_count": unprocessed
         }
 
+    async def list_captures_etag(self, user_id: UUID, include_processed: bool = True) -> str:
+        """ETag of list_captures, from one aggregate query."""
+        fingerprint = await self.repository.get_list_fingerprint(user_id, include_processed)
+        return fingerprint_etag("captures", user_id, include_processed, *fingerprint)
+
     async def update_capture(self, capture_id: UUID, user_id: UUID, data: CaptureUpdate) -> Capture:
         """Update a capture."""
         capture = await self.get_capture(capture_id, user_id)
@@ -5,21 +5,183 @@ from app.schemas.fitness import (
     ProgramCreate, ProgramUpdate,
     ProgramExerciseCreate, ProgramExerciseUpdate,
     SessionStartRequest, SessionCompleteRequest,
-    WorkoutLogCreate,
-    ExerciseResponse, ExerciseListResponse,
+    WorkoutLogCreate, WorkoutLogBatchCreate,
+    ExerciseResponse, ExerciseListItem, ExerciseListResponse,
+    ExerciseSuggestion, ExerciseAutocompleteResponse, ExerciseBulkDeleteResponse,
     ProgramListItem, ProgramListResponse,
-    ProgramExerciseResponse, ProgramDetailResponse,
+    ProgramExerciseResponse, ProgramDetailResponse, ExerciseReorderResponse,
     SessionStartResponse, SessionActiveResponse, SessionExerciseInfo,
+    LastPerformance, LastPerformanceSet,
     SessionCompleteResponse, SessionCancelResponse,
-    WorkoutLogResponse, ExerciseSummary,
+    WorkoutLogResponse, WorkoutLogBatchResponse, ExerciseSummary,
     HistoryItem, HistoryResponse,
+    PersonalRecordEntry, PersonalRecordsResponse,
+    PersonalRecordEventResponse, PersonalRecordHistoryResponse,
     FitnessSummary,
 )
 from app.exceptions import NotFoundError, DuplicateEntryError, ConflictError, ValidationError
 from app.models.fitness import SessionStatus
+from app.database import after_commit
+from app.etag import make_etag, etag_matches, fingerprint_etag
+from app.responses import validate_many
+from app.cache import cached
+from app.services.analytics import estimate_1rm
 from uuid import UUID
+from typing import Optional
 from datetime import datetime, timezone, timedelta
+from bisect import bisect_left
 from collections import defaultdict
+from decimal import Decimal
+import re
+import time
+
+# Per-worker session_id -> owner user_id for sessions seen in progress, so
+# log_set can skip loading the session. Entries are dropped on complete and
+# cancel; a session finished by another worker is caught by the guarded
+# INSERT in FitnessRepository.insert_log and evicted then.
+_active_sessions: dict[UUID, UUID] = {}
+_ACTIVE_SESSIONS_MAX = 1024
+
+# Per-worker user_id -> exercise name prefix index for autocomplete. Writes
+# on this worker drop the user's entry; the TTL bounds how long another
+# worker can serve names from before a create, rename or delete.
+_autocomplete_indexes: dict[UUID, "_PrefixIndex"] = {}
+_AUTOCOMPLETE_TTL_SECONDS = 30.0
+
+_ZERO = Decimal("0")
+_CENTS = Decimal("0.01")
+_WORD = re.compile(r"\w+")
+
+
+def _record_e1rm(weight_kg: Decimal, reps: int) -> Decimal:
+    """A set's estimated 1RM to the cent, by the formula the e1RM trends use."""
+    return Decimal(float(estimate_1rm(float(weight_kg), reps))).quantize(_CENTS)
+
+
+def _remember_session(session_id: UUID, user_id: UUID) -> None:
+    if len(_active_sessions) >= _ACTIVE_SESSIONS_MAX:
+        _active_sessions.clear()
+    _active_sessions[session_id] = user_id
+
+
+def _invalidate(db, cache: dict, key) -> None:
+    """Drop a per-worker cache entry now and again once the write commits.
+
+    The second pop covers a request on this worker that reloaded the entry
+    from pre-commit data in between.
+    """
+    cache.pop(key, None)
+    after_commit(db, lambda: cache.pop(key, None))
+
+
+class _PrefixIndex:
+    """Sorted (key, name, id, muscle group) rows for one user's exercises.
+
+    Every exercise is keyed by its full lowercased name and by each word in
+    it, so "pre" finds "Bench Press". A lookup is a bisect to the first key
+    with the prefix and a short scan; no database round trip.
+    """
+
+    def __init__(self, rows):
+        self.built_at = time.monotonic()
+        entries = []
+        for exercise_id, name, muscle_group in rows:
+            lowered = name.lower()
+            keys = {lowered, *(m.group() for m in _WORD.finditer(lowered))}
+            for key in keys:
+                # Rank 0: the name itself starts with the prefix
+                entries.append((key, 0 if key == lowered else 1, lowered, exercise_id, name, muscle_group))
+        entries.sort()
+        self.keys = [entry[0] for entry in entries]
+        self.entries = entries
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > _AUTOCOMPLETE_TTL_SECONDS
+
+    def search(self, prefix: str, limit: int) -> list[tuple]:
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        matches = {}
+        for entry in self.entries[start:]:
+            if not entry[0].startswith(prefix):
+                break
+            _, rank, lowered, exercise_id, name, muscle_group = entry
+            best = matches.get(exercise_id)
+            if best is None or rank < best[0]:
+                matches[exercise_id] = (rank, lowered, exercise_id, name, muscle_group)
+        return sorted(matches.values())[:limit]
+
+
+class _RecordTracker:
+    """Replays sets against known personal records.
+
+    Shared by log_set (seeded with the stored rows for the touched exercises)
+    and rebuilds (seeded empty), so both apply the same rules: a set is a
+    reps PR when it beats the best reps at its weight, a weight PR when it is
+    the heaviest set so far, and an e1rm PR when its Epley estimate is the
+    highest so far.
+    """
+
+    def __init__(self, user_id: UUID, records=()):
+        self.user_id = user_id
+        self.records: dict[tuple[UUID, Decimal], dict] = {}
+        self.best_weight: dict[UUID, Decimal] = {}
+        self.best_e1rm: dict[UUID, Decimal] = {}
+        self.changed: set[tuple[UUID, Decimal]] = set()
+        self.events: list[dict] = []
+        for record in records:
+            self._store(record.exercise_id, record.weight_kg, record.reps,
+                        record.e1rm_kg, record.session_id, record.achieved_at)
+
+    def _store(self, exercise_id, weight, reps, e1rm, session_id, achieved_at):
+        self.records[(exercise_id, weight)] = {
+            "exercise_id": exercise_id,
+            "weight_kg": weight,
+            "user_id": self.user_id,
+            "session_id": session_id,
+            "reps": reps,
+            "e1rm_kg": e1rm,
+            "achieved_at": achieved_at,
+        }
+        if weight > self.best_weight.get(exercise_id, _ZERO):
+            self.best_weight[exercise_id] = weight
+        if e1rm > self.best_e1rm.get(exercise_id, _ZERO):
+            self.best_e1rm[exercise_id] = e1rm
+
+    def observe(self, session_id, exercise_id, weight_kg, reps, achieved_at) -> None:
+        if reps <= 0:
+            return
+        weight = weight_kg if weight_kg is not None else _ZERO
+        e1rm = _record_e1rm(weight, reps)
+        key = (exercise_id, weight)
+
+        record_types = []
+        previous = self.records.get(key)
+        if previous is not None and reps > previous["reps"]:
+            record_types.append("reps")
+        if weight > 0 and weight > self.best_weight.get(exercise_id, _ZERO):
+            record_types.append("weight")
+        if e1rm > self.best_e1rm.get(exercise_id, _ZERO):
+            record_types.append("e1rm")
+
+        if previous is None or reps > previous["reps"]:
+            self._store(exercise_id, weight, reps, e1rm, session_id, achieved_at)
+            self.changed.add(key)
+
+        for record_type in record_types:
+            self.events.append({
+                "user_id": self.user_id,
+                "exercise_id": exercise_id,
+                "session_id": session_id,
+                "record_type": record_type,
+                "weight_kg": weight,
+                "reps": reps,
+                "e1rm_kg": e1rm,
+                "achieved_at": achieved_at,
+            })
+
+    def changed_rows(self) -> list[dict]:
+        return [self.records[key] for key in self.changed]
 
 
 class FitnessService:
@@ -30,24 +192,38 @@ class FitnessService:
 
     # ── Exercises ──
 
-    async def list_exercises(self, user_id: UUID, muscle_group=None, search=None):
-        exercises = await self.repo.list_exercises(user_id, muscle_group, search)
-        return ExerciseListResponse(
-            items=[ExerciseResponse.model_validate(e) for e in exercises],
-            total=len(exercises),
-        )
+    async def list_exercises(self, user_id: UUID, muscle_group=None, search=None, include_usage=False):
+        rows = await self.repo.list_exercises(user_id, muscle_group, search, include_usage)
+        items = validate_many(ExerciseListItem, (row.Exercise for row in rows))
+        if include_usage:
+            for item, row in zip(items, rows):
+                item.usage_count = row.usage_count
+        return ExerciseListResponse(items=items, total=len(items))
+
+    async def autocomplete_exercises(self, user_id: UUID, prefix: str, limit: int = 10):
+        index = _autocomplete_indexes.get(user_id)
+        if index is None or index.expired():
+            index = _PrefixIndex(await self.repo.list_exercise_names(user_id))
+            _autocomplete_indexes[user_id] = index
+
+        return ExerciseAutocompleteResponse(items=[
+            ExerciseSuggestion(id=exercise_id, name=name, muscle_group=muscle_group)
+            for _, _, exercise_id, name, muscle_group in index.search(prefix.strip(), limit)
+        ])
 
     async def create_exercise(self, user_id: UUID, data: ExerciseCreate):
         existing = await self.repo.get_exercise_by_name(data.name, user_id)
         if existing:
             raise DuplicateEntryError(f"Exercise with name '{data.name}' already exists")
-        return await self.repo.create_exercise(
+        exercise = await self.repo.create_exercise(
             user_id=user_id,
             name=data.name,
             muscle_group=data.muscle_group,
             demo_url=data.demo_url,
             notes=data.notes,
         )
+        _invalidate(self.repo.db, _autocomplete_indexes, user_id)
+        return exercise
 
     async def update_exercise(self, exercise_id: UUID, user_id: UUID, data: ExerciseUpdate):
         exercise = await self.repo.get_exercise(exercise_id, user_id)
@@ -64,7 +240,11 @@ class FitnessService:
             exercise.demo_url = data.demo_url
         if data.notes is not None:
             exercise.notes = data.notes
-        return await self.repo.update_exercise(exercise)
+        # Program details embed the exercise
+        await self.repo.bump_programs_using_exercise(exercise_id)
+        exercise = await self.repo.update_exercise(exercise)
+        _invalidate(self.repo.db, _autocomplete_indexes, user_id)
+        return exercise
 
     async def delete_exercise(self, exercise_id: UUID, user_id: UUID):
         exercise = await self.repo.get_exercise(exercise_id, user_id)
@@ -76,6 +256,25 @@ class FitnessService:
                 f"Exercise is used in {usage_count} program(s). Remove it from programs first."
             )
         await self.repo.delete_exercise(exercise)
+        _invalidate(self.repo.db, _autocomplete_indexes, user_id)
+
+    async def delete_exercises(self, user_id: UUID, exercise_ids: list[UUID]):
+        ids = list(dict.fromkeys(exercise_ids))
+        owned = await self.repo.get_exercise_ids(ids, user_id)
+        missing = [exercise_id for exercise_id in ids if exercise_id not in owned]
+        if missing:
+            raise NotFoundError(f"Exercises not found: {', '.join(str(m) for m in missing)}")
+
+        in_use = await self.repo.get_exercises_in_programs(ids)
+        if in_use:
+            names = ", ".join(f"{row.name} ({row.program_count})" for row in in_use)
+            raise ConflictError(
+                f"Exercises are used in programs: {names}. Remove them from programs first."
+            )
+
+        deleted = await self.repo.delete_exercises(ids, user_id)
+        _invalidate(self.repo.db, _autocomplete_indexes, user_id)
+        return ExerciseBulkDeleteResponse(deleted_count=deleted)
 
     # ── Programs ──
 
@@ -95,7 +294,37 @@ class FitnessService:
             ))
         return ProgramListResponse(items=items)
 
-    async def get_program_detail(self, program_id: UUID, user_id: UUID):
+    async def list_programs_etag(self, user_id: UUID) -> str:
+        """ETag of list_programs, from one aggregate query."""
+        fingerprint = await self.repo.get_programs_fingerprint(user_id)
+        return fingerprint_etag("programs", user_id, *fingerprint)
+
+    async def get_program_detail(
+        self, program_id: UUID, user_id: UUID, if_none_match: Optional[str] = None
+    ) -> tuple[str, Optional[ProgramDetailResponse]]:
+        """Program detail and its ETag.
+
+        Only the program's version is read when the client's copy or the
+        cache is current. The detail is None when If-None-Match already
+        matches.
+        """
+        version = await self.repo.get_program_version(program_id, user_id)
+        if version is None:
+            raise NotFoundError("Program not found")
+
+        etag = make_etag("program", program_id, version)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        return etag, await self._program_detail(program_id, user_id, version)
+
+    @cached(ProgramDetailResponse)
+    async def _program_detail(self, program_id: UUID, user_id: UUID, version: int):
+        """Program detail at a version.
+
+        The version lives on workout_programs and every write bumps it, so
+        an entry is never stale, whichever worker made the write.
+        """
         program = await self.repo.get_program(program_id, user_id, load_exercises=True)
         if not program:
             raise NotFoundError("Program not found")
@@ -124,6 +353,7 @@ class FitnessService:
             program.name = data.name
         if data.description is not None:
             program.description = data.description
+        await self.repo.bump_program_version(program)
         return await self.repo.update_program(program)
 
     async def delete_program(self, program_id: UUID, user_id: UUID):
@@ -143,6 +373,7 @@ class FitnessService:
             raise NotFoundError("Exercise not found")
         if data.target_reps_max < data.target_reps_min:
             raise ValidationError("target_reps_max must be >= target_reps_min")
+        await self.repo.bump_program_version(program)
         return await self.repo.create_program_exercise(
             program_id=program_id,
             exercise_id=data.exercise_id,
@@ -174,6 +405,7 @@ class FitnessService:
             pe.target_reps_max = data.target_reps_max
         if data.rest_seconds is not None:
             pe.rest_seconds = data.rest_seconds
+        await self.repo.bump_program_version(program)
         return await self.repo.update_program_exercise(pe)
 
     async def delete_program_exercise(self, program_id: UUID, entry_id: UUID, user_id: UUID):
@@ -183,13 +415,23 @@ class FitnessService:
         pe = await self.repo.get_program_exercise(entry_id, program_id)
         if not pe:
             raise NotFoundError("Program exercise entry not found")
+        await self.repo.bump_program_version(program)
         await self.repo.delete_program_exercise(pe)
 
     async def reorder_exercises(self, program_id: UUID, user_id: UUID, day_label: str, ordered_ids: list[UUID]):
         program = await self.repo.get_program(program_id, user_id)
         if not program:
             raise NotFoundError("Program not found")
-        await self.repo.reorder_program_exercises(program_id, day_label, ordered_ids)
+        if len(set(ordered_ids)) != len(ordered_ids):
+            raise ValidationError("exercise_order contains duplicate IDs")
+        await self.repo.bump_program_version(program)
+        updated = set(await self.repo.reorder_program_exercises(program_id, day_label, ordered_ids))
+        mismatched = [pe_id for pe_id in ordered_ids if pe_id not in updated]
+        return ExerciseReorderResponse(
+            message="Exercises reordered",
+            updated_count=len(updated),
+            mismatched_ids=mismatched,
+        )
 
     # ── Workout Sessions ──
 
@@ -207,16 +449,9 @@ class FitnessService:
             if not program:
                 raise NotFoundError("Program not found")
             program_name = program.name
-            for pe in program.program_exercises:
-                if pe.day_label == data.day_label:
-                    exercises_info.append(SessionExerciseInfo(
-                        exercise_id=pe.exercise.id,
-                        exercise_name=pe.exercise.name,
-                        target_sets=pe.target_sets,
-                        target_reps_min=pe.target_reps_min,
-                        target_reps_max=pe.target_reps_max,
-                        rest_seconds=pe.rest_seconds,
-                    ))
+            exercises_info = await self._build_session_exercises(
+                user_id, program.program_exercises, data.day_label
+            )
 
         session = await self.repo.create_session(
             user_id=user_id,
@@ -224,6 +459,7 @@ class FitnessService:
             day_label=data.day_label,
             status=SessionStatus.IN_PROGRESS.value,
         )
+        _remember_session(session.id, user_id)
 
         return SessionStartResponse(
             id=session.id,
@@ -241,16 +477,9 @@ class FitnessService:
 
         exercises_info = []
         if session.program and session.day_label:
-            for pe in session.program.program_exercises:
-                if pe.day_label == session.day_label:
-                    exercises_info.append(SessionExerciseInfo(
-                        exercise_id=pe.exercise.id,
-                        exercise_name=pe.exercise.name,
-                        target_sets=pe.target_sets,
-                        target_reps_min=pe.target_reps_min,
-                        target_reps_max=pe.target_reps_max,
-                        rest_seconds=pe.rest_seconds,
-                    ))
+            exercises_info = await self._build_session_exercises(
+                user_id, session.program.program_exercises, session.day_label
+            )
 
         return SessionActiveResponse(
             id=session.id,
@@ -259,24 +488,65 @@ class FitnessService:
             status=session.status,
             started_at=session.started_at,
             exercises=exercises_info,
-            logs=[WorkoutLogResponse.model_validate(log) for log in session.logs],
+            logs=validate_many(WorkoutLogResponse, session.logs),
         )
 
-    async def log_set(self, session_id: UUID, user_id: UUID, data: WorkoutLogCreate):
-        session = await self.repo.get_session(session_id, user_id)
-        if not session:
+    async def _check_session_in_progress(self, session_id: UUID, user_id: UUID) -> None:
+        owner = _active_sessions.get(session_id)
+        if owner is None:
+            state = await self.repo.get_session_state(session_id)
+            if not state or state.user_id != user_id:
+                raise NotFoundError("Workout session not found")
+            if state.status != SessionStatus.IN_PROGRESS.value:
+                raise ConflictError("Workout session is not in progress")
+            _remember_session(session_id, user_id)
+        elif owner != user_id:
             raise NotFoundError("Workout session not found")
-        if session.status != SessionStatus.IN_PROGRESS.value:
-            raise ConflictError("Workout session is not in progress")
 
-        log = await self.repo.create_log(
+    async def log_set(self, session_id: UUID, user_id: UUID, data: WorkoutLogCreate):
+        await self._check_session_in_progress(session_id, user_id)
+
+        log = await self.repo.insert_log(
             session_id=session_id,
             exercise_id=data.exercise_id,
             set_number=data.set_number,
             reps=data.reps,
             weight_kg=data.weight_kg,
         )
-        return log
+        if log is None:
+            # Finished on another worker since we cached it
+            _active_sessions.pop(session_id, None)
+            raise ConflictError("Workout session is not in progress")
+
+        await self._apply_personal_records(user_id, [log])
+        return WorkoutLogResponse.model_validate(log)
+
+    async def log_sets_batch(self, session_id: UUID, user_id: UUID, data: WorkoutLogBatchCreate):
+        await self._check_session_in_progress(session_id, user_id)
+
+        # A queue replayed offline may hold the same set twice; the last one wins
+        items = {}
+        for item in data.logs:
+            items[(item.exercise_id, item.set_number)] = item.model_dump()
+
+        written, corrected = await self.repo.upsert_logs(session_id, list(items.values()))
+        if not written:
+            state = await self.repo.get_session_state(session_id)
+            if state is None or state.status != SessionStatus.IN_PROGRESS.value:
+                _active_sessions.pop(session_id, None)
+                raise ConflictError("Workout session is not in progress")
+        else:
+            # A corrected set may have been a record it no longer holds
+            await self._apply_personal_records(
+                user_id, [log for log in written if log.exercise_id not in corrected]
+            )
+            if corrected:
+                await self._rebuild_personal_records(user_id, list(corrected))
+
+        return WorkoutLogBatchResponse(
+            written=validate_many(WorkoutLogResponse, written),
+            unchanged_count=len(items) - len(written),
+        )
 
     async def complete_session(self, session_id: UUID, user_id: UUID, data: SessionCompleteRequest):
         session = await self.repo.get_session(session_id, user_id)
@@ -292,9 +562,10 @@ class FitnessService:
         if data.notes:
             session.notes = data.notes
         await self.repo.update_session(session)
+        _invalidate(self.repo.db, _active_sessions, session_id)
 
-        # Build summary
-        logs = await self.repo.get_session_logs(session_id)
+        # Build summary from the logs get_session already loaded
+        logs = sorted(session.logs, key=lambda log: (log.exercise_id, log.set_number))
         summary = self._build_session_summary(logs)
 
         return SessionCompleteResponse(
@@ -318,6 +589,12 @@ class FitnessService:
 
         session.status = SessionStatus.CANCELLED.value
         await self.repo.update_session(session)
+        _invalidate(self.repo.db, _active_sessions, session_id)
+
+        # Its sets no longer count towards records
+        exercise_ids = list({log.exercise_id for log in session.logs})
+        if exercise_ids:
+            await self._rebuild_personal_records(user_id, exercise_ids)
 
         return SessionCancelResponse(
             id=session.id,
@@ -325,62 +602,161 @@ class FitnessService:
             message="Workout session cancelled",
         )
 
-    async def get_history(self, user_id: UUID, page=1, per_page=20, date_from=None, date_to=None):
-        sessions, total = await self.repo.list_sessions(
-            user_id, page, per_page, date_from, date_to
+    # ── Personal Records ──
+
+    async def _apply_personal_records(self, user_id: UUID, logs) -> None:
+        """Raise records with new sets; only a rebuild can lower them."""
+        if not logs:
+            return
+        exercise_ids = list({log.exercise_id for log in logs})
+        tracker = _RecordTracker(
+            user_id, await self.repo.get_personal_records_for(exercise_ids, user_id)
         )
-        items = []
-        for s in sessions:
-            items.append(HistoryItem(
-                id=s.id,
-                program_name=s.program.name if s.program else None,
-                day_label=s.day_label,
-                status=s.status,
-                started_at=s.started_at,
-                completed_at=s.completed_at,
-                duration_seconds=s.duration_seconds,
-                exercise_count=len(set(log.exercise_id for log in s.logs)),
-            ))
-        return HistoryResponse(items=items, total=total, page=page, per_page=per_page)
+        for log in logs:
+            tracker.observe(log.session_id, log.exercise_id, log.weight_kg, log.reps, log.created_at)
 
-    async def get_fitness_summary(self, user_id: UUID):
-        active_program = await self.repo.get_active_program(user_id)
-        active_session = await self.repo.get_active_session(user_id)
+        rows = tracker.changed_rows()
+        if rows:
+            await self.repo.upsert_personal_records(rows)
+        if tracker.events:
+            await self.repo.add_personal_record_events(tracker.events)
+
+    async def get_personal_records(self, exercise_id: UUID, user_id: UUID):
+        records = await self.repo.get_personal_records(exercise_id, user_id)
+        if not records and not await self.repo.get_exercise(exercise_id, user_id):
+            raise NotFoundError("Exercise not found")
 
+        entries = validate_many(PersonalRecordEntry, records)
+        return PersonalRecordsResponse(
+            exercise_id=exercise_id,
+            best_weight=max(
+                (e for e in entries if e.weight_kg > 0),
+                key=lambda e: e.weight_kg,
+                default=None,
+            ),
+            best_e1rm=max(
+                (e for e in entries if e.e1rm_kg > 0),
+                key=lambda e: e.e1rm_kg,
+                default=None,
+            ),
+            reps_at_weight=entries,
+        )
+
+    async def get_personal_record_history(self, exercise_id: UUID, user_id: UUID, limit: int = 50):
+        events = await self.repo.get_personal_record_history(exercise_id, user_id, limit)
+        if not events and not await self.repo.get_exercise(exercise_id, user_id):
+            raise NotFoundError("Exercise not found")
+
+        return PersonalRecordHistoryResponse(
+            exercise_id=exercise_id,
+            items=validate_many(PersonalRecordEventResponse, events),
+        )
+
+    async def _rebuild_personal_records(self, user_id: UUID, exercise_ids=None) -> int:
+        """Replay a user's sets (outside cancelled sessions) into fresh records.
+
+        For all exercises, or only exercise_ids: cancelling a session or
+        correcting a set can lower a record, which log_set never does.
+        """
+        await self.repo.clear_personal_records(user_id, exercise_ids)
+
+        tracker = _RecordTracker(user_id)
+        async for row in self.repo.iter_user_logs(user_id, exercise_ids):
+            tracker.observe(row.session_id, row.exercise_id, row.weight_kg, row.reps, row.created_at)
+
+        await self.repo.upsert_personal_records(tracker.changed_rows())
+        await self.repo.add_personal_record_events(tracker.events)
+        return len(tracker.records)
+
+    async def backfill_personal_records(self, user_id: UUID) -> int:
+        """Rebuild a user's records and record history from their logged sets."""
+        return await self._rebuild_personal_records(user_id)
+
+    # ── History ──
+
+    async def get_history(
+        self, user_id: UUID, page=1, per_page=20, date_from=None, date_to=None, before=None, before_id=None
+    ):
+        rows, total = await self.repo.list_sessions(
+            user_id, per_page, date_from, date_to, before=before, page=page, before_id=before_id
+        )
+        items = validate_many(HistoryItem, rows)
+        last = items[-1] if len(items) == per_page else None
+        return HistoryResponse(
+            items=items,
+            total=total,
+            page=page,
+            per_page=per_page,
+            next_cursor=last.started_at if last else None,
+            next_cursor_id=last.id if last else None,
+        )
+
+    async def get_fitness_summary(self, user_id: UUID):
         # Week boundaries (Monday-Sunday)
         now = datetime.now(timezone.utc)
         monday = now - timedelta(days=now.weekday())
         week_start = monday.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_end = week_start + timedelta(days=7)
+        return await self._fitness_summary(user_id, week_start)
 
-        week_sessions = await self.repo.get_week_sessions(user_id, week_start, week_end)
+    @cached(FitnessSummary, tables=("workout_sessions", "workout_programs", "program_exercises"))
+    async def _fitness_summary(self, user_id: UUID, week_start: datetime):
+        """Summary for the week starting week_start; logging sets doesn't change it."""
+        week_end = week_start + timedelta(days=7)
 
-        # Determine next day label
-        next_day_label = None
-        if active_program and active_program.program_exercises:
-            day_labels = []
-            seen = set()
-            for pe in active_program.program_exercises:
-                if pe.day_label not in seen:
-                    day_labels.append(pe.day_label)
-                    seen.add(pe.day_label)
+        summary = await self.repo.get_summary(user_id, week_start, week_end)
 
-            completed_labels = [s.day_label for s in week_sessions if s.day_label]
-            for label in day_labels:
-                if label not in completed_labels:
-                    next_day_label = label
-                    break
+        # Next day label: first program day not yet completed this week
+        completed_labels = set(summary.week_day_labels or [])
+        next_day_label = next(
+            (label for label in summary.day_labels or [] if label not in completed_labels),
+            None,
+        )
 
         return FitnessSummary(
-            active_program_name=active_program.name if active_program else None,
-            active_program_id=active_program.id if active_program else None,
+            active_program_name=summary.program_name,
+            active_program_id=summary.program_id,
             next_day_label=next_day_label,
-            workouts_this_week=[s.started_at for s in week_sessions],
-            has_active_session=active_session is not None,
+            workouts_this_week=summary.week_started_at or [],
+            has_active_session=summary.has_active_session,
         )
 
     # ── Helpers ──
 
+    async def _build_session_exercises(
+        self, user_id: UUID, program_exercises, day_label: str
+    ) -> list[SessionExerciseInfo]:
+        entries = [pe for pe in program_exercises if pe.day_label == day_label]
+
+        rows = await self.repo.get_last_performances(
+            user_id, list({pe.exercise_id for pe in entries})
+        )
+        last = {}
+        for row in rows:
+            if row.exercise_id not in last:
+                last[row.exercise_id] = LastPerformance(
+                    session_id=row.session_id,
+                    performed_at=row.performed_at,
+                    sets=[],
+                )
+            last[row.exercise_id].sets.append(LastPerformanceSet(
+                set_number=row.set_number,
+                reps=row.reps,
+                weight_kg=row.weight_kg,
+            ))
+
+        return [
+            SessionExerciseInfo(
+                exercise_id=pe.exercise.id,
+                exercise_name=pe.exercise.name,
+                target_sets=pe.target_sets,
+                target_reps_min=pe.target_reps_min,
+                target_reps_max=pe.target_reps_max,
+                rest_seconds=pe.rest_seconds,
+                last_performance=last.get(pe.exercise_id),
+            )
+            for pe in entries
+        ]
+
     def _build_program_detail(self, program) -> ProgramDetailResponse:
         days: dict[str, list] = defaultdict(list)
         for pe in program.program_exercises:
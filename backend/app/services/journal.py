@@ -1,8 +1,10 @@
 """Journal service layer for business logic."""
 from app.repositories.journal import JournalRepository
-from app.schemas.journal import JournalEntryCreate, JournalEntryUpdate, EntryType
+from app.schemas.journal import JournalEntryCreate, JournalEntryUpdate, EntryType, JournalStatusResponse
 from app.models.journal import JournalEntry
 from app.exceptions import NotFoundError, DuplicateEntryError
+from app.etag import fingerprint_etag
+from app.cache import cached
 from uuid import UUID
 from datetime import date, timedelta
 from typing import Optional
@@ -74,6 +76,25 @@ class JournalService:
             "total": len(entries)
         }
 
+    async def list_entries_etag(
+        self,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        entry_type: Optional[EntryType] = None,
+        limit: int = 50
+    ) -> str:
+        """ETag of list_entries, from one aggregate query."""
+        fingerprint = await self.repository.get_fingerprint(
+            user_id,
+            start_date,
+            end_date,
+            entry_type.value if entry_type else None
+        )
+        return fingerprint_etag(
+            "entries", user_id, start_date, end_date, entry_type, limit, *fingerprint
+        )
+
     async def update_entry(
         self,
         entry_id: UUID,
@@ -90,8 +111,13 @@ class JournalService:
         entry = await self.get_entry(entry_id, user_id)
         await self.repository.delete(entry)
 
-    async def get_journal_status(self, user_id: UUID) -> dict:
+    async def get_journal_status(self, user_id: UUID) -> JournalStatusResponse:
         """Get journal status (streaks and weekly progress)."""
+        return await self._journal_status(user_id, date.today())
+
+    @cached(JournalStatusResponse, tables=("journal_entries",))
+    async def _journal_status(self, user_id: UUID, today: date) -> dict:
+        """Journal status as of today; cached until an entry is written or the day ends."""
         # Calculate streaks
         morning_streak = await self.repository.calculate_streak(
             user_id, EntryType.MORNING_PAGES.value
@@ -101,7 +127,6 @@ class JournalService:
         )
 
         # Check this week's entries
-        today = date.today()
         week_start = today - timedelta(days=today.weekday())  # Monday
         week_end = week_start + timedelta(days=6)  # Sunday
 
@@ -8,12 +8,27 @@ from app.schemas.project import (
     TaskStatus,
     NoteCreate,
     NoteUpdate,
-    TasksByStatus,
-    TaskCountsResponse
+    TaskCountsResponse,
+    ProjectChangesResponse,
+    ProjectDetailResponse
 )
 from app.exceptions import NotFoundError, ValidationError
+from app.etag import fingerprint_etag
+from app.cache import cached
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
+
+
+# Per-worker (user_id, slug) -> project ID cache. Slugs never change after
+# creation, so an entry only goes stale when its project is deleted; other
+# workers notice that as an ID miss and re-resolve the slug from the database.
+_slug_cache: dict[tuple[UUID, str], UUID] = {}
+
+
+def _forget_project(project_id: UUID) -> None:
+    """Drop cached slug mappings that point at a project."""
+    for key in [k for k, v in _slug_cache.items() if v == project_id]:
+        del _slug_cache[key]
 
 
 class ProjectService:
@@ -48,6 +63,17 @@ class ProjectService:
             raise NotFoundError("Project not found")
         return project
 
+    async def resolve_slug(self, slug: str, user_id: UUID) -> UUID:
+        """Resolve a project slug to its ID, using the per-worker cache."""
+        key = (user_id, slug)
+        project_id = _slug_cache.get(key)
+        if project_id is None:
+            project_id = await self.repository.get_project_id_by_slug(slug, user_id)
+            if project_id is None:
+                raise NotFoundError(f"Project '{slug}' not found")
+            _slug_cache[key] = project_id
+        return project_id
+
     async def get_project_by_slug(
         self,
         slug: str,
@@ -55,19 +81,96 @@ class ProjectService:
         load_relations: bool = False
     ):
         """Get a project by slug."""
-        project = await self.repository.get_project_by_slug(
-            slug,
+        project_id = await self.resolve_slug(slug, user_id)
+        project = await self.repository.get_project_by_id(
+            project_id,
             user_id,
             load_relations
         )
         if not project:
+            # Stale mapping (project deleted, slug reused); resolve again
+            _slug_cache.pop((user_id, slug), None)
+            project_id = await self.resolve_slug(slug, user_id)
+            project = await self.repository.get_project_by_id(
+                project_id,
+                user_id,
+                load_relations
+            )
+            if not project:
+                raise NotFoundError(f"Project '{slug}' not found")
+        return project
+
+    async def get_project_header_by_slug(self, slug: str, user_id: UUID):
+        """Get a project's header (no tasks or notes) by slug."""
+        project_id = await self.resolve_slug(slug, user_id)
+        project = await self.repository.get_project_header(project_id, user_id)
+        if not project:
+            _slug_cache.pop((user_id, slug), None)
             raise NotFoundError(f"Project '{slug}' not found")
         return project
 
+    async def get_project_changes(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        since: int
+    ) -> ProjectChangesResponse:
+        """Get tasks and notes changed or deleted since a project version."""
+        project = await self.get_project(project_id, user_id)
+        if since > project.version:
+            raise ValidationError(
+                f"Version {since} is ahead of project version {project.version}"
+            )
+
+        if since == project.version:
+            tasks, notes, tombstones = [], [], []
+        else:
+            tasks, notes, tombstones = await self.repository.get_changes_since(
+                project_id, since
+            )
+
+        return ProjectChangesResponse(
+            project_id=project.id,
+            since=since,
+            version=project.version,
+            tasks=tasks,
+            notes=notes,
+            deleted=tombstones
+        )
+
     async def list_projects(self, user_id: UUID, load_relations: bool = False):
         """List all projects for a user."""
         return await self.repository.list_projects(user_id, load_relations)
 
+    @cached(List[ProjectDetailResponse], tables=("projects", "project_tasks", "project_notes"))
+    async def list_project_details(self, user_id: UUID, etag: str) -> list[dict]:
+        """All projects with grouped tasks and notes.
+
+        Keyed by the list's ETag too, so with the memory backend an entry
+        can't outlive a write made on another worker.
+        """
+        projects = await self.repository.list_projects(user_id, load_relations=True)
+        return [self.project_detail(project) for project in projects]
+
+    def project_detail(self, project) -> dict:
+        """A project with loaded relations as ProjectDetailResponse fields."""
+        return {
+            "id": project.id,
+            "name": project.name,
+            "slug": project.slug,
+            "objective": project.objective,
+            "created_at": project.created_at,
+            "updated_at": project.updated_at,
+            "version": project.version,
+            "tasks": self.group_tasks_by_status(project.tasks),
+            "notes": project.notes,
+        }
+
+    async def list_projects_etag(self, user_id: UUID) -> str:
+        """ETag of the project list with tasks and notes, from one aggregate query."""
+        fingerprint = await self.repository.get_projects_fingerprint(user_id)
+        return fingerprint_etag("projects", user_id, *fingerprint)
+
     async def update_project(
         self,
         project_id: UUID,
@@ -82,11 +185,13 @@ class ProjectService:
         if data.objective is not None:
             project.objective = data.objective
 
+        _forget_project(project.id)
         return await self.repository.update_project(project)
 
     async def delete_project(self, project_id: UUID, user_id: UUID) -> None:
         """Delete a project."""
         project = await self.get_project(project_id, user_id)
+        _forget_project(project.id)
         await self.repository.delete_project(project)
 
     # Tasks
@@ -224,8 +329,8 @@ class ProjectService:
         await self.repository.delete_note(note)
 
     # Helper methods for response formatting
-    def group_tasks_by_status(self, tasks: list) -> TasksByStatus:
-        """Group tasks by their status."""
+    def group_tasks_by_status(self, tasks: list) -> dict[str, list]:
+        """Group tasks by their status, as TasksByStatus fields."""
         grouped = {
             "in_progress": [],
             "backlog": [],
@@ -235,4 +340,4 @@ class ProjectService:
         for task in tasks:
             grouped[task.status.value].append(task)
 
-        return TasksByStatus(**grouped)
+        return grouped
@@ -0,0 +1,182 @@
+"""Opt-in slow-query log with sampled EXPLAIN (ANALYZE, BUFFERS).
+
+With SLOW_QUERY_MS > 0, every statement slower than that is recorded with:
+
+- its bound parameters, redacted: numbers, booleans, dates, UUIDs and
+  None are kept; strings, bytes and JSON values are replaced by their
+  type and length, so journal text or passwords never reach the log
+- the repository method that issued it (the first app/repositories frame
+  on the stack; under the async engine that is in the parent greenlet)
+- for a SLOW_QUERY_EXPLAIN_SAMPLE_RATE fraction of them, the plan,
+  captured out of band: a background task on its own connection, inside
+  a transaction that is always rolled back, with statement and lock
+  timeouts. SELECTs get EXPLAIN (ANALYZE, BUFFERS). Writes get a plain
+  EXPLAIN: running them again would wait on the request's own row locks
+  and, for INSERTs, collide with the row it just added
+
+Records go to a per-worker ring buffer of SLOW_QUERY_BUFFER_SIZE entries,
+read by GET /api/debug/slow-queries, and are logged at WARNING.
+"""
+import asyncio
+import datetime as dt
+import decimal
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_REPOSITORIES = os.path.join("app", "repositories") + os.sep
+_SAFE_TYPES = (bool, int, float, decimal.Decimal, uuid.UUID, dt.date, dt.time, dt.timedelta)
+
+
+@dataclass
+class SlowQuery:
+    """One statement that ran over the threshold."""
+    at: dt.datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    caller: Optional[str]
+    plan: Optional[str] = None
+    analyzed: bool = False
+    explain_error: Optional[str] = None
+
+
+def redact(value: Any) -> Any:
+    """value with anything that may hold user content replaced by a placeholder."""
+    if value is None or isinstance(value, _SAFE_TYPES):
+        return value
+    if isinstance(value, (tuple, list)):
+        return [redact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    size = f" len={len(value)}" if hasattr(value, "__len__") else ""
+    return f"<{type(value).__name__}{size}>"
+
+
+def _frames():
+    frame = sys._getframe(2)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    # Under the async engine the statement runs in a child greenlet; the
+    # coroutines that awaited it are suspended in the parent
+    parent = getcurrent().parent
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+def find_caller() -> Optional[str]:
+    """"Class.method (file:line)" of the repository method on the stack."""
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if _REPOSITORIES in filename:
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            if owner is not None:
+                name = f"{type(owner).__name__}.{name}"
+            return f"{name} ({filename[filename.rindex(_REPOSITORIES):]}:{frame.f_lineno})"
+    return None
+
+
+class SlowQueryLog:
+    """Engine hook recording slow statements into a ring buffer."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_sample_rate: float = 0.0,
+        size: int = 100,
+        explain_timeout_ms: int = 5000,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.records: deque[SlowQuery] = deque(maxlen=size)
+        self._engines: dict[Any, AsyncEngine] = {}
+        self._explains: set[asyncio.Task] = set()
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Start timing every statement run on engine."""
+        self._engines[engine.sync_engine] = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def uninstall(self, engine: AsyncEngine) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._before)
+        event.remove(engine.sync_engine, "after_cursor_execute", self._after)
+        self._engines.pop(engine.sync_engine, None)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_slow_query_started", None)
+        if started is None or not context.execution_options.get("slow_query_log", True):
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        record = SlowQuery(
+            at=dt.datetime.now(dt.timezone.utc),
+            duration_ms=round(duration_ms, 2),
+            statement=statement,
+            parameters=redact(parameters),
+            caller=find_caller(),
+        )
+        self.records.append(record)
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %.300s", duration_ms, record.caller or "?", statement
+        )
+
+        # Read sessions run on an execution_options() copy of the engine;
+        # explain on the base engine, whose connections are transactional.
+        # executemany batches have no single parameter set to explain.
+        engine = self._engines.get(getattr(conn.engine, "_proxied", conn.engine))
+        if engine and not executemany and random.random() < self.explain_sample_rate:
+            task = asyncio.get_running_loop().create_task(
+                self._explain(engine, statement, parameters, record)
+            )
+            self._explains.add(task)
+            task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, engine: AsyncEngine, statement: str, parameters, record: SlowQuery) -> None:
+        analyze = statement.lstrip()[:6].upper() == "SELECT"
+        explain = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+        try:
+            async with engine.connect() as conn:
+                # Don't record (and explain) the explain itself
+                await conn.execution_options(slow_query_log=False)
+                await conn.execute(text(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}"))
+                await conn.execute(text(f"SET LOCAL lock_timeout = {int(self.explain_timeout_ms)}"))
+                result = await conn.exec_driver_sql(f"{explain} {statement}", parameters)
+                record.plan = "\n".join(row[0] for row in result)
+                record.analyzed = analyze
+                await conn.rollback()
+        except Exception as e:
+            record.explain_error = str(e).splitlines()[0]
+            logger.debug("EXPLAIN of slow query failed: %s", e)
+
+    async def wait_for_explains(self) -> None:
+        """Wait for plans still being captured (tests, shutdown)."""
+        if self._explains:
+            await asyncio.gather(*self._explains, return_exceptions=True)
+
+    def snapshot(self) -> list[dict]:
+        """The buffered records, newest first."""
+        return [asdict(record) for record in reversed(self.records)]
@@ -0,0 +1,41 @@
+"""Script to rebuild personal records from existing workout logs."""
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.models.user import User
+from app.repositories.fitness import FitnessRepository
+from app.services.fitness import FitnessService
+
+
+async def backfill():
+    """Rebuild personal records for every user, one transaction per user."""
+    engine = create_async_engine(settings.DATABASE_URL)
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with async_session() as session:
+        user_ids = (await session.execute(select(User.id, User.username))).all()
+
+    for user_id, username in user_ids:
+        async with async_session() as session:
+            try:
+                service = FitnessService(FitnessRepository(session))
+                count = await service.backfill_personal_records(user_id)
+                await session.commit()
+                print(f"{username}: {count} personal records")
+            except Exception as e:
+                await session.rollback()
+                print(f"{username}: failed - {e}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,160 @@
+"""Benchmark: response serialization, FastAPI's default path vs app.responses.
+
+Builds large in-memory payloads shaped like the biggest responses (no
+database needed) and times, per payload:
+
+- default: models built one by one, then FastAPI's serialize_response
+  (validate against the response_model, dump to a dict, jsonable_encoder)
+  and JSONResponse (stdlib json)
+- orjson: the same with ORJSONResponse, the app's default response class
+- model_response: one TypeAdapter validation from the ORM objects and one
+  dump_json, as the list endpoints now do
+
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --size 5000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import app.models.calendar, app.models.fitness, app.models.journal  # noqa: E401,F401 (mapper registry)
+from app.models.capture import Capture
+from app.models.project import Project, ProjectNote, ProjectTask, TaskStatus
+from app.responses import model_response
+from app.schemas.capture import CaptureListResponse, CaptureResponse
+from app.schemas.fitness import HistoryItem, HistoryResponse
+from app.schemas.project import NoteResponse, ProjectDetailResponse, TaskResponse
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def captures_payload(size: int):
+    captures = [
+        Capture(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), text=f"Capture {n}: call the plumber about the leak",
+            source="manual", processed=n % 3 == 0, deleted=False,
+            created_at=NOW - timedelta(minutes=n), updated_at=NOW,
+        )
+        for n in range(size)
+    ]
+
+    def build():
+        return {
+            "captures": [CaptureResponse.model_validate(c) for c in captures],
+            "total": size, "unprocessed_count": size // 3,
+        }
+
+    raw = {"captures": captures, "total": size, "unprocessed_count": size // 3}
+    return CaptureListResponse, build, raw
+
+
+def history_payload(size: int):
+    rows = [
+        SimpleNamespace(
+            id=uuid.uuid4(), program_name="Upper/Lower", day_label="Upper A", status="completed",
+            started_at=NOW - timedelta(days=n), completed_at=NOW - timedelta(days=n, hours=-1),
+            duration_seconds=3600, exercise_count=6, set_count=18, total_reps=160,
+            tonnage_kg=Decimal("8450.50"),
+        )
+        for n in range(size)
+    ]
+
+    def build():
+        return HistoryResponse(
+            items=[HistoryItem(**vars(row)) for row in rows],
+            total=size, page=1, per_page=size, next_cursor=None,
+        )
+
+    raw = {"items": rows, "total": size, "page": 1, "per_page": size, "next_cursor": None}
+    return HistoryResponse, build, raw
+
+
+def project_payload(size: int):
+    project = Project(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), name="House", slug="house", objective="Renovate",
+        version=size, created_at=NOW, updated_at=NOW,
+    )
+    statuses = list(TaskStatus)
+    tasks = {status.value: [] for status in statuses}
+    for n in range(size):
+        status = statuses[n % 3]
+        tasks[status.value].append(ProjectTask(
+            id=uuid.uuid4(), project_id=project.id, title=f"Task {n}", description="Details " * 10,
+            status=status, sort_order=n, version=n, created_at=NOW, updated_at=NOW,
+            completed_at=NOW if status == TaskStatus.COMPLETED else None,
+        ))
+    notes = [
+        ProjectNote(
+            id=uuid.uuid4(), project_id=project.id, content="A note " * 20, version=n,
+            created_at=NOW, updated_at=NOW,
+        )
+        for n in range(size // 10)
+    ]
+    fields = {
+        "id": project.id, "name": project.name, "slug": project.slug, "objective": project.objective,
+        "created_at": project.created_at, "updated_at": project.updated_at, "version": project.version,
+    }
+
+    def build():
+        return ProjectDetailResponse(
+            **fields,
+            tasks={key: [TaskResponse.model_validate(t) for t in value] for key, value in tasks.items()},
+            notes=[NoteResponse.model_validate(n) for n in notes],
+        )
+
+    return ProjectDetailResponse, build, {**fields, "tasks": tasks, "notes": notes}
+
+
+async def default_path(model, build, response_class):
+    content = await serialize_response(field=create_model_field("Response", model), response_content=build())
+    return response_class(content).body
+
+
+def timed(fn, repeat: int) -> float:
+    """Median milliseconds per call of fn."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(size: int, repeat: int):
+    print(f"{'payload':<12}{'bytes':>10}{'default':>12}{'orjson':>12}{'model_resp':>12}{'speedup':>10}")
+    for name, factory in [("captures", captures_payload), ("history", history_payload), ("project", project_payload)]:
+        model, build, raw = factory(size)
+        loop = asyncio.new_event_loop()
+        try:
+            default_ms = timed(lambda: loop.run_until_complete(default_path(model, build, JSONResponse)), repeat)
+            orjson_ms = timed(lambda: loop.run_until_complete(default_path(model, build, ORJSONResponse)), repeat)
+        finally:
+            loop.close()
+        fast_ms = timed(lambda: model_response(model, raw), repeat)
+        size_bytes = len(model_response(model, raw).body)
+        print(
+            f"{name:<12}{size_bytes:>10}{default_ms:>10.1f}ms{orjson_ms:>10.1f}ms"
+            f"{fast_ms:>10.1f}ms{default_ms / fast_ms:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="Items per payload")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per path (median is reported)")
+    args = parser.parse_args()
+    main(args.size, args.repeat)
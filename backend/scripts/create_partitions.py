@@ -0,0 +1,78 @@
+"""Maintenance job: create upcoming monthly partitions.
+
+The app does this itself at startup and daily (app.partitions); run this
+to create partitions further ahead, to move rows out of the default
+partition right away, or to detach months before a cutoff so they can be
+archived or dropped without touching the live table:
+
+    python scripts/create_partitions.py --months-ahead 3
+    python scripts/create_partitions.py --detach-before 2024-01
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.partitions import (
+    MONTHLY_PARTITIONED, ensure_partitions, list_partitions,
+    partition_name, detach_partition_sql,
+)
+
+
+async def maintain(months_ahead: int, detach_before: date | None):
+    """Create future partitions and optionally detach old ones."""
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            created = await ensure_partitions(conn, months_ahead=months_ahead)
+            print(f"Partitions present through +{months_ahead} months: {', '.join(created)}")
+
+        if detach_before:
+            for table in MONTHLY_PARTITIONED:
+                async with engine.begin() as conn:
+                    existing = await list_partitions(conn, table)
+                for name in existing:
+                    month = _parse_month(table, name)
+                    if month is None or month >= detach_before:
+                        continue
+                    # Each detach in its own transaction so one failure doesn't undo the rest
+                    async with engine.begin() as conn:
+                        await conn.execute(text(detach_partition_sql(table, month)))
+                    print(f"Detached {name}")
+    finally:
+        await engine.dispose()
+
+
+def _parse_month(table: str, name: str) -> date | None:
+    """Inverse of partition_name; None for the default partition."""
+    suffix = name.removeprefix(f"{table}_")
+    try:
+        month = date(int(suffix[1:5]), int(suffix[6:8]), 1)
+    except ValueError:
+        return None
+    return month if partition_name(table, month) == name else None
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Maintain monthly table partitions")
+    parser.add_argument("--months-ahead", type=int, default=3)
+    parser.add_argument(
+        "--detach-before",
+        type=lambda v: date.fromisoformat(f"{v}-01"),
+        help="Detach partitions for months before YYYY-MM",
+    )
+    args = parser.parse_args()
+    asyncio.run(maintain(args.months_ahead, args.detach_before))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Tests for the training-load analytics rollups."""
+import time
+import uuid
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.services.analytics import (
+    LogColumns, weekly_load, workload_ratio, e1rm_trend, estimate_1rm,
+    session_series, lttb, bucket_max,
+)
+
+
+def _day(d: date) -> int:
+    return (d - date(1970, 1, 1)).days
+
+
+def _columns(day, exercise, reps, weight, muscle_groups=("chest", "back")):
+    return LogColumns(
+        day=np.asarray(day, dtype=np.int64),
+        exercise=np.asarray(exercise, dtype=np.int64),
+        reps=np.asarray(reps, dtype=np.int64),
+        weight=np.asarray(weight, dtype=np.float64),
+        exercise_ids=[uuid.uuid4() for _ in muscle_groups],
+        exercise_names=[f"Exercise {i}" for i in range(len(muscle_groups))],
+        muscle_groups=list(muscle_groups),
+    )
+
+
+def test_estimate_1rm():
+    """Test the Epley estimate and its edge cases."""
+    e1rm = estimate_1rm(np.array([100.0, 100.0, 100.0, 0.0]), np.array([1, 5, 0, 10]))
+
+    assert e1rm.tolist() == pytest.approx([100.0, 116.6667, 0.0, 0.0], rel=1e-4)
+
+
+def test_weekly_load_groups_by_monday_week_and_muscle_group():
+    """Test sets, reps and tonnage roll up per week and muscle group."""
+    monday, sunday, next_monday = date(2024, 1, 1), date(2024, 1, 7), date(2024, 1, 8)
+    cols = _columns(
+        day=[_day(monday), _day(sunday), _day(sunday), _day(next_monday)],
+        exercise=[0, 0, 1, 1],
+        reps=[5, 5, 10, 8],
+        weight=[100, 100, 50, 60],
+    )
+
+    rollup = weekly_load(cols)
+
+    assert rollup["week_start"] == [monday, next_monday]
+    assert rollup["groups"] == ["back", "chest"]
+    assert rollup["sets"].tolist() == [[1, 2], [1, 0]]
+    assert rollup["reps"].tolist() == [[10, 10], [8, 0]]
+    assert rollup["tonnage"].tolist() == [[500, 1000], [480, 0]]
+
+
+def test_workload_ratio_rolling_windows():
+    """Test acute and chronic loads are rolling daily means."""
+    start = _day(date(2024, 1, 1))
+    cols = _columns(
+        day=[start, start + 27],
+        exercise=[0, 0],
+        reps=[10, 10],
+        weight=[28, 28],
+    )
+
+    load = workload_ratio(cols, date(2024, 1, 28))
+
+    assert len(load["ratio"]) == 28
+    assert load["acute"][0] == pytest.approx(40.0)
+    assert load["chronic"][0] == pytest.approx(10.0)
+    assert load["ratio"][0] == pytest.approx(4.0)
+    assert load["acute"][7] == pytest.approx(0.0)
+    assert load["chronic"][27] == pytest.approx(20.0)
+    assert load["ratio"][27] == pytest.approx(2.0)
+
+
+def test_workload_ratio_runs_through_today():
+    """Test days off after the last session count as zero load up to today."""
+    start = _day(date(2024, 1, 1))
+    cols = _columns(day=[start], exercise=[0], reps=[10], weight=[70])
+
+    load = workload_ratio(cols, date(2024, 1, 10))
+
+    assert len(load["ratio"]) == 10
+    assert load["acute"][0] == pytest.approx(100.0)
+    assert load["acute"][9] == pytest.approx(0.0)
+    assert load["chronic"][9] == pytest.approx(25.0)
+    assert load["ratio"][9] == pytest.approx(0.0)
+
+
+def test_e1rm_trend_running_best_is_per_exercise():
+    """Test daily bests and running maxima never leak across exercises."""
+    d = _day(date(2024, 1, 1))
+    cols = _columns(
+        day=[d, d, d + 2, d + 4, d, d + 3],
+        exercise=[0, 0, 0, 0, 1, 1],
+        reps=[1, 5, 1, 1, 1, 1],
+        weight=[100, 90, 95, 110, 200, 150],
+    )
+
+    trend = e1rm_trend(cols)
+
+    assert trend["exercise"].tolist() == [0, 0, 0, 1, 1]
+    assert trend["day"].tolist() == [d, d + 2, d + 4, d, d + 3]
+    assert trend["best"].tolist() == pytest.approx([105.0, 95.0, 110.0, 200.0, 150.0])
+    assert trend["running"].tolist() == pytest.approx([105.0, 105.0, 110.0, 200.0, 200.0])
+
+
+def test_rollups_handle_empty_history():
+    """Test a user without logs gets empty rollups."""
+    cols = _columns([], [], [], [])
+
+    assert weekly_load(cols)["week_start"] == []
+    assert len(workload_ratio(cols, date(2024, 1, 1))["ratio"]) == 0
+    assert len(e1rm_trend(cols)["best"]) == 0
+
+
+def test_session_series_reduces_contiguous_sessions():
+    """Test each session run reduces to its top set, volume and best e1RM."""
+    series = session_series(
+        session=np.array(["a", "a", "b"], dtype=object),
+        started=np.array([10.0, 10.0, 20.0]),
+        reps=np.array([5, 1, 8]),
+        weight=np.array([100.0, 105.0, 0.0]),
+    )
+
+    assert series["started"].tolist() == [10.0, 20.0]
+    assert series["top_weight"].tolist() == [105.0, 0.0]
+    assert series["volume"].tolist() == [605.0, 0.0]
+    assert series["e1rm"].tolist() == pytest.approx([116.6667, 0.0], rel=1e-4)
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """Test LTTB returns exactly n_out ordered points and keeps a lone spike."""
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[500] = 50.0
+
+    kept = lttb(x, y, 20)
+
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert 500 in kept
+    assert lttb(x[:10], y[:10], 20).tolist() == list(range(10))
+
+
+def test_bucket_max_widens_weeks_to_fit():
+    """Test weekly maxima merge into multi-week buckets past n_out weeks."""
+    monday = _day(date(2024, 1, 1))
+    day = np.array([monday, monday + 7, monday + 14, monday + 21, monday + 28])
+    values = {"top_weight": np.array([1.0, 5.0, 2.0, 4.0, 3.0])}
+
+    weekly_days, weekly = bucket_max(day, values, 10)
+    assert weekly["top_weight"].tolist() == [1.0, 5.0, 2.0, 4.0, 3.0]
+
+    days, merged = bucket_max(day, values, 2)
+    assert merged["top_weight"].tolist() == [5.0, 4.0]
+    assert days.tolist() == [monday, monday + 21]
+
+
+def test_series_payload_is_constant_size():
+    """Test ten years of sessions downsample to the requested size quickly."""
+    n = 10 * 365
+    started = np.arange(n, dtype=np.float64) * 86400
+    e1rm = np.random.default_rng(0).uniform(50, 150, n)
+
+    began = time.perf_counter()
+    kept = lttb(started, e1rm, 200)
+    days, _ = bucket_max((started // 86400).astype(np.int64), {"e1rm": e1rm}, 200)
+    elapsed = time.perf_counter() - began
+
+    assert len(kept) == 200
+    assert len(days) <= 200
+    assert elapsed < 0.5
+
+
+def test_rollups_over_five_years_of_daily_logs():
+    """Test five years of daily training aggregates in tens of milliseconds."""
+    rng = np.random.default_rng(0)
+    n = 5 * 365 * 25
+    groups = ["chest", "back", "legs", "shoulders", "arms"]
+    cols = _columns(
+        day=np.sort(rng.integers(0, 5 * 365, n)) + _day(date(2020, 1, 1)),
+        exercise=rng.integers(0, 40, n),
+        reps=rng.integers(1, 15, n),
+        weight=rng.uniform(0, 200, n).round(1),
+        muscle_groups=[groups[i % len(groups)] for i in range(40)],
+    )
+
+    started = time.perf_counter()
+    weekly = weekly_load(cols)
+    workload_ratio(cols, date(2025, 1, 1))
+    e1rm_trend(cols)
+    elapsed = time.perf_counter() - started
+
+    assert weekly["sets"].sum() == n
+    assert elapsed < 0.5
@@ -0,0 +1,343 @@
+"""Tests for the response cache, its backends and its invalidation."""
+import asyncio
+import time
+from datetime import date
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import cache as cache_module
+from app.cache import Cache, MemoryBackend, RedisBackend, ReplyError
+from app.config import settings
+from app.database import make_read_sessionmaker
+from app.repositories.capture import CaptureRepository
+from app.repositories.journal import JournalRepository
+from app.repositories.user import UserRepository
+from app.replicas import ReplicaPool
+from app.responses import type_adapter
+from app.services.auth import AuthService
+from app.services.journal import JournalService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+class StandInRedis:
+    """A local RESP server with the commands the cache uses."""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data: dict[bytes, tuple[float, bytes]] = {}
+        self.commands: list[str] = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        authenticated = self.password is None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                command = args[0].decode().upper()
+                self.commands.append(command)
+                if command == "AUTH":
+                    authenticated = args[1].decode() == self.password
+                    reply = b"+OK\r\n" if authenticated else b"-WRONGPASS invalid password\r\n"
+                elif not authenticated:
+                    reply = b"-NOAUTH Authentication required.\r\n"
+                else:
+                    reply = self._run(command, args[1:])
+                writer.write(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _value(self, key):
+        expires_at, value = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _run(self, command, args):
+        def bulk(value):
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+        if command == "SELECT":
+            return b"+OK\r\n"
+        if command == "GET":
+            return bulk(self._value(args[0]))
+        if command == "MGET":
+            return b"*%d\r\n" % len(args) + b"".join(bulk(self._value(key)) for key in args)
+        if command == "SET":
+            expires_at = time.monotonic() + int(args[3]) / 1000 if len(args) > 3 else None
+            self.data[args[0]] = (expires_at, args[1])
+            return b"+OK\r\n"
+        if command == "INCR":
+            value = int(self._value(args[0]) or 0) + 1
+            self.data[args[0]] = (None, str(value).encode())
+            return b":%d\r\n" % value
+        return b"-ERR unknown command '%s'\r\n" % command.encode()
+
+
+@pytest.fixture
+async def redis_server():
+    server = await StandInRedis(password="hunter2").start()
+    yield server
+    await server.stop()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_and_expired():
+    """Test capacity evicts the coldest entry and expired entries read as misses."""
+    backend = MemoryBackend(max_entries=2)
+    capacity = sample("lifeos_cache_evictions_total", reason="capacity")
+    expired = sample("lifeos_cache_evictions_total", reason="expired")
+
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+    assert await backend.get("a") == b"1"  # b is now the coldest
+    await backend.set("c", b"3", ttl=60)
+    assert await backend.get("b") is None
+    assert sample("lifeos_cache_evictions_total", reason="capacity") == capacity + 1
+
+    await backend.set("d", b"4", ttl=-1)
+    assert await backend.get("d") is None
+    assert sample("lifeos_cache_evictions_total", reason="expired") == expired + 1
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_against_stand_in(redis_server):
+    """Test the RESP client authenticates, pipelines and parses every reply type."""
+    backend = RedisBackend(f"redis://:hunter2@127.0.0.1:{redis_server.port}/2")
+
+    assert await backend.get("missing") is None
+    await backend.set("key", b"\x00binary\r\nvalue", ttl=60)
+    assert await backend.get("key") == b"\x00binary\r\nvalue"
+
+    assert await backend.versions(["t1", "t2"]) == [0, 0]
+    await backend.bump(["t1", "t2"])
+    await backend.bump(["t2"])
+    assert await backend.versions(["t1", "t2"]) == [1, 2]
+
+    await backend.set("short", b"x", ttl=0.001)
+    await asyncio.sleep(0.01)
+    assert await backend.get("short") is None
+
+    with pytest.raises(ReplyError, match="unknown command"):
+        await backend.execute(("FLUSHALL",))
+    assert await backend.get("key") == b"\x00binary\r\nvalue"  # Still in sync
+
+    assert redis_server.commands[:3] == ["AUTH", "SELECT", "GET"]
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_reconnects(redis_server):
+    """Test a dropped connection is reopened on the next command."""
+    backend = RedisBackend(f"redis://:hunter2@127.0.0.1:{redis_server.port}")
+    await backend.set("key", b"value", ttl=60)
+
+    backend._writer.close()  # As if the server had gone away
+    with pytest.raises(Exception):
+        await backend.get("key")
+    assert await backend.get("key") == b"value"
+    assert redis_server.commands.count("AUTH") == 2
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_hits_and_invalidates(redis_server):
+    """Test two workers' caches on one server share entries and tag versions."""
+    url = f"redis://:hunter2@127.0.0.1:{redis_server.port}"
+    worker_a, worker_b = Cache(RedisBackend(url), ttl=60), Cache(RedisBackend(url), ttl=60)
+    adapter = type_adapter(list[int])
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [len(loads)]
+
+    async def read(cache):
+        return await cache.get_or_load("Test.numbers", {"user_id": 1}, ["t", "t:1"], adapter, load)
+
+    hits = sample("lifeos_cache_requests_total", cache="Test.numbers", result="hit")
+    assert await read(worker_a) == [1]
+    assert await read(worker_b) == [1]
+    assert sample("lifeos_cache_requests_total", cache="Test.numbers", result="hit") == hits + 1
+
+    await worker_a.invalidate({"t:1"})
+    assert await read(worker_b) == [2]
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_fall_through():
+    """Test an unreachable server costs a load, not a failed request."""
+    cache = Cache(RedisBackend("redis://127.0.0.1:1", timeout=0.2), ttl=60)
+    errors = sample("lifeos_cache_requests_total", cache="Test.down", result="error")
+
+    async def load():
+        return [1]
+
+    assert await cache.get_or_load("Test.down", {}, ["t"], type_adapter(list[int]), load) == [1]
+    await cache.invalidate({"t"})
+    assert sample("lifeos_cache_requests_total", cache="Test.down", result="error") == errors + 1
+
+
+@pytest.mark.asyncio
+async def test_journal_status_is_cached_until_an_entry_is_written(auth_client, db_session, monkeypatch):
+    """Test a repeat status read skips the database and a new entry invalidates it."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(cache_module, "cache", Cache(MemoryBackend(100), ttl=60))
+
+    first = await auth_client.get("/api/v1/journal/status")
+    repeat = await auth_client.get("/api/v1/journal/status")
+    assert repeat.json() == first.json()
+    assert repeat.headers["X-DB-Queries"] == "1"  # The user lookup
+
+    await auth_client.post("/api/v1/journal/entries", json={
+        "entry_type": "morning_pages",
+        "entry_date": date.today().isoformat(),
+        "content": {"text": "..."},
+    })
+    await db_session.commit()  # As get_db does; the test override leaves it open
+    response = await auth_client.get("/api/v1/journal/status")
+    assert response.json()["morning_pages_streak"] == 1
+    assert response.json()["entries_this_week"] == first.json()["entries_this_week"] + 1
+
+
+@pytest.mark.asyncio
+async def test_project_list_and_summary_follow_writes(auth_client, db_session, monkeypatch):
+    """Test bulk statements (task reorder) and flushes both invalidate."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(cache_module, "cache", Cache(MemoryBackend(100), ttl=60))
+    project = (await auth_client.post("/api/v1/projects", json={"name": "Garden", "slug": "garden"})).json()
+    task_ids = [
+        (await auth_client.post(f"/api/v1/projects/{project['id']}/tasks", json={"title": f"Task {n}"})).json()["id"]
+        for n in range(3)
+    ]
+
+    await auth_client.get("/api/v1/projects")
+    repeat = await auth_client.get("/api/v1/projects")
+    assert repeat.headers["X-DB-Queries"] == "2"  # The user lookup and the ETag
+
+    await auth_client.post(
+        f"/api/v1/projects/{project['id']}/tasks/reorder",
+        json={"status": "backlog", "task_order": task_ids[::-1]},
+    )
+    await db_session.commit()
+    tasks = (await auth_client.get("/api/v1/projects")).json()[0]["tasks"]["backlog"]
+    assert [task["id"] for task in sorted(tasks, key=lambda task: task["sort_order"])] == task_ids[::-1]
+
+    assert (await auth_client.get("/api/v1/workouts/summary")).json()["has_active_session"] is False
+    await auth_client.post("/api/v1/workouts/sessions", json={})
+    await db_session.commit()
+    assert (await auth_client.get("/api/v1/workouts/summary")).json()["has_active_session"] is True
+
+
+class RecordingBackend(MemoryBackend):
+    """A memory backend that keeps every bump it is sent."""
+
+    def __init__(self):
+        super().__init__(max_entries=100)
+        self.bumps: list[list[str]] = []
+
+    async def bump(self, tags):
+        self.bumps.append(list(tags))
+        await super().bump(tags)
+
+
+@pytest.mark.asyncio
+async def test_tags_are_bumped_around_the_commit_only(db_session, test_user, monkeypatch):
+    """Test writes reach the backend once before and once after the commit, for cached tables only."""
+    backend = RecordingBackend()
+    monkeypatch.setattr(cache_module, "cache", Cache(backend, ttl=60))
+    db_session.info["user_id"] = test_user.id
+
+    await JournalRepository(db_session).create(
+        user_id=test_user.id, entry_type="morning_pages", entry_date=date.today(), content={"text": "..."},
+    )
+    await CaptureRepository(db_session).create(user_id=test_user.id, text="Not cached anywhere")
+    assert backend.bumps == []
+
+    await db_session.commit()
+    tag = f"{cache_module.PREFIX}:tag:journal_entries:{test_user.id}"
+    assert backend.bumps == [[tag], [tag]]
+
+
+@pytest.mark.asyncio
+async def test_replica_loads_are_served_but_not_stored(engine, test_user, monkeypatch):
+    """Test a result read on a replica never reaches a later primary read."""
+    backend = MemoryBackend(100)
+    monkeypatch.setattr(cache_module, "cache", Cache(backend, ttl=60))
+    # The test database stands in for the replica; only the binding matters
+    replicas = ReplicaPool([create_async_engine(engine.url, poolclass=NullPool)], max_lag_seconds=5.0)
+    replicas.replicas[0].healthy = True
+    factory = make_read_sessionmaker(engine)
+    name = "JournalService._journal_status"
+
+    async def status(prefer_primary):
+        async with replicas.read_session(factory, prefer_primary) as session:
+            return await JournalService(JournalRepository(session)).get_journal_status(test_user.id)
+
+    misses = sample("lifeos_cache_requests_total", cache=name, result="miss")
+    hits = sample("lifeos_cache_requests_total", cache=name, result="hit")
+
+    await status(prefer_primary=False)
+    assert not backend._entries
+
+    await status(prefer_primary=True)
+    assert sample("lifeos_cache_requests_total", cache=name, result="miss") == misses + 2
+    assert len(backend._entries) == 1
+
+    await status(prefer_primary=False)  # Entries loaded on the primary are fine to serve
+    assert sample("lifeos_cache_requests_total", cache=name, result="hit") == hits + 1
+    await replicas.dispose()
@@ -0,0 +1,149 @@
+"""Tests for ETags and conditional GETs on list endpoints."""
+import pytest
+
+from app.config import settings
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+async def assert_revalidates(client, url, params=None):
+    """GET url twice; the second, conditional, GET must be a 304. Returns the ETag."""
+    first = await client.get(url, params=params)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = await client.get(url, params=params, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    return etag
+
+
+@pytest.mark.asyncio
+async def test_not_modified_skips_loading(auth_client, monkeypatch):
+    """Test a 304 costs the user lookup and one aggregate query."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    for n in range(3):
+        await auth_client.post("/api/v1/captures", json={"text": f"Capture {n}"})
+
+    etag = await assert_revalidates(auth_client, "/api/v1/captures")
+    cached = await auth_client.get("/api/v1/captures", headers={"If-None-Match": etag})
+
+    assert cached.headers["X-DB-Queries"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_captures_etag_follows_writes(auth_client):
+    """Test the ETag follows the list through adds, updates and deletes."""
+    url = "/api/v1/captures"
+    seen = [await assert_revalidates(auth_client, url)]
+
+    capture = (await auth_client.post(url, json={"text": "Buy milk"})).json()
+    seen.append(await assert_revalidates(auth_client, url))
+
+    await auth_client.patch(f"{url}/{capture['id']}", json={"processed": True})
+    seen.append(await assert_revalidates(auth_client, url))
+
+    assert len(set(seen)) == 3
+
+    # Back to the empty list, and its tag
+    await auth_client.delete(f"{url}/{capture['id']}")
+    assert await assert_revalidates(auth_client, url) == seen[0]
+
+    # Filters are part of the tag
+    assert await assert_revalidates(auth_client, url, {"include_processed": False}) not in seen
+
+
+@pytest.mark.asyncio
+async def test_projects_etag_covers_tasks_and_notes(auth_client):
+    """Test task and note changes change the project list's ETag."""
+    url = "/api/v1/projects"
+    project = (await auth_client.post(url, json={"name": "Garden", "slug": "garden"})).json()
+    seen = [await assert_revalidates(auth_client, url)]
+
+    task = (await auth_client.post(f"{url}/{project['id']}/tasks", json={"title": "Dig"})).json()
+    seen.append(await assert_revalidates(auth_client, url))
+
+    await auth_client.patch(f"{url}/tasks/{task['id']}", json={"title": "Dig deeper"})
+    seen.append(await assert_revalidates(auth_client, url))
+
+    await auth_client.post(f"{url}/{project['id']}/notes", json={"content": "Buy seeds"})
+    seen.append(await assert_revalidates(auth_client, url))
+
+    await auth_client.delete(f"{url}/tasks/{task['id']}")
+    seen.append(await assert_revalidates(auth_client, url))
+
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_programs_etag_covers_program_exercises(auth_client):
+    """Test adding an exercise to a program changes the program list's ETag."""
+    url = "/api/v1/programs"
+    program = (await auth_client.post(url, json={"name": "Push / Pull"})).json()
+    exercise = (await auth_client.post("/api/v1/exercises", json={"name": "Bench Press"})).json()
+    before = await assert_revalidates(auth_client, url)
+
+    await auth_client.post(
+        f"{url}/{program['id']}/exercises",
+        json={"exercise_id": exercise["id"], "day_label": "A"},
+    )
+
+    after = await assert_revalidates(auth_client, url)
+    assert after != before
+    assert (await auth_client.get(url)).json()["items"][0]["exercise_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_journal_and_calendar_etags(auth_client):
+    """Test journal and calendar lists revalidate and change on writes in range."""
+    journal_url, journal_params = "/api/v1/journal/entries", {"start_date": "2026-01-01", "end_date": "2026-01-31"}
+    calendar_url, calendar_params = "/api/v1/calendar/events", {"start_date": "2026-01-01", "end_date": "2026-01-31"}
+    journal_before = await assert_revalidates(auth_client, journal_url, journal_params)
+    calendar_before = await assert_revalidates(auth_client, calendar_url, calendar_params)
+
+    await auth_client.post(journal_url, json={
+        "entry_type": "morning_pages", "entry_date": "2026-01-10", "content": {"text": "..."},
+    })
+    event = (await auth_client.post(calendar_url, json={
+        "title": "Dentist", "event_date": "2026-01-12", "start_time": "09:00:00", "end_time": "10:00:00",
+    })).json()
+
+    assert await assert_revalidates(auth_client, journal_url, journal_params) != journal_before
+    calendar_after = await assert_revalidates(auth_client, calendar_url, calendar_params)
+    assert calendar_after != calendar_before
+
+    # Moving the event out of the range brings back the empty range's tag
+    await auth_client.patch(f"{calendar_url}/{event['id']}", json={"event_date": "2026-02-12"})
+    assert await assert_revalidates(auth_client, calendar_url, calendar_params) == calendar_before
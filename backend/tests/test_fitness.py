@@ -0,0 +1,831 @@
+"""Tests for fitness functionality."""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.models.fitness import WorkoutSession
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+async def program(auth_client):
+    """Create an active program with two exercises on day A."""
+    exercise_ids = []
+    for name, muscle_group in [("Bench Press", "chest"), ("Barbell Row", "back")]:
+        response = await auth_client.post(
+            "/api/v1/exercises",
+            json={"name": name, "muscle_group": muscle_group}
+        )
+        assert response.status_code == 201
+        exercise_ids.append(response.json()["id"])
+
+    response = await auth_client.post(
+        "/api/v1/programs",
+        json={"name": "Upper / Lower", "is_active": True}
+    )
+    assert response.status_code == 201
+    program = response.json()
+
+    entries = []
+    for idx, exercise_id in enumerate(exercise_ids):
+        response = await auth_client.post(
+            f"/api/v1/programs/{program['id']}/exercises",
+            json={"exercise_id": exercise_id, "day_label": "A", "sort_order": idx}
+        )
+        assert response.status_code == 201
+        entries.append(response.json())
+
+    program["entries"] = entries
+    program["exercise_ids"] = exercise_ids
+    return program
+
+
+# Program Exercise Reorder Tests
+
+@pytest.mark.asyncio
+async def test_reorder_program_exercises(auth_client, program):
+    """Test reordering applies the new order in one call."""
+    first, second = program["entries"]
+
+    response = await auth_client.put(
+        f"/api/v1/programs/{program['id']}/exercises/reorder",
+        json={"day_label": "A", "exercise_order": [second["id"], first["id"]]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated_count"] == 2
+    assert data["mismatched_ids"] == []
+
+    detail = await auth_client.get(f"/api/v1/programs/{program['id']}")
+    day = detail.json()["days"]["A"]
+    assert [e["id"] for e in day] == [second["id"], first["id"]]
+
+
+@pytest.mark.asyncio
+async def test_reorder_reports_mismatched_ids(auth_client, program):
+    """Test IDs outside the program/day are reported, not silently skipped."""
+    first, second = program["entries"]
+    stranger = "00000000-0000-0000-0000-000000000000"
+
+    response = await auth_client.put(
+        f"/api/v1/programs/{program['id']}/exercises/reorder",
+        json={"day_label": "A", "exercise_order": [second["id"], stranger, first["id"]]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated_count"] == 2
+    assert data["mismatched_ids"] == [stranger]
+
+
+@pytest.mark.asyncio
+async def test_reorder_wrong_day_label(auth_client, program):
+    """Test entries from another day are reported as mismatched."""
+    first, _ = program["entries"]
+
+    response = await auth_client.put(
+        f"/api/v1/programs/{program['id']}/exercises/reorder",
+        json={"day_label": "B", "exercise_order": [first["id"]]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["mismatched_ids"] == [first["id"]]
+
+
+# History Tests
+
+async def _complete_workout(auth_client, program, sets):
+    """Start a session on day A, log (exercise index, set, reps, weight) sets, complete it."""
+    response = await auth_client.post(
+        "/api/v1/workouts/sessions",
+        json={"program_id": program["id"], "day_label": "A"}
+    )
+    assert response.status_code == 201
+    session_id = response.json()["id"]
+
+    for exercise_idx, set_number, reps, weight in sets:
+        response = await auth_client.post(
+            f"/api/v1/workouts/sessions/{session_id}/logs",
+            json={
+                "exercise_id": program["exercise_ids"][exercise_idx],
+                "set_number": set_number,
+                "reps": reps,
+                "weight_kg": weight,
+            }
+        )
+        assert response.status_code == 201
+
+    response = await auth_client.patch(
+        f"/api/v1/workouts/sessions/{session_id}/complete",
+        json={}
+    )
+    assert response.status_code == 200
+    return session_id
+
+
+@pytest.mark.asyncio
+async def test_history_aggregates(auth_client, program):
+    """Test history items carry per-session set, rep and tonnage totals."""
+    await _complete_workout(auth_client, program, [
+        (0, 1, 10, "60"),
+        (0, 2, 8, "60"),
+        (1, 1, 12, "50"),
+    ])
+
+    response = await auth_client.get("/api/v1/workouts/history")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    item = data["items"][0]
+    assert item["program_name"] == "Upper / Lower"
+    assert item["exercise_count"] == 2
+    assert item["set_count"] == 3
+    assert item["total_reps"] == 30
+    assert float(item["tonnage_kg"]) == 10 * 60 + 8 * 60 + 12 * 50
+
+
+@pytest.mark.asyncio
+async def test_history_keyset_pagination(auth_client, program):
+    """Test next_cursor walks the history without overlap."""
+    first = await _complete_workout(auth_client, program, [(0, 1, 5, "100")])
+    second = await _complete_workout(auth_client, program, [])
+
+    page_one = await auth_client.get("/api/v1/workouts/history?per_page=1")
+    data = page_one.json()
+    assert [i["id"] for i in data["items"]] == [second]
+    assert data["items"][0]["set_count"] == 0
+    assert data["next_cursor"] is not None
+
+    page_two = await auth_client.get(
+        "/api/v1/workouts/history",
+        params={"per_page": 1, "before": data["next_cursor"], "before_id": data["next_cursor_id"]}
+    )
+    assert [i["id"] for i in page_two.json()["items"]] == [first]
+
+
+@pytest.mark.asyncio
+async def test_history_cursor_breaks_start_time_ties(auth_client, program, db_session):
+    """Test sessions sharing a start time across a page boundary are all returned once."""
+    ids = [await _complete_workout(auth_client, program, []) for _ in range(3)]
+    await db_session.execute(
+        update(WorkoutSession).values(started_at=datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc))
+    )
+
+    seen, params = [], {"per_page": 2}
+    while True:
+        data = (await auth_client.get("/api/v1/workouts/history", params=params)).json()
+        seen += [i["id"] for i in data["items"]]
+        if data["next_cursor"] is None:
+            break
+        params = {"per_page": 2, "before": data["next_cursor"], "before_id": data["next_cursor_id"]}
+
+    assert sorted(seen) == sorted(ids)
+    assert seen == sorted(ids, reverse=True)
+
+
+# Personal Record Tests
+
+@pytest.mark.asyncio
+async def test_personal_records_track_logged_sets(auth_client, program):
+    """Test each logged set updates the per-weight records and bests."""
+    await _complete_workout(auth_client, program, [
+        (0, 1, 8, "60"),
+        (0, 2, 5, "80"),
+        (0, 3, 6, "60"),
+    ])
+    await _complete_workout(auth_client, program, [
+        (0, 1, 10, "60"),
+        (0, 2, 4, "80"),
+    ])
+
+    bench_id = program["exercise_ids"][0]
+    response = await auth_client.get(f"/api/v1/exercises/{bench_id}/records")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(r["weight_kg"], r["reps"]) for r in data["reps_at_weight"]] == [
+        ("60.00", 10),
+        ("80.00", 5),
+    ]
+    assert data["best_weight"]["weight_kg"] == "80.00"
+    assert data["best_e1rm"]["e1rm_kg"] == "93.33"
+
+
+@pytest.mark.asyncio
+async def test_personal_record_history(auth_client, program):
+    """Test only sets that beat a previous record are recorded."""
+    await _complete_workout(auth_client, program, [
+        (0, 1, 5, "100"),
+        (0, 2, 5, "100"),
+        (0, 3, 6, "100"),
+    ])
+
+    bench_id = program["exercise_ids"][0]
+    response = await auth_client.get(f"/api/v1/exercises/{bench_id}/records/history")
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert sorted((i["record_type"], i["reps"]) for i in items) == [
+        ("e1rm", 5), ("e1rm", 6), ("reps", 6), ("weight", 5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_personal_records_unknown_exercise(auth_client):
+    """Test records for an unknown exercise return 404."""
+    response = await auth_client.get(
+        "/api/v1/exercises/00000000-0000-0000-0000-000000000000/records"
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_exercise_series(auth_client, program):
+    """Test per-session top set, volume and e1RM for one exercise."""
+    await _complete_workout(auth_client, program, [(0, 1, 5, "100"), (0, 2, 3, "110"), (1, 1, 8, "60")])
+    await _complete_workout(auth_client, program, [(0, 1, 1, "120")])
+    bench_id = program["exercise_ids"][0]
+
+    response = await auth_client.get(f"/api/v1/exercises/{bench_id}/series")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["exercise_name"] == "Bench Press"
+    assert data["total_sessions"] == 2
+    assert [(p["top_weight_kg"], p["volume_kg"], p["e1rm_kg"]) for p in data["points"]] == [
+        (110.0, 830.0, 121.0), (120.0, 120.0, 120.0),
+    ]
+
+    weekly = await auth_client.get(f"/api/v1/exercises/{bench_id}/series?method=weekly_max")
+    assert weekly.json()["metric"] is None
+    assert [p["top_weight_kg"] for p in weekly.json()["points"]] == [120.0]
+
+
+@pytest.mark.asyncio
+async def test_exercise_series_unknown_exercise(auth_client):
+    """Test the series for an unknown exercise returns 404."""
+    response = await auth_client.get(
+        "/api/v1/exercises/00000000-0000-0000-0000-000000000000/series"
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_backfill_personal_records(auth_client, program, db_session, test_user):
+    """Test the backfill rebuilds the same records from the logs."""
+    from app.repositories.fitness import FitnessRepository
+    from app.services.fitness import FitnessService
+
+    await _complete_workout(auth_client, program, [
+        (0, 1, 8, "60"),
+        (0, 2, 5, "80"),
+        (1, 1, 12, None),
+    ])
+    bench_id = program["exercise_ids"][0]
+    before = (await auth_client.get(f"/api/v1/exercises/{bench_id}/records")).json()
+
+    service = FitnessService(FitnessRepository(db_session))
+    count = await service.backfill_personal_records(test_user.id)
+    await db_session.commit()
+
+    assert count == 3
+    after = (await auth_client.get(f"/api/v1/exercises/{bench_id}/records")).json()
+    assert after == before
+
+
+@pytest.mark.asyncio
+async def test_cancelled_session_sets_are_not_records(auth_client, program, db_session, test_user):
+    """Test cancelling a session drops the records its sets set, and backfills agree."""
+    from app.repositories.fitness import FitnessRepository
+    from app.services.fitness import FitnessService
+
+    await _complete_workout(auth_client, program, [(0, 1, 5, "100")])
+    bench_id = program["exercise_ids"][0]
+    url = f"/api/v1/exercises/{bench_id}/records"
+    before = (await auth_client.get(url)).json()
+
+    session_id = await _start_session(auth_client, program)
+    await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs",
+        json={"exercise_id": bench_id, "set_number": 1, "reps": 5, "weight_kg": "120"}
+    )
+    assert (await auth_client.get(url)).json()["best_weight"]["weight_kg"] == "120.00"
+
+    await auth_client.patch(f"/api/v1/workouts/sessions/{session_id}/cancel")
+    assert (await auth_client.get(url)).json() == before
+    history = (await auth_client.get(f"{url}/history")).json()["items"]
+    assert {item["weight_kg"] for item in history} == {"100.00"}
+
+    await FitnessService(FitnessRepository(db_session)).backfill_personal_records(test_user.id)
+    assert (await auth_client.get(url)).json() == before
+
+
+@pytest.mark.asyncio
+async def test_batch_correction_lowers_records(auth_client, program):
+    """Test correcting a set down replaces the record it had set."""
+    session_id = await _start_session(auth_client, program)
+    bench_id = program["exercise_ids"][0]
+    batch_url = f"/api/v1/workouts/sessions/{session_id}/logs/batch"
+    await auth_client.post(batch_url, json={"logs": [
+        {"exercise_id": bench_id, "set_number": 1, "reps": 5, "weight_kg": "120"},
+    ]})
+
+    await auth_client.post(batch_url, json={"logs": [
+        {"exercise_id": bench_id, "set_number": 1, "reps": 5, "weight_kg": "100"},
+    ]})
+
+    records = (await auth_client.get(f"/api/v1/exercises/{bench_id}/records")).json()
+    assert [(r["weight_kg"], r["reps"]) for r in records["reps_at_weight"]] == [("100.00", 5)]
+    assert records["best_e1rm"]["e1rm_kg"] == "116.67"
+
+
+# Analytics Tests
+
+@pytest.mark.asyncio
+async def test_weekly_analytics(auth_client, program):
+    """Test the weekly rollup reads the columnar log query."""
+    await _complete_workout(auth_client, program, [
+        (0, 1, 5, "100"),
+        (0, 2, 5, "100"),
+        (1, 1, 10, "50"),
+    ])
+
+    response = await auth_client.get("/api/v1/workouts/analytics/weekly")
+
+    assert response.status_code == 200
+    weeks = response.json()["weeks"]
+    assert len(weeks) == 1
+    assert weeks[0]["sets"] == 3
+    assert weeks[0]["reps"] == 20
+    assert weeks[0]["tonnage_kg"] == 1500.0
+    assert {g["muscle_group"]: g["sets"] for g in weeks[0]["muscle_groups"]} == {
+        "chest": 2, "back": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_workload_and_e1rm_analytics(auth_client, program):
+    """Test workload and e1RM trend endpoints."""
+    await _complete_workout(auth_client, program, [(0, 1, 1, "120")])
+
+    workload = await auth_client.get("/api/v1/workouts/analytics/workload")
+    assert workload.status_code == 200
+    assert workload.json()["current_ratio"] == 4.0
+
+    bench_id = program["exercise_ids"][0]
+    trend = await auth_client.get(f"/api/v1/workouts/analytics/e1rm?exercise_id={bench_id}")
+    assert trend.status_code == 200
+    exercises = trend.json()["exercises"]
+    assert [e["exercise_name"] for e in exercises] == ["Bench Press"]
+    assert exercises[0]["points"][0]["best_e1rm_kg"] == 120.0
+
+
+@pytest.mark.asyncio
+async def test_analytics_without_logs(auth_client):
+    """Test analytics for a user with no workouts are empty."""
+    weekly = await auth_client.get("/api/v1/workouts/analytics/weekly")
+    workload = await auth_client.get("/api/v1/workouts/analytics/workload")
+
+    assert weekly.json()["weeks"] == []
+    assert workload.json()["points"] == []
+    assert workload.json()["current_ratio"] is None
+
+
+# Set Logging Tests
+
+async def _start_session(auth_client, program):
+    response = await auth_client.post(
+        "/api/v1/workouts/sessions",
+        json={"program_id": program["id"], "day_label": "A"}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_log_set_after_complete_is_rejected(auth_client, program):
+    """Test completing a session stops further sets being logged."""
+    session_id = await _start_session(auth_client, program)
+    log = {"exercise_id": program["exercise_ids"][0], "set_number": 1, "reps": 5, "weight_kg": "60"}
+
+    response = await auth_client.post(f"/api/v1/workouts/sessions/{session_id}/logs", json=log)
+    assert response.status_code == 201
+    assert response.json()["weight_kg"] == "60.00"
+
+    await auth_client.patch(f"/api/v1/workouts/sessions/{session_id}/complete", json={})
+
+    response = await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs", json={**log, "set_number": 2}
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_log_set_session_finished_elsewhere(auth_client, program, db_session):
+    """Test a session cancelled behind this worker's cache rejects the set."""
+    from sqlalchemy import update
+    from app.models.fitness import WorkoutSession
+
+    session_id = await _start_session(auth_client, program)
+    await db_session.execute(
+        update(WorkoutSession)
+        .where(WorkoutSession.id == session_id)
+        .values(status="cancelled")
+    )
+    await db_session.commit()
+
+    response = await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs",
+        json={"exercise_id": program["exercise_ids"][0], "set_number": 1, "reps": 5}
+    )
+
+    assert response.status_code == 409
+    active = await auth_client.get("/api/v1/workouts/sessions/active")
+    assert active.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_log_set_unknown_session(auth_client, program):
+    """Test logging against a session that does not exist returns 404."""
+    response = await auth_client.post(
+        "/api/v1/workouts/sessions/00000000-0000-0000-0000-000000000000/logs",
+        json={"exercise_id": program["exercise_ids"][0], "set_number": 1, "reps": 5}
+    )
+
+    assert response.status_code == 404
+
+
+# Batch Logging Tests
+
+@pytest.mark.asyncio
+async def test_log_sets_batch(auth_client, program):
+    """Test a queued batch is written in one request."""
+    session_id = await _start_session(auth_client, program)
+    bench, row = program["exercise_ids"]
+
+    response = await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs/batch",
+        json={"logs": [
+            {"exercise_id": bench, "set_number": 1, "reps": 8, "weight_kg": "60"},
+            {"exercise_id": bench, "set_number": 2, "reps": 7, "weight_kg": "60"},
+            {"exercise_id": row, "set_number": 1, "reps": 10},
+        ]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["written"]) == 3
+    assert data["unchanged_count"] == 0
+
+    active = await auth_client.get("/api/v1/workouts/sessions/active")
+    assert len(active.json()["logs"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_log_sets_batch_replay_is_idempotent(auth_client, program):
+    """Test replaying a batch writes nothing and corrections update in place."""
+    session_id = await _start_session(auth_client, program)
+    bench = program["exercise_ids"][0]
+    batch = {"logs": [
+        {"exercise_id": bench, "set_number": 1, "reps": 8, "weight_kg": "60"},
+        {"exercise_id": bench, "set_number": 2, "reps": 7, "weight_kg": "60"},
+    ]}
+    url = f"/api/v1/workouts/sessions/{session_id}/logs/batch"
+    await auth_client.post(url, json=batch)
+
+    replay = await auth_client.post(url, json=batch)
+    assert replay.status_code == 200
+    assert replay.json() == {"written": [], "unchanged_count": 2}
+
+    batch["logs"][1]["reps"] = 6
+    batch["logs"].append({"exercise_id": bench, "set_number": 2, "reps": 5, "weight_kg": "60"})
+    corrected = await auth_client.post(url, json=batch)
+    assert corrected.status_code == 200
+    assert [(l["set_number"], l["reps"]) for l in corrected.json()["written"]] == [(2, 5)]
+    assert corrected.json()["unchanged_count"] == 1
+
+    active = await auth_client.get("/api/v1/workouts/sessions/active")
+    assert sorted((l["set_number"], l["reps"]) for l in active.json()["logs"]) == [(1, 8), (2, 5)]
+
+
+@pytest.mark.asyncio
+async def test_log_sets_batch_after_complete(auth_client, program):
+    """Test a batch for a finished session is rejected."""
+    session_id = await _start_session(auth_client, program)
+    await auth_client.patch(f"/api/v1/workouts/sessions/{session_id}/complete", json={})
+
+    response = await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs/batch",
+        json={"logs": [{"exercise_id": program["exercise_ids"][0], "set_number": 1, "reps": 5}]}
+    )
+
+    assert response.status_code == 409
+
+
+# Last Performance Tests
+
+@pytest.mark.asyncio
+async def test_session_exercises_include_last_performance(auth_client, program):
+    """Test a new session shows the sets from the last completed session."""
+    await _complete_workout(auth_client, program, [(0, 1, 5, "80"), (0, 2, 5, "80")])
+    await _complete_workout(auth_client, program, [(0, 1, 6, "80"), (0, 2, 4, "85")])
+
+    response = await auth_client.post(
+        "/api/v1/workouts/sessions",
+        json={"program_id": program["id"], "day_label": "A"}
+    )
+
+    assert response.status_code == 201
+    bench, row = response.json()["exercises"]
+    assert [(s["set_number"], s["reps"], s["weight_kg"]) for s in bench["last_performance"]["sets"]] == [
+        (1, 6, "80.00"),
+        (2, 4, "85.00"),
+    ]
+    assert row["last_performance"] is None
+
+    active = await auth_client.get("/api/v1/workouts/sessions/active")
+    assert active.json()["exercises"][0]["last_performance"] == bench["last_performance"]
+
+
+@pytest.mark.asyncio
+async def test_last_performance_ignores_cancelled_sessions(auth_client, program):
+    """Test sets from a cancelled session are not offered as last performance."""
+    session_id = await _start_session(auth_client, program)
+    await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs",
+        json={"exercise_id": program["exercise_ids"][0], "set_number": 1, "reps": 3, "weight_kg": "100"}
+    )
+    await auth_client.patch(f"/api/v1/workouts/sessions/{session_id}/cancel")
+
+    response = await auth_client.post(
+        "/api/v1/workouts/sessions",
+        json={"program_id": program["id"], "day_label": "A"}
+    )
+
+    assert response.json()["exercises"][0]["last_performance"] is None
+
+
+# Summary Tests
+
+@pytest.mark.asyncio
+async def test_fitness_summary(auth_client, db_session, program):
+    """Test the summary reports the program, next day and this week's workouts."""
+    entry = await auth_client.post(
+        f"/api/v1/programs/{program['id']}/exercises",
+        json={"exercise_id": program["exercise_ids"][0], "day_label": "B", "sort_order": 5}
+    )
+    assert entry.status_code == 201
+    await _complete_workout(auth_client, program, [(0, 1, 5, "80")])
+
+    response = await auth_client.get("/api/v1/workouts/summary")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["active_program_id"] == program["id"]
+    assert data["active_program_name"] == "Upper / Lower"
+    assert data["next_day_label"] == "B"
+    assert len(data["workouts_this_week"]) == 1
+    assert data["has_active_session"] is False
+
+    await _start_session(auth_client, program)
+    await db_session.commit()  # As get_db does; cached reads follow commits
+    response = await auth_client.get("/api/v1/workouts/summary")
+    assert response.json()["has_active_session"] is True
+
+
+@pytest.mark.asyncio
+async def test_fitness_summary_without_program(auth_client):
+    """Test the summary for a user with no program or workouts."""
+    response = await auth_client.get("/api/v1/workouts/summary")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "active_program_name": None,
+        "active_program_id": None,
+        "next_day_label": None,
+        "workouts_this_week": [],
+        "has_active_session": False,
+    }
+
+
+# Exercise Search Tests
+
+@pytest.mark.asyncio
+async def test_search_exercises_ranks_and_tolerates_typos(auth_client, program):
+    """Test search matches substrings and near misses, best match first."""
+    await auth_client.post("/api/v1/exercises", json={"name": "Incline Bench Press"})
+
+    response = await auth_client.get("/api/v1/exercises?search=bench")
+    assert [e["name"] for e in response.json()["items"]] == [
+        "Bench Press", "Incline Bench Press",
+    ]
+
+    response = await auth_client.get("/api/v1/exercises?search=barbel%20rwo")
+    assert [e["name"] for e in response.json()["items"]] == ["Barbell Row"]
+
+
+@pytest.mark.asyncio
+async def test_search_exercises_escapes_wildcards(auth_client, program):
+    """Test LIKE wildcards in the search term are matched literally."""
+    response = await auth_client.get("/api/v1/exercises?search=%25")
+
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_exercises(auth_client, program):
+    """Test autocomplete matches name and word prefixes, name prefixes first."""
+    await auth_client.post("/api/v1/exercises", json={"name": "Bent-over Row"})
+
+    response = await auth_client.get("/api/v1/exercises/autocomplete?q=b")
+    assert response.status_code == 200
+    assert [e["name"] for e in response.json()["items"]] == [
+        "Barbell Row", "Bench Press", "Bent-over Row",
+    ]
+
+    response = await auth_client.get("/api/v1/exercises/autocomplete?q=ROW")
+    assert [e["name"] for e in response.json()["items"]] == ["Barbell Row", "Bent-over Row"]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_sees_exercise_changes(auth_client, program):
+    """Test create, rename and delete invalidate the prefix index."""
+    url = "/api/v1/exercises/autocomplete?q=squ"
+    assert (await auth_client.get(url)).json()["items"] == []
+
+    created = await auth_client.post("/api/v1/exercises", json={"name": "Squat"})
+    assert [e["name"] for e in (await auth_client.get(url)).json()["items"]] == ["Squat"]
+
+    exercise_id = created.json()["id"]
+    await auth_client.patch(f"/api/v1/exercises/{exercise_id}", json={"name": "Front Squat"})
+    assert [e["name"] for e in (await auth_client.get(url)).json()["items"]] == ["Front Squat"]
+
+    await auth_client.delete(f"/api/v1/exercises/{exercise_id}")
+    assert (await auth_client.get(url)).json()["items"] == []
+
+
+# Program Detail Cache Tests
+
+@pytest.mark.asyncio
+async def test_program_detail_etag(auth_client, program):
+    """Test a matching If-None-Match gets 304 until the program changes."""
+    url = f"/api/v1/programs/{program['id']}"
+    first = await auth_client.get(url)
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert [e["exercise"]["name"] for e in first.json()["days"]["A"]] == [
+        "Bench Press", "Barbell Row",
+    ]
+
+    cached = await auth_client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    repeat = await auth_client.get(url)
+    assert repeat.json() == first.json()
+    assert repeat.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_program_detail_invalidated_by_writes(auth_client, program):
+    """Test program, entry and exercise edits each change the ETag and body."""
+    url = f"/api/v1/programs/{program['id']}"
+    seen = {(await auth_client.get(url)).headers["etag"]}
+    first, second = program["entries"]
+
+    await auth_client.patch(url, json={"name": "Push / Pull"})
+    response = await auth_client.get(url)
+    assert response.json()["name"] == "Push / Pull"
+    seen.add(response.headers["etag"])
+
+    await auth_client.patch(f"{url}/exercises/{first['id']}", json={"target_sets": 5})
+    response = await auth_client.get(url)
+    assert response.json()["days"]["A"][0]["target_sets"] == 5
+    seen.add(response.headers["etag"])
+
+    await auth_client.patch(
+        f"/api/v1/exercises/{program['exercise_ids'][1]}", json={"name": "Pendlay Row"}
+    )
+    response = await auth_client.get(url)
+    assert response.json()["days"]["A"][1]["exercise"]["name"] == "Pendlay Row"
+    seen.add(response.headers["etag"])
+
+    await auth_client.put(
+        f"{url}/exercises/reorder",
+        json={"day_label": "A", "exercise_order": [second["id"], first["id"]]}
+    )
+    response = await auth_client.get(url)
+    assert [e["id"] for e in response.json()["days"]["A"]] == [second["id"], first["id"]]
+    seen.add(response.headers["etag"])
+
+    assert len(seen) == 5
+
+
+@pytest.mark.asyncio
+async def test_program_detail_not_found(auth_client):
+    """Test an unknown program returns 404."""
+    response = await auth_client.get("/api/v1/programs/00000000-0000-0000-0000-000000000000")
+
+    assert response.status_code == 404
+
+
+# Exercise Library Tests
+
+@pytest.mark.asyncio
+async def test_list_exercises_with_usage(auth_client, program):
+    """Test usage counts come back with the list when asked for."""
+    await auth_client.post("/api/v1/exercises", json={"name": "Squat"})
+    other = await auth_client.post("/api/v1/programs", json={"name": "Other"})
+    await auth_client.post(
+        f"/api/v1/programs/{other.json()['id']}/exercises",
+        json={"exercise_id": program["exercise_ids"][0], "day_label": "A"}
+    )
+
+    response = await auth_client.get("/api/v1/exercises?include_usage=true")
+    assert response.status_code == 200
+    assert {e["name"]: e["usage_count"] for e in response.json()["items"]} == {
+        "Barbell Row": 1, "Bench Press": 2, "Squat": 0,
+    }
+
+    plain = await auth_client.get("/api/v1/exercises")
+    assert all(e["usage_count"] is None for e in plain.json()["items"])
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_exercises(auth_client, program):
+    """Test unused exercises are deleted together."""
+    ids = []
+    for name in ["Squat", "Deadlift"]:
+        response = await auth_client.post("/api/v1/exercises", json={"name": name})
+        ids.append(response.json()["id"])
+
+    response = await auth_client.post("/api/v1/exercises/bulk-delete", json={"exercise_ids": ids})
+
+    assert response.status_code == 200
+    assert response.json()["deleted_count"] == 2
+    remaining = await auth_client.get("/api/v1/exercises")
+    assert {e["name"] for e in remaining.json()["items"]} == {"Bench Press", "Barbell Row"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_rejects_exercises_in_use(auth_client, program):
+    """Test one in-use exercise blocks the whole batch."""
+    squat = await auth_client.post("/api/v1/exercises", json={"name": "Squat"})
+
+    response = await auth_client.post(
+        "/api/v1/exercises/bulk-delete",
+        json={"exercise_ids": [squat.json()["id"], program["exercise_ids"][0]]}
+    )
+
+    assert response.status_code == 409
+    assert "Bench Press" in response.json()["detail"]
+    remaining = await auth_client.get("/api/v1/exercises")
+    assert len(remaining.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_unknown_exercise(auth_client, program):
+    """Test an unknown id fails the batch with 404."""
+    response = await auth_client.post(
+        "/api/v1/exercises/bulk-delete",
+        json={"exercise_ids": ["00000000-0000-0000-0000-000000000000"]}
+    )
+
+    assert response.status_code == 404
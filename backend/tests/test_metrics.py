@@ -0,0 +1,116 @@
+"""Tests for the request metrics middleware and /api/metrics."""
+import os
+import subprocess
+import sys
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+
+from app.metrics import UNMATCHED_ROUTE
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template(auth_client: AsyncClient):
+    """Test ids in the path collapse into the route template label."""
+    route = "/api/v1/captures/{capture_id}"
+    labels = {"method": "GET", "route": route}
+    before_ok = _sample("lifeos_http_requests_total", status="200", **labels)
+    before_missing = _sample("lifeos_http_requests_total", status="404", **labels)
+    before_count = _sample("lifeos_http_request_duration_seconds_count", **labels)
+
+    response = await auth_client.post("/api/v1/captures", json={"text": "Buy milk"})
+    await auth_client.get(f"/api/v1/captures/{response.json()['id']}")
+    await auth_client.get("/api/v1/captures/00000000-0000-0000-0000-000000000000")
+
+    assert _sample("lifeos_http_requests_total", status="200", **labels) == before_ok + 1
+    assert _sample("lifeos_http_requests_total", status="404", **labels) == before_missing + 1
+    assert _sample("lifeos_http_request_duration_seconds_count", **labels) == before_count + 2
+    assert _sample("lifeos_http_requests_in_flight", **labels) == 0
+
+
+@pytest.mark.asyncio
+async def test_database_work_is_recorded_per_request(auth_client: AsyncClient):
+    """Test statement count and time are attributed to the request's route."""
+    labels = {"method": "POST", "route": "/api/v1/captures"}
+    before_count = _sample("lifeos_db_statements_per_request_count", **labels)
+    before_sum = _sample("lifeos_db_statements_per_request_sum", **labels)
+
+    await auth_client.post("/api/v1/captures", json={"text": "Buy milk"})
+
+    assert _sample("lifeos_db_statements_per_request_count", **labels) == before_count + 1
+    # The user lookup and the INSERT
+    assert _sample("lifeos_db_statements_per_request_sum", **labels) == before_sum + 2
+    assert _sample("lifeos_db_time_per_request_seconds_sum", **labels) > 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_paths_share_one_label(client: AsyncClient):
+    """Test unmatched paths don't create a series each."""
+    before = _sample("lifeos_http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404")
+
+    await client.get("/wp-login.php")
+    await client.get("/.env")
+
+    assert _sample("lifeos_http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404") == before + 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_exposition_format(client: AsyncClient):
+    """Test /api/metrics returns the text format with the request histograms."""
+    await client.get("/api/health/pool")
+    response = await client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'lifeos_http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/health/pool"}' in response.text
+
+
+def test_multiprocess_collection_sums_workers(tmp_path):
+    """Test counters written by separate worker processes are aggregated."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = "from app.metrics import REQUESTS; REQUESTS.labels('GET', '/api/x', '200').inc()"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+    scrape = "from app.metrics import render_metrics; print(render_metrics()[0].decode())"
+    output = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert 'lifeos_http_requests_total{method="GET",route="/api/x",status="200"} 2.0' in output
@@ -0,0 +1,185 @@
+"""Tests for monthly partitioning of workout logs."""
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import event, text
+
+from app.models.fitness import Exercise, SessionStatus, WorkoutSession
+from app.partitions import (
+    add_months, months_between, partition_name, create_partition_sql,
+    ensure_partitions, list_partitions,
+)
+from app.repositories.fitness import FitnessRepository
+from app.repositories.user import UserRepository
+
+
+@pytest.fixture
+async def partitions(db_session):
+    """Create monthly partitions from January 2025 through three months ahead."""
+    conn = await db_session.connection()
+    names = await ensure_partitions(conn, months_ahead=3, start=date(2025, 1, 1))
+    await db_session.commit()
+    return names
+
+
+async def _explain(db_session, sql: str) -> str:
+    result = await db_session.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(row[0] for row in result)
+
+
+async def _session_with_set(db_session, user, exercise, started_at, status="in_progress"):
+    session = WorkoutSession(user_id=user.id, status=status, started_at=started_at)
+    db_session.add(session)
+    await db_session.flush()
+    log = await FitnessRepository(db_session).insert_log(session.id, exercise.id, 1, 5, None)
+    return session, log
+
+
+async def _placed_in(db_session, log_id) -> str:
+    placed = await db_session.execute(
+        text("SELECT tableoid::regclass::text FROM workout_logs WHERE id = :id"),
+        {"id": log_id},
+    )
+    return placed.scalar_one()
+
+
+def test_month_arithmetic():
+    """Test month helpers wrap across years."""
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert months_between(date(2025, 12, 15), date(2026, 2, 3)) == [
+        date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1),
+    ]
+    assert partition_name("workout_logs", date(2026, 2, 1)) == "workout_logs_y2026m02"
+    assert create_partition_sql("workout_logs", date(2025, 12, 1)).endswith(
+        "FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_is_idempotent(db_session, partitions):
+    """Test re-running the maintenance step creates nothing new."""
+    conn = await db_session.connection()
+    await ensure_partitions(conn, months_ahead=3, start=date(2025, 1, 1))
+
+    existing = await list_partitions(conn, "workout_logs")
+    assert "workout_logs_default" in existing
+    assert "workout_logs_y2025m01" in existing
+    assert set(partitions) <= set(existing)
+    assert len(existing) == len(partitions) + 1
+
+
+@pytest.mark.asyncio
+async def test_logs_are_routed_by_session_month(db_session, partitions):
+    """Test a set lands in the partition for its session's start month."""
+    user = await UserRepository(db_session).create(
+        email="test@example.com", username="testuser", password_hash="x"
+    )
+    exercise = Exercise(user_id=user.id, name="Squat")
+    session = WorkoutSession(
+        user_id=user.id,
+        status="in_progress",
+        started_at=datetime(2025, 3, 31, 23, 30, tzinfo=timezone.utc),
+    )
+    db_session.add_all([exercise, session])
+    await db_session.flush()
+
+    log = await FitnessRepository(db_session).insert_log(session.id, exercise.id, 1, 5, None)
+
+    assert log.session_started_at == session.started_at
+    placed = await db_session.execute(
+        text("SELECT tableoid::regclass::text FROM workout_logs WHERE id = :id"),
+        {"id": log.id},
+    )
+    assert placed.scalar_one() == "workout_logs_y2025m03"
+
+
+@pytest.mark.asyncio
+async def test_time_bounded_query_prunes_partitions(db_session, partitions):
+    """Test a one-month range only scans that month's partition."""
+    plan = await _explain(
+        db_session,
+        "SELECT * FROM workout_logs "
+        "WHERE session_started_at >= '2025-06-01 00:00:00+00' "
+        "AND session_started_at < '2025-07-01 00:00:00+00'",
+    )
+
+    assert "workout_logs_y2025m06" in plan
+    assert "workout_logs_y2025m05" not in plan
+    assert "workout_logs_y2025m07" not in plan
+    assert "workout_logs_default" not in plan
+
+
+@pytest.mark.asyncio
+async def test_unbounded_query_scans_every_partition(db_session, partitions):
+    """Test pruning is driven by the partition key, not applied blindly."""
+    plan = await _explain(db_session, "SELECT * FROM workout_logs WHERE reps > 5")
+
+    assert "workout_logs_y2025m01" in plan
+    assert "workout_logs_default" in plan
+
+
+@pytest.mark.asyncio
+async def test_rows_in_default_partition_move_to_their_month(db_session, partitions):
+    """Test maintenance creates a stray row's month and moves the row out of the default."""
+    user = await UserRepository(db_session).create(
+        email="test@example.com", username="testuser", password_hash="x"
+    )
+    exercise = Exercise(user_id=user.id, name="Squat")
+    db_session.add(exercise)
+    await db_session.flush()
+    _, log = await _session_with_set(
+        db_session, user, exercise, datetime(2030, 5, 10, 8, 0, tzinfo=timezone.utc)
+    )
+    assert await _placed_in(db_session, log.id) == "workout_logs_default"
+
+    conn = await db_session.connection()
+    names = await ensure_partitions(conn, months_ahead=3, start=date(2025, 1, 1))
+
+    assert "workout_logs_y2030m05" in names
+    assert await _placed_in(db_session, log.id) == "workout_logs_y2030m05"
+    remaining = await db_session.execute(text("SELECT count(*) FROM workout_logs_default"))
+    assert remaining.scalar_one() == 0
+
+    # Nothing left to adopt on the next run
+    existing = await list_partitions(conn, "workout_logs")
+    await ensure_partitions(conn, months_ahead=3, start=date(2025, 1, 1))
+    assert await list_partitions(conn, "workout_logs") == existing
+
+
+@pytest.mark.asyncio
+async def test_history_query_scans_only_its_months(db_session, partitions):
+    """Test the app's history page query reads only the partitions of its sessions."""
+    user = await UserRepository(db_session).create(
+        email="test@example.com", username="testuser", password_hash="x"
+    )
+    exercise = Exercise(user_id=user.id, name="Squat")
+    db_session.add(exercise)
+    await db_session.flush()
+    for started_at in (datetime(2025, 3, 10, tzinfo=timezone.utc), datetime(2025, 6, 10, tzinfo=timezone.utc)):
+        await _session_with_set(db_session, user, exercise, started_at, SessionStatus.COMPLETED.value)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "history_page" in statement:
+            statements.append((statement, parameters))
+
+    sync_engine = (await db_session.connection()).engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        rows, _ = await FitnessRepository(db_session).list_sessions(
+            user.id, per_page=1, before=datetime(2025, 7, 1, tzinfo=timezone.utc)
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+    assert [row.started_at.month for row in rows] == [6]
+
+    [(statement, parameters)] = statements
+    conn = await db_session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, COSTS OFF) {statement}", parameters)
+    plan = "\n".join(row[0] for row in result)
+
+    # Bounds come from the page, so pruning happens at run time: other
+    # months stay in the plan but are never executed
+    scanned = [line for line in plan.splitlines() if "workout_logs_" in line and "never executed" not in line]
+    assert scanned and all("workout_logs_y2025m06" in line for line in scanned)
@@ -0,0 +1,121 @@
+"""Tests for connection pool instrumentation and liveness probing."""
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.pooling import InstrumentedPool, engine_options, pool_status, probe_idle_connections
+
+
+@pytest.fixture
+async def small_engine(engine):
+    """An instrumented engine with one pooled and one overflow connection."""
+    pooled = create_async_engine(
+        engine.url, poolclass=InstrumentedPool, pool_size=1, max_overflow=1, pool_timeout=0.1
+    )
+    yield pooled
+    await pooled.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkouts_overflow_and_timeouts(small_engine):
+    """Test checkout waits, overflow events and timeouts are counted."""
+    first = await small_engine.connect()
+    second = await small_engine.connect()
+
+    status = pool_status(small_engine)
+    assert status["in_use"] == 2 and status["overflow"] == 1
+    assert status["checkouts"] == 2 and status["overflow_events"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        await small_engine.connect()
+    await first.close()
+    await second.close()
+
+    status = pool_status(small_engine)
+    assert status["in_use"] == 0 and status["timeouts"] == 1
+    assert status["checkout_wait_seconds"]["buckets"]["+Inf"] == 2
+    assert 0 < status["checkout_wait_seconds"]["max"] <= status["checkout_wait_seconds"]["total"]
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_are_exported_to_prometheus(small_engine):
+    """Test checkouts, overflow and connection states reach the metrics registry."""
+    small_engine.pool.stats.name = "small"
+
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, {"pool": "small", **labels}) or 0
+
+    checkouts = sample("lifeos_db_pool_checkout_wait_seconds_count")
+    overflow_events = sample("lifeos_db_pool_overflow_events_total")
+    first = await small_engine.connect()
+    second = await small_engine.connect()
+    assert sample("lifeos_db_pool_checkout_wait_seconds_count") == checkouts + 2
+    assert sample("lifeos_db_pool_overflow_events_total") == overflow_events + 1
+    assert sample("lifeos_db_pool_connections", state="in_use") == 2
+
+    await first.close()
+    await second.close()
+    assert sample("lifeos_db_pool_connections", state="in_use") == 0
+    assert sample("lifeos_db_pool_connections", state="idle") == 1
+
+
+@pytest.mark.asyncio
+async def test_counters_survive_dispose(small_engine):
+    """Test engine.dispose() keeps the counters on the replacement pool."""
+    async with small_engine.connect():
+        pass
+    await small_engine.dispose()
+
+    assert pool_status(small_engine)["checkouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_liveness_probe_replaces_dead_connections(engine, small_engine):
+    """Test a probe finds a killed idle connection and the pool recovers."""
+    async with small_engine.connect() as conn:
+        pid = await conn.scalar(text("SELECT pg_backend_pid()"))
+    assert await probe_idle_connections(small_engine)
+
+    async with engine.connect() as admin:
+        await admin.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+    await asyncio.sleep(0.1)
+
+    assert not await probe_idle_connections(small_engine)
+    assert pool_status(small_engine)["liveness_failures"] == 1
+    async with small_engine.connect() as conn:
+        assert await conn.scalar(text("SELECT pg_backend_pid()")) != pid
+
+
+@pytest.mark.asyncio
+async def test_pgbouncer_mode_disables_statement_caches(engine, monkeypatch):
+    """Test PgBouncer mode turns off both prepared statement caches."""
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    options = engine_options(read_only=True)
+
+    connect_args = options["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["server_settings"] == {"default_transaction_read_only": "on"}
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+    pgbouncer_engine = create_async_engine(engine.url, **options)
+    async with pgbouncer_engine.connect() as conn:
+        for _ in range(2):
+            assert await conn.scalar(text("SELECT 1")) == 1
+    await pgbouncer_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_health_endpoint(client: AsyncClient):
+    """Test the pool metrics endpoint reports the primary pool."""
+    response = await client.get("/api/health/pool")
+    assert response.status_code == 200
+
+    primary = response.json()["primary"]
+    assert primary["size"] == settings.DB_POOL_SIZE
+    assert {"in_use", "checkouts", "checkout_wait_seconds", "overflow_events"} <= primary.keys()
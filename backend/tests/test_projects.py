@@ -0,0 +1,184 @@
+"""Tests for projects functionality."""
+import pytest
+
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+async def project(auth_client):
+    """Create a project to work with."""
+    response = await auth_client.post(
+        "/api/v1/projects",
+        json={"name": "Life OS", "slug": "life-os"}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+# Delta Sync Tests
+
+@pytest.mark.asyncio
+async def test_project_detail_includes_version(auth_client, project):
+    """Test project detail exposes the sync version."""
+    response = await auth_client.get(f"/api/v1/projects/{project['id']}")
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 0
+
+
+@pytest.mark.asyncio
+async def test_changes_since_current_version_is_empty(auth_client, project):
+    """Test asking for changes at the current version returns nothing."""
+    response = await auth_client.get(
+        f"/api/v1/projects/{project['id']}/changes?since=0"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == 0
+    assert data["tasks"] == []
+    assert data["notes"] == []
+    assert data["deleted"] == []
+
+
+@pytest.mark.asyncio
+async def test_changes_returns_only_touched_tasks(auth_client, project):
+    """Test a single task move only returns that task."""
+    project_id = project["id"]
+    first = await auth_client.post(
+        f"/api/v1/projects/{project_id}/tasks",
+        json={"title": "First"}
+    )
+    await auth_client.post(
+        f"/api/v1/projects/{project_id}/tasks",
+        json={"title": "Second"}
+    )
+
+    detail = await auth_client.get(f"/api/v1/projects/{project_id}")
+    version = detail.json()["version"]
+    assert version == 2
+
+    await auth_client.patch(
+        f"/api/v1/projects/tasks/{first.json()['id']}/move",
+        json={"new_status": "in_progress", "sort_order": 0}
+    )
+
+    response = await auth_client.get(
+        f"/api/v1/projects/{project_id}/changes?since={version}"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == version + 1
+    assert [t["title"] for t in data["tasks"]] == ["First"]
+    assert data["tasks"][0]["status"] == "in_progress"
+    assert data["notes"] == []
+
+
+@pytest.mark.asyncio
+async def test_changes_include_tombstones(auth_client, project):
+    """Test deleted tasks and notes are reported as tombstones."""
+    project_id = project["id"]
+    task = await auth_client.post(
+        f"/api/v1/projects/{project_id}/tasks",
+        json={"title": "Short-lived"}
+    )
+    note = await auth_client.post(
+        f"/api/v1/projects/{project_id}/notes",
+        json={"content": "Short-lived note"}
+    )
+
+    await auth_client.delete(f"/api/v1/projects/tasks/{task.json()['id']}")
+    await auth_client.delete(f"/api/v1/projects/notes/{note.json()['id']}")
+
+    response = await auth_client.get(
+        f"/api/v1/projects/{project_id}/changes?since=2"
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == 4
+    assert data["tasks"] == []
+    assert {(d["entity_type"], d["entity_id"]) for d in data["deleted"]} == {
+        ("task", task.json()["id"]),
+        ("note", note.json()["id"]),
+    }
+
+
+@pytest.mark.asyncio
+async def test_changes_since_future_version(auth_client, project):
+    """Test a version ahead of the project is rejected."""
+    response = await auth_client.get(
+        f"/api/v1/projects/{project['id']}/changes?since=99"
+    )
+
+    assert response.status_code == 422
+
+
+# Slug Resolution Tests
+
+@pytest.mark.asyncio
+async def test_get_project_by_slug(auth_client, project):
+    """Test slug lookups resolve to the same project on repeat calls."""
+    first = await auth_client.get("/api/v1/projects/slug/life-os")
+    second = await auth_client.get("/api/v1/projects/slug/life-os")
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.json()["id"] == project["id"]
+    assert second.json() == first.json()
+
+
+@pytest.mark.asyncio
+async def test_get_project_header_by_slug(auth_client, project):
+    """Test the header route skips tasks and notes."""
+    await auth_client.post(
+        f"/api/v1/projects/{project['id']}/tasks",
+        json={"title": "Not in the header"}
+    )
+
+    response = await auth_client.get("/api/v1/projects/slug/life-os/header")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == project["id"]
+    assert data["name"] == "Life OS"
+    assert "tasks" not in data
+
+
+@pytest.mark.asyncio
+async def test_get_project_by_unknown_slug(auth_client):
+    """Test an unknown slug returns 404."""
+    response = await auth_client.get("/api/v1/projects/slug/missing")
+
+    assert response.status_code == 404
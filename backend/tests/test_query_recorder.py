@@ -0,0 +1,182 @@
+"""Tests for per-request statement recording and the paths that used to loop."""
+import logging
+from datetime import date, timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.config import settings
+from app.query_recorder import QueryBudgetMiddleware, normalize_statement, record_queries
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+def test_normalize_statement():
+    """Test parameters, casts and list lengths don't split a statement."""
+    assert normalize_statement(
+        "SELECT t.id FROM t\n  WHERE t.id IN ($1::UUID, $2::UUID, $3::UUID) AND t.at < $4::TIMESTAMP WITH TIME ZONE"
+    ) == "SELECT t.id FROM t WHERE t.id IN (?) AND t.at < ?"
+    assert normalize_statement("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == normalize_statement(
+        "INSERT INTO t (a, b) VALUES ($1, $2)"
+    ) == "INSERT INTO t (a, b) VALUES (?)"
+
+
+@pytest.mark.asyncio
+async def test_debug_headers(auth_client, monkeypatch):
+    """Test X-DB-Queries and X-DB-Time are sent in debug mode only."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    response = await auth_client.post("/api/v1/captures", json={"text": "Buy milk"})
+
+    # The user lookup and the INSERT
+    assert response.headers["X-DB-Queries"] == "2"
+    assert float(response.headers["X-DB-Time"]) > 0
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    response = await auth_client.get("/api/v1/captures")
+    assert "X-DB-Queries" not in response.headers
+
+
+@pytest.mark.asyncio
+@pytest.mark.query_budget(None)
+async def test_loops_and_budget_overruns_are_logged(db_session, caplog, monkeypatch):
+    """Test a statement run in a loop and an over-budget request log warnings."""
+    monkeypatch.setattr(settings, "DB_QUERY_BUDGET", 3)
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/items/{count}")
+    async def items(count: int, db=Depends(lambda: db_session)):
+        for item_id in range(count):
+            await db.execute(text("SELECT CAST(:id AS integer)"), {"id": item_id})
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        with caplog.at_level(logging.WARNING, logger="app.query_recorder"):
+            await client.get("/items/2")
+            assert not caplog.records
+
+            await client.get("/items/4")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert "GET /items/{count} ran 4 statements (budget 3)" in messages[0]
+    assert "ran the same statement 4 times" in messages[1] and messages[1].endswith("SELECT CAST(? AS integer)")
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_nothing_on_the_connection(engine):
+    """Test a statement that raises is neither timed nor remembered by its connection."""
+    async with engine.connect() as conn:
+        with record_queries() as recorder:
+            for _ in range(3):
+                with pytest.raises(DBAPIError):
+                    await conn.execute(text("SELECT 1 / 0"))
+                await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+        raw = await conn.get_raw_connection()
+
+        assert recorder.statements == 1
+        assert "statement_started" not in raw.info
+
+
+@pytest.mark.asyncio
+async def test_journal_streak_is_one_query(auth_client, monkeypatch):
+    """Test streaks count consecutive days up to today, whatever their length."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    today = date.today()
+    for days_ago in [*range(6), 7]:
+        await auth_client.post(
+            "/api/v1/journal/entries",
+            json={
+                "entry_type": "morning_pages",
+                "entry_date": (today - timedelta(days=days_ago)).isoformat(),
+                "content": {"text": "..."},
+            },
+        )
+
+    response = await auth_client.get("/api/v1/journal/status")
+
+    assert response.json()["morning_pages_streak"] == 6
+    assert response.json()["daily_reflection_streak"] == 0
+    # User, two streaks, the week's count and the weekly review
+    assert response.headers["X-DB-Queries"] == "5"
+
+
+@pytest.mark.asyncio
+async def test_task_reorder_is_one_update(auth_client):
+    """Test reordering a column updates every task in one statement."""
+    project = (await auth_client.post("/api/v1/projects", json={"name": "Garden", "slug": "garden"})).json()
+    task_ids = [
+        (await auth_client.post(f"/api/v1/projects/{project['id']}/tasks", json={"title": f"Task {n}"})).json()["id"]
+        for n in range(5)
+    ]
+
+    response = await auth_client.post(
+        f"/api/v1/projects/{project['id']}/tasks/reorder",
+        json={"status": "backlog", "task_order": task_ids[::-1]},
+    )
+    assert response.status_code == 204
+
+    tasks = (await auth_client.get(f"/api/v1/projects/{project['id']}")).json()["tasks"]["backlog"]
+    assert [task["id"] for task in sorted(tasks, key=lambda task: task["sort_order"])] == task_ids[::-1]
+
+
+@pytest.mark.asyncio
+async def test_recurring_series_writes_are_batched(auth_client):
+    """Test creating and editing a year of weekly events stays within budget."""
+    response = await auth_client.post(
+        "/api/v1/calendar/events",
+        json={
+            "title": "Gym",
+            "event_date": "2026-01-05",
+            "start_time": "07:00:00",
+            "end_time": "08:00:00",
+            "is_recurring": True,
+            "recurrence_pattern": "weekly",
+            "recurrence_days": [1, 3],
+        },
+    )
+    assert response.status_code == 201
+
+    response = await auth_client.patch(
+        f"/api/v1/calendar/events/{response.json()['id']}",
+        params={"update_scope": "all"},
+        json={"title": "Lift"},
+    )
+    assert response.status_code == 200
+
+    events = (await auth_client.get(
+        "/api/v1/calendar/events", params={"start_date": "2026-01-01", "end_date": "2027-01-31"}
+    )).json()["events"]
+    assert len(events) == 105
+    assert {event["title"] for event in events} == {"Lift"}
@@ -0,0 +1,105 @@
+"""Tests for the fast JSON response path."""
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.models.capture import Capture
+from app.repositories.user import UserRepository
+from app.responses import model_response, validate_many
+from app.schemas.capture import CaptureListResponse, CaptureResponse
+from app.schemas.fitness import HistoryItem, HistoryResponse
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+def _captures(count: int) -> list[Capture]:
+    now = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    return [
+        Capture(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), text=f"Capture {n} ✓", source="manual",
+            processed=n % 2 == 0, deleted=False, created_at=now, updated_at=now,
+        )
+        for n in range(count)
+    ]
+
+
+def test_model_response_matches_default_serialization():
+    """Test the one-pass body is the JSON FastAPI's default path produces."""
+    content = {"captures": _captures(3), "total": 3, "unprocessed_count": 1}
+
+    response = model_response(CaptureListResponse, content)
+
+    expected = jsonable_encoder(CaptureListResponse.model_validate(content, from_attributes=True))
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == expected
+
+
+def test_validate_many_reads_attributes():
+    """Test rows without from_attributes config validate in one call."""
+    started = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    row = SimpleNamespace(
+        id=uuid.uuid4(), program_name=None, day_label="A", status="completed",
+        started_at=started, completed_at=None, duration_seconds=None,
+        exercise_count=2, set_count=6, total_reps=48, tonnage_kg=Decimal("1234.50"),
+    )
+
+    [item] = validate_many(HistoryItem, [row])
+
+    assert isinstance(item, HistoryItem) and item.tonnage_kg == Decimal("1234.50")
+    body = json.loads(model_response(HistoryResponse, {
+        "items": [item], "total": 1, "page": 1, "per_page": 20,
+    }).body)
+    assert body["items"][0]["tonnage_kg"] == "1234.50"
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_serializes_captures(auth_client):
+    """Test the captures list still returns every field through the fast path."""
+    created = (await auth_client.post("/api/v1/captures", json={"text": "Buy milk"})).json()
+
+    response = await auth_client.get("/api/v1/captures")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["captures"] == [CaptureResponse(**created).model_dump(mode="json")]
+
+
+@pytest.mark.asyncio
+async def test_errors_use_default_response_class(client):
+    """Test AppError and plain dict responses go through the orjson class."""
+    response = await client.get("/api/v1/captures")
+    assert response.status_code == 401
+    assert response.headers["content-type"] == "application/json"
+    assert "detail" in response.json()
@@ -0,0 +1,134 @@
+"""Tests for the slow-query log."""
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.api.v1 import debug as debug_api
+from app.config import settings
+from app.models.capture import Capture
+from app.repositories.capture import CaptureRepository
+from app.repositories.journal import JournalRepository
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+from app.slow_queries import SlowQueryLog, redact
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+@pytest.fixture
+async def slow_log(engine):
+    """A log that records every statement on the test engine and explains all of them."""
+    log = SlowQueryLog(threshold_ms=0, explain_sample_rate=1.0, size=10)
+    log.install(engine)
+    yield log
+    log.uninstall(engine)
+    await log.wait_for_explains()
+
+
+def test_redact_keeps_identifiers_and_hides_content():
+    """Test ids, numbers and dates survive redaction and text does not."""
+    user_id = uuid.uuid4()
+    assert redact((user_id, 5, date(2026, 1, 1), None, "my secret journal", b"\x00\x01", ["a", 2])) == [
+        user_id, 5, date(2026, 1, 1), None, "<str len=17>", "<bytes len=2>", ["<str len=1>", 2],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_select_is_recorded_with_caller_and_analyzed_plan(db_session, test_user, slow_log):
+    """Test a slow SELECT names its repository method and gets EXPLAIN ANALYZE."""
+    await JournalRepository(db_session).calculate_streak(test_user.id, "morning_pages")
+    await slow_log.wait_for_explains()
+
+    [record] = slow_log.records
+    assert record.caller.startswith("JournalRepository.calculate_streak (app/repositories/journal.py:")
+    assert record.parameters[0] == test_user.id
+    assert record.parameters[1] == "<str len=13>"
+    assert record.analyzed and "Execution Time" in record.plan
+
+
+@pytest.mark.asyncio
+async def test_writes_are_explained_without_running(db_session, test_user, slow_log):
+    """Test a write gets a plain EXPLAIN and is not executed a second time."""
+    repo = CaptureRepository(db_session)
+    capture = await repo.create(user_id=test_user.id, text="Buy milk")
+    await db_session.commit()
+    await slow_log.wait_for_explains()
+
+    insert = next(record for record in slow_log.records if record.statement.startswith("INSERT"))
+    assert insert.caller.startswith("CaptureRepository.create")
+    assert not insert.analyzed and "Insert on captures" in insert.plan
+    assert "<str len=8>" in insert.parameters
+
+    rows = (await db_session.execute(select(Capture).where(Capture.user_id == test_user.id))).scalars().all()
+    assert [row.id for row in rows] == [capture.id]
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_keeps_the_newest(db_session, test_user, slow_log):
+    """Test the buffer drops the oldest records once full."""
+    slow_log.explain_sample_rate = 0
+    repo = JournalRepository(db_session)
+    for _ in range(12):
+        await repo.count_entries_in_range(test_user.id, date(2026, 1, 1), date(2026, 1, 7))
+
+    assert len(slow_log.records) == 10
+    assert slow_log.snapshot()[0]["at"] >= slow_log.snapshot()[-1]["at"]
+
+
+@pytest.mark.asyncio
+async def test_debug_endpoint_lists_slow_queries(auth_client, slow_log, monkeypatch):
+    """Test the debug endpoint returns the buffer, newest first."""
+    monkeypatch.setattr(debug_api, "slow_queries", slow_log)
+    monkeypatch.setattr(settings, "DEBUG", True)
+    await auth_client.get("/api/v1/captures")
+
+    response = await auth_client.get("/api/v1/debug/slow-queries")
+    assert response.status_code == 200
+    # Newest first: the user lookup for this request, then the capture list
+    callers = [query["caller"] for query in response.json()["queries"]]
+    assert callers[0].startswith("UserRepository.get_by_id")
+    assert callers[1].startswith("CaptureRepository.")
+
+
+@pytest.mark.asyncio
+async def test_debug_endpoint_requires_login(client):
+    """Test the slow-query buffer is not public."""
+    response = await client.get("/api/v1/debug/slow-queries")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_debug_endpoint_is_hidden_without_debug(auth_client, monkeypatch):
+    """Test other users' statements are never served outside DEBUG mode."""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    response = await auth_client.get("/api/v1/debug/slow-queries")
+    assert response.status_code == 404
@@ -0,0 +1,271 @@
+"""Request-scoped sessions: writes commit once, reads run without a transaction."""
+import uuid
+
+import pytest
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from app.database import ReadOnlySession, after_commit, make_read_sessionmaker
+from app.dependencies.database import get_db
+from app.models.capture import Capture
+from app.repositories.user import UserRepository
+from app.services.auth import AuthService
+
+
+@pytest.fixture
+async def test_user(db_session):
+    """Create a test user."""
+    user_repo = UserRepository(db_session)
+    password_hash = AuthService.hash_password("testpassword123")
+
+    user = await user_repo.create(
+        email="test@example.com",
+        username="testuser",
+        password_hash=password_hash
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(client, test_user):
+    """Create an authenticated client with cookies."""
+    response = await client.post(
+        "/api/auth/login",
+        json={
+            "username": "testuser",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    return client
+
+
+def _summarize(statement: str) -> str:
+    """Reduce a statement to "VERB table", e.g. "INSERT captures"."""
+    words = statement.split()
+    verb = words[0]
+    if verb == "SELECT":
+        return f"SELECT {words[words.index('FROM') + 1]}"
+    if verb == "UPDATE":
+        return f"UPDATE {words[1]}"
+    return f"{verb} {words[2]}"  # INSERT INTO t / DELETE FROM t
+
+
+class _Recorder:
+    """Statements and commits seen on the test session, as "VERB table" strings."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def reset(self):
+        self.statements.clear()
+        self.commits = 0
+
+
+@pytest.fixture
+def recorder(db_session):
+    """Record every statement and commit issued through the test session."""
+    recorder = _Recorder()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        recorder.statements.append(_summarize(statement))
+
+    def on_commit(session):
+        recorder.commits += 1
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(db_session.sync_session, "after_commit", on_commit)
+    yield recorder
+    event.remove(engine, "before_cursor_execute", on_execute)
+    event.remove(db_session.sync_session, "after_commit", on_commit)
+
+
+async def _measure(recorder, request):
+    recorder.reset()
+    response = await request
+    assert response.status_code < 300, response.text
+    # The test override of get_db never commits, so any commit is a repository's
+    assert recorder.commits == 0
+    return response, list(recorder.statements)
+
+
+@pytest.mark.asyncio
+async def test_capture_mutations(auth_client, recorder):
+    """Test capture writes are one statement each, with no refresh SELECT."""
+    response, statements = await _measure(
+        recorder, auth_client.post("/api/v1/captures", json={"text": "Buy milk"})
+    )
+    assert statements == ["SELECT users", "INSERT captures"]
+    assert response.json()["created_at"]
+
+    capture_id = response.json()["id"]
+    _, statements = await _measure(
+        recorder, auth_client.patch(f"/api/v1/captures/{capture_id}", json={"text": "Buy oat milk"})
+    )
+    assert statements == ["SELECT users", "SELECT captures", "UPDATE captures"]
+
+    _, statements = await _measure(recorder, auth_client.delete(f"/api/v1/captures/{capture_id}"))
+    assert statements == ["SELECT users", "SELECT captures", "UPDATE captures"]
+
+
+@pytest.mark.asyncio
+async def test_journal_and_calendar_mutations(auth_client, recorder):
+    """Test journal and calendar creates and updates skip the refresh."""
+    response, statements = await _measure(
+        recorder,
+        auth_client.post(
+            "/api/v1/journal/entries",
+            json={"entry_type": "morning_pages", "entry_date": "2026-01-01", "content": {"text": "a"}},
+        ),
+    )
+    # The SELECT is the one-entry-per-day check
+    assert statements == ["SELECT users", "SELECT journal_entries", "INSERT journal_entries"]
+
+    _, statements = await _measure(
+        recorder,
+        auth_client.patch(f"/api/v1/journal/entries/{response.json()['id']}", json={"content": {"text": "b"}}),
+    )
+    assert statements == ["SELECT users", "SELECT journal_entries", "UPDATE journal_entries"]
+
+    _, statements = await _measure(
+        recorder,
+        auth_client.post(
+            "/api/v1/calendar/events",
+            json={"title": "Gym", "event_date": "2026-01-01", "start_time": "10:00:00", "end_time": "11:00:00"},
+        ),
+    )
+    assert statements == ["SELECT users", "INSERT calendar_events"]
+
+
+@pytest.mark.asyncio
+async def test_project_board_mutations(auth_client, recorder):
+    """Test a task edit and its version stamp go out as one UPDATE."""
+    response, statements = await _measure(
+        recorder, auth_client.post("/api/v1/projects", json={"name": "Garden", "slug": "garden"})
+    )
+    assert statements == ["SELECT users", "INSERT projects"]
+    project_id = response.json()["id"]
+
+    response, statements = await _measure(
+        recorder, auth_client.post(f"/api/v1/projects/{project_id}/tasks", json={"title": "Dig"})
+    )
+    assert statements == [
+        "SELECT users", "SELECT projects", "SELECT project_tasks",
+        "UPDATE projects", "INSERT project_tasks",
+    ]
+
+    task_id = response.json()["id"]
+    _, statements = await _measure(
+        recorder, auth_client.patch(f"/api/v1/projects/tasks/{task_id}", json={"title": "Dig deeper"})
+    )
+    assert statements == ["SELECT users", "SELECT project_tasks", "UPDATE projects", "UPDATE project_tasks"]
+
+    _, statements = await _measure(recorder, auth_client.delete(f"/api/v1/projects/tasks/{task_id}"))
+    assert statements == [
+        "SELECT users", "SELECT project_tasks", "UPDATE projects",
+        "INSERT project_tombstones", "DELETE project_tasks",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_workout_mutations(auth_client, recorder):
+    """Test fitness writes, including completing a session from its loaded logs."""
+    response, statements = await _measure(
+        recorder, auth_client.post("/api/v1/exercises", json={"name": "Bench Press"})
+    )
+    # The SELECT is the duplicate-name check
+    assert statements == ["SELECT users", "SELECT exercises", "INSERT exercises"]
+    exercise_id = response.json()["id"]
+
+    response = await auth_client.post("/api/v1/programs", json={"name": "Push", "is_active": True})
+    program_id = response.json()["id"]
+
+    response, statements = await _measure(
+        recorder,
+        auth_client.post(
+            f"/api/v1/programs/{program_id}/exercises",
+            json={"exercise_id": exercise_id, "day_label": "A"},
+        ),
+    )
+    # The exercise embedded in the response comes from the identity map
+    assert statements == [
+        "SELECT users", "SELECT workout_programs", "SELECT exercises",
+        "UPDATE workout_programs", "INSERT program_exercises",
+    ]
+    assert response.json()["exercise"]["name"] == "Bench Press"
+
+    response = await auth_client.post(
+        "/api/v1/workouts/sessions", json={"program_id": program_id, "day_label": "A"}
+    )
+    session_id = response.json()["id"]
+    await auth_client.post(
+        f"/api/v1/workouts/sessions/{session_id}/logs",
+        json={"exercise_id": exercise_id, "set_number": 1, "reps": 5, "weight_kg": "100"},
+    )
+
+    response, statements = await _measure(
+        recorder, auth_client.patch(f"/api/v1/workouts/sessions/{session_id}/complete", json={})
+    )
+    # Selectin loads for the program and the logs run in no fixed order
+    assert sorted(statements) == sorted([
+        "SELECT users", "SELECT workout_sessions", "SELECT workout_programs",
+        "SELECT workout_logs", "SELECT exercises", "UPDATE workout_sessions",
+    ])
+    assert response.json()["summary"][0]["reps_per_set"] == [5]
+
+    _, statements = await _measure(recorder, auth_client.delete(f"/api/v1/programs/{program_id}"))
+    # ON DELETE CASCADE / SET NULL handle entries and sessions; nothing is loaded first
+    assert statements == ["SELECT users", "SELECT workout_programs", "DELETE workout_programs"]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks(db_session):
+    """Test callbacks run on commit and are dropped on rollback."""
+    calls = []
+
+    await db_session.execute(text("SELECT 1"))
+    after_commit(db_session, lambda: calls.append("rolled back"))
+    await db_session.rollback()
+
+    await db_session.execute(text("SELECT 1"))
+    after_commit(db_session, lambda: calls.append("committed"))
+    await db_session.commit()
+    await db_session.commit()
+
+    assert calls == ["committed"]
+
+
+@pytest.mark.asyncio
+async def test_read_session_runs_in_autocommit(engine):
+    """Test read sessions open no transaction: each statement gets its own."""
+    async with make_read_sessionmaker(engine)() as session:
+        first = (await session.execute(text("SELECT now()"))).scalar_one()
+        second = (await session.execute(text("SELECT now()"))).scalar_one()
+
+    # now() is the transaction start time, so it only moves between transactions
+    assert second > first
+
+
+@pytest.mark.asyncio
+async def test_read_session_refuses_writes(engine):
+    """Test a read session raises instead of flushing changes."""
+    async with make_read_sessionmaker(engine)() as session:
+        session.add(Capture(user_id=uuid.uuid4(), text="nope"))
+        with pytest.raises(InvalidRequestError):
+            await session.flush()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method, session_class", [("GET", ReadOnlySession), ("POST", Session)])
+async def test_get_db_picks_session_by_method(method, session_class):
+    """Test safe methods get the read session and writes the unit of work."""
+    dependency = get_db(Request({"type": "http", "method": method, "headers": []}), Response())
+    session = await anext(dependency)
+
+    assert type(session.sync_session) is session_class
+    await dependency.aclose()